@@ -0,0 +1,338 @@
+"""Benchmarks of the overhead of Experiment Runner itself, to compare it between commits.
+
+    python benchmark/benchmark.py [--quick] [--only <benchmark> ...] [--output <results.json>] [--compare <baseline.json>]
+
+Every benchmark measures a part of the framework around the hooks of a config:
+  run_table_generation   generating (and materializing) the run table of large designs
+  resume                 reading a stored run table and reconciling the generated one with it
+  update_row_data        storing the data of a finished run, per run table backend
+  event_dispatch         raising an event to a subscribed hook
+  output_logging         a line of console output
+  process_creation       forking the process of a run
+  end_to_end             whole experiments of the no-op config in `benchmark/noop`, per run and per run phase,
+                         as a function of the number of runs, data columns and factors
+
+The results are written as JSON (by default to `benchmark/results/<commit>.json`), together with the commit and the
+Python version they were measured with. `--compare` prints the ratio of every result to the same result in an
+earlier results file, and exits with 1 if any result regressed by more than `--threshold`."""
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+RUNNER_DIR = ROOT_DIR / 'experiment-runner'
+NOOP_CONFIG = ROOT_DIR / 'benchmark' / 'noop' / 'RunnerConfig.py'
+sys.path.insert(0, str(RUNNER_DIR))
+
+from tabulate import tabulate
+
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from EventManager.EventSubscriptionController import EventSubscriptionController
+from EventManager.Models.RunnerEvents import RunnerEvents
+from ProgressManager.Output.CSVOutputManager import CSVOutputManager
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+from ProgressManager.Output.SQLiteOutputManager import SQLiteOutputManager
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+OUTPUT_MANAGERS = {'CSV': CSVOutputManager, 'SQLITE': SQLiteOutputManager}
+
+
+class Results:
+    def __init__(self):
+        self.results: List[Dict] = []
+
+    def add(self, benchmark: str, params: Dict, metric: str, value: float):
+        self.results.append({'benchmark': benchmark, 'params': params, 'metric': metric, 'value': round(value, 6)})
+        print(f"  {benchmark:<22} {format_params(params):<48} {metric:<26} {value:12.3f}", flush=True)
+
+
+def format_params(params: Dict) -> str:
+    return ' '.join(f"{key}={value}" for key, value in params.items())
+
+
+def result_key(result: Dict) -> str:
+    return f"{result['benchmark']} {format_params(result['params'])} {result['metric']}"
+
+
+@contextlib.contextmanager
+def quiet():
+    """The framework logs to stdout, which would otherwise be part of what is measured (and clutter the results)"""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def time_per_call_in_us(function: Callable, calls: int, repeats: int = 3) -> float:
+    """The fastest of `repeats` measurements of the mean time of a call"""
+    best = float('inf')
+    for _ in range(repeats):
+        start_ns = time.perf_counter_ns()
+        for _ in range(calls):
+            function()
+        best = min(best, (time.perf_counter_ns() - start_ns) / calls / 1000)
+    return best
+
+
+def time_in_ms(function: Callable) -> float:
+    start_ns = time.perf_counter_ns()
+    function()
+    return (time.perf_counter_ns() - start_ns) / 1e6
+
+
+def run_table_model(nr_factors: int, nr_levels: int, nr_data_columns: int = 2, repetitions: int = 1) -> RunTableModel:
+    return RunTableModel(
+        factors=[FactorModel(f"factor_{i}", list(range(nr_levels))) for i in range(nr_factors)],
+        repetitions=repetitions,
+        data_columns=[f"data_{i}" for i in range(nr_data_columns)]
+    )
+
+
+def stored_run_table(model: RunTableModel, done_fraction: float = 0.5) -> List[Dict]:
+    """The generated run table as stored by an experiment that got interrupted halfway"""
+    rows = list(model.generate_run_table())
+    for row in rows[:int(len(rows) * done_fraction)]:
+        row['__done'] = RunProgress.DONE
+        row.update({data_column: 1.5 for data_column in model.get_data_columns()})
+    return rows
+
+
+# =========================================== BENCHMARKS ===========================================
+
+def bench_run_table_generation(results: Results, quick: bool):
+    designs = [(4, 10), (5, 10)] if quick else [(4, 10), (5, 10), (6, 10), (7, 10)]
+    for nr_factors, nr_levels in designs:
+        params = {'factors': nr_factors, 'levels': nr_levels, 'runs': nr_levels ** nr_factors}
+        model = run_table_model(nr_factors, nr_levels)
+        results.add('run_table_generation', params, 'generate_ms', time_in_ms(model.generate_run_table))
+        if params['runs'] <= 10 ** 6:
+            run_table = model.generate_run_table()
+            results.add('run_table_generation', params, 'materialize_ms', time_in_ms(lambda: list(run_table)))
+
+
+def bench_resume(results: Results, quick: bool):
+    sizes = [(3, 10), (4, 10)] if quick else [(3, 10), (4, 10), (5, 10)]
+    for backend, output_manager in OUTPUT_MANAGERS.items():
+        for nr_factors, nr_levels in sizes:
+            params = {'backend': backend, 'runs': nr_levels ** nr_factors}
+            model = run_table_model(nr_factors, nr_levels)
+            with tempfile.TemporaryDirectory() as experiment_path, quiet():
+                manager = output_manager(Path(experiment_path))
+                manager.write_run_table(stored_run_table(model))
+
+                stored = []
+                read_ms = time_in_ms(lambda: stored.extend(manager.read_run_table()))
+                run_table = model.generate_run_table()
+                reconcile_ms = time_in_ms(lambda: run_table.reconcile(stored))
+            results.add('resume', params, 'read_run_table_ms', read_ms)
+            results.add('resume', params, 'reconcile_ms', reconcile_ms)
+
+
+def bench_update_row_data(results: Results, quick: bool):
+    sizes = [(3, 10)] if quick else [(3, 10), (4, 10)]
+    data_columns = [2, 50]
+    calls = 50 if quick else 200
+    for backend, output_manager in OUTPUT_MANAGERS.items():
+        for nr_factors, nr_levels in sizes:
+            for nr_data_columns in data_columns:
+                params = {'backend': backend, 'runs': nr_levels ** nr_factors, 'data_columns': nr_data_columns}
+                model = run_table_model(nr_factors, nr_levels, nr_data_columns)
+                with tempfile.TemporaryDirectory() as experiment_path, quiet():
+                    manager = output_manager(Path(experiment_path))
+                    manager.write_run_table(stored_run_table(model, done_fraction=0))
+                    run_ids = iter(row['__run_id'] for row in model.generate_run_table())
+                    row_data = {data_column: 1.5 for data_column in model.get_data_columns()}
+                    update_us = time_per_call_in_us(
+                        lambda: manager.update_row_data({'__run_id': next(run_ids), '__done': RunProgress.DONE, **row_data}),
+                        calls)
+                    checkpoint_ms = time_in_ms(manager.checkpoint)
+                results.add('update_row_data', params, 'per_call_us', update_us)
+                results.add('update_row_data', params, 'checkpoint_ms', checkpoint_ms)
+
+
+def bench_event_dispatch(results: Results, quick: bool):
+    calls = 20000 if quick else 200000
+    previous_callback = EventSubscriptionController.get_event_callback(RunnerEvents.INTERACT)
+    try:
+        EventSubscriptionController.subscribe_to_single_event(RunnerEvents.INTERACT, lambda context=None: None)
+        results.add('event_dispatch', {'context': False}, 'per_call_us',
+                    time_per_call_in_us(lambda: EventSubscriptionController.raise_event(RunnerEvents.INTERACT), calls))
+        results.add('event_dispatch', {'context': True}, 'per_call_us',
+                    time_per_call_in_us(lambda: EventSubscriptionController.raise_event(RunnerEvents.INTERACT, object()), calls))
+    finally:
+        EventSubscriptionController.subscribe_to_single_event(RunnerEvents.INTERACT, previous_callback)
+    results.add('event_dispatch', {'subscribed': False}, 'per_call_us',
+                time_per_call_in_us(lambda: EventSubscriptionController.raise_event(RunnerEvents.CONTINUE), calls))
+
+
+def bench_output_logging(results: Results, quick: bool):
+    calls = 10000 if quick else 100000
+    with quiet():
+        log_us = time_per_call_in_us(lambda: output.console_log("Config.interact() called!"), calls)
+        warning_us = time_per_call_in_us(lambda: output.console_log_WARNING("CSVManager: Updated row run_0_repetition_0"), calls)
+    results.add('output_logging', {'level': 'log'}, 'per_call_us', log_us)
+    results.add('output_logging', {'level': 'warning'}, 'per_call_us', warning_us)
+
+
+def _noop():
+    pass
+
+
+def bench_process_creation(results: Results, quick: bool):
+    calls = 20 if quick else 100
+
+    def fork_and_join():
+        process = multiprocessing.get_context('fork').Process(target=_noop)
+        process.start()
+        process.join()
+
+    results.add('process_creation', {'start_method': 'fork'}, 'per_process_us', time_per_call_in_us(fork_and_join, calls, repeats=1))
+
+
+def run_noop_experiment(nr_factors: int, nr_levels: int, repetitions: int, nr_data_columns: int,
+                        backend: str = 'CSV', isolation: str = 'PROCESS') -> Dict[str, float]:
+    """Run the no-op config in a fresh interpreter, and summarize the time per run and per run phase"""
+    with tempfile.TemporaryDirectory() as output_path:
+        env = {**os.environ,
+               'BENCHMARK_FACTORS': str(nr_factors), 'BENCHMARK_LEVELS': str(nr_levels),
+               'BENCHMARK_REPETITIONS': str(repetitions), 'BENCHMARK_DATA_COLUMNS': str(nr_data_columns),
+               'BENCHMARK_BACKEND': backend, 'BENCHMARK_ISOLATION': isolation, 'BENCHMARK_OUTPUT': output_path}
+        start_ns = time.perf_counter_ns()
+        subprocess.run([sys.executable, str(RUNNER_DIR), str(NOOP_CONFIG)], env=env, check=True,
+                       stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        wall_ms = (time.perf_counter_ns() - start_ns) / 1e6
+
+        # The phases of every run, from its timeline.json (record_phase_timings)
+        phases: Dict[str, List[float]] = dict()
+        run_durations = []
+        timelines = list(Path(output_path).glob('noop_benchmark/*/timeline.json'))
+        for timeline_path in timelines:
+            with open(timeline_path) as f:
+                timeline = json.load(f)
+            for phase in timeline['phases']:
+                phases.setdefault(phase['name'], []).append(phase['duration_ms'])
+            run_durations.append((max(phase['end_ns'] for phase in timeline['phases']) -
+                                  min(phase['start_ns'] for phase in timeline['phases'])) / 1e6)
+
+    summary = {'wall_ms': wall_ms, 'per_run_ms': wall_ms / max(len(timelines), 1),
+               'run_median_ms': statistics.median(run_durations) if run_durations else 0,
+               # Interpreter start, run table creation, waiting for runs, checkpoints, ...
+               'outside_runs_ms': wall_ms - sum(run_durations)}
+    for name, durations in phases.items():
+        summary[f'{name}_median_ms'] = statistics.median(durations)
+    return summary
+
+
+def bench_end_to_end(results: Results, quick: bool):
+    #            factors, levels, repetitions, data columns, backend, isolation
+    experiments = [(3, 2, 1, 2, 'CSV', 'PROCESS'),
+                   (3, 2, 4, 2, 'CSV', 'PROCESS'),
+                   (3, 2, 4, 50, 'CSV', 'PROCESS')]
+    if not quick:
+        experiments += [(3, 2, 16, 2, 'CSV', 'PROCESS'),
+                        (5, 2, 1, 2, 'CSV', 'PROCESS'),   # As many runs as (3, 2, 4), with more factors
+                        (3, 2, 4, 2, 'SQLITE', 'PROCESS'),
+                        (3, 2, 4, 2, 'CSV', 'WORKER')]
+
+    for nr_factors, nr_levels, repetitions, nr_data_columns, backend, isolation in experiments:
+        params = {'runs': nr_levels ** nr_factors * repetitions, 'factors': nr_factors, 'data_columns': nr_data_columns,
+                  'backend': backend, 'isolation': isolation}
+        for metric, value in run_noop_experiment(nr_factors, nr_levels, repetitions, nr_data_columns, backend, isolation).items():
+            results.add('end_to_end', params, metric, value)
+
+
+BENCHMARKS = {
+    'run_table_generation': bench_run_table_generation,
+    'resume': bench_resume,
+    'update_row_data': bench_update_row_data,
+    'event_dispatch': bench_event_dispatch,
+    'output_logging': bench_output_logging,
+    'process_creation': bench_process_creation,
+    'end_to_end': bench_end_to_end,
+}
+
+
+# ============================================ RESULTS =============================================
+
+def git_commit() -> Optional[str]:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT_DIR, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return commit + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[Dict], baseline_path: Path, threshold: float) -> bool:
+    """Print every result next to the same result of the baseline. Returns whether any result regressed."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    baseline_values = {result_key(result): result['value'] for result in baseline['results']}
+
+    rows, regressed = [], False
+    for result in results:
+        key = result_key(result)
+        if key not in baseline_values:
+            continue
+        before, after = baseline_values[key], result['value']
+        ratio = after / before if before else float('inf') if after else 1.0
+        # Only durations regress by growing
+        is_regression = ratio > threshold and result['metric'].endswith(('_ms', '_us'))
+        regressed |= is_regression
+        rows.append([key, before, after, f"{ratio:.2f}x", 'REGRESSION' if is_regression else ''])
+
+    print(f"\nCompared to {baseline_path} (commit {baseline['metadata'].get('commit')}):")
+    print(tabulate(rows, headers=['Result', 'Baseline', 'Current', 'Ratio', ''], floatfmt='.3f'))
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the overhead of Experiment Runner itself")
+    parser.add_argument('--quick', action='store_true', help="smaller designs and fewer calls, to check quickly")
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help="run only the given benchmarks")
+    parser.add_argument('--output', type=Path, help="where to write the results (default: benchmark/results/<commit>.json)")
+    parser.add_argument('--compare', type=Path, help="results of an earlier commit to compare with")
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help="ratio to the baseline above which a result counts as a regression (default: 1.2)")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    output_path = args.output or ROOT_DIR / 'benchmark' / 'results' / f"{(commit or 'unknown')[:12]}.json"
+
+    results = Results()
+    for name in args.only or BENCHMARKS:
+        print(f"{name}:", flush=True)
+        BENCHMARKS[name](results, args.quick)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w') as f:
+        json.dump({
+            'metadata': {
+                'commit': commit,
+                'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+                'quick': args.quick,
+            },
+            'results': results.results
+        }, f, indent=2)
+    print(f"\nResults written to {output_path}")
+
+    if args.compare and compare(results.results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
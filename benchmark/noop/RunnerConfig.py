@@ -0,0 +1,73 @@
+from EventManager.Models.RunnerEvents import RunnerEvents
+from EventManager.EventSubscriptionController import EventSubscriptionController
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.RunnerContext import RunnerContext
+from ConfigValidator.Config.Models.OperationType import OperationType
+from ConfigValidator.Config.Models.RunTableBackend import RunTableBackend
+from ConfigValidator.Config.Models.RunIsolationType import RunIsolationType
+
+from typing import Dict, Any, Optional
+from pathlib import Path
+from os.path import dirname, realpath
+import os
+
+
+class RunnerConfig:
+    """A config whose hooks do nothing, so the time an experiment takes is the overhead of the framework itself.
+    Its size is set through the environment by `benchmark/benchmark.py`:
+
+      BENCHMARK_FACTORS         number of factors                       (default 2)
+      BENCHMARK_LEVELS          number of treatment levels per factor   (default 2)
+      BENCHMARK_REPETITIONS     repetitions of every combination        (default 1)
+      BENCHMARK_DATA_COLUMNS    number of data columns, all populated   (default 2)
+      BENCHMARK_BACKEND         CSV or SQLITE                           (default CSV)
+      BENCHMARK_ISOLATION       PROCESS or WORKER                       (default PROCESS)
+      BENCHMARK_OUTPUT          results_output_path                     (default benchmark/noop/experiments)"""
+    ROOT_DIR = Path(dirname(realpath(__file__)))
+
+    nr_factors:                 int             = int(os.environ.get('BENCHMARK_FACTORS', 2))
+    nr_levels:                  int             = int(os.environ.get('BENCHMARK_LEVELS', 2))
+    nr_repetitions:             int             = int(os.environ.get('BENCHMARK_REPETITIONS', 1))
+    nr_data_columns:            int             = int(os.environ.get('BENCHMARK_DATA_COLUMNS', 2))
+
+    # ================================ USER SPECIFIC CONFIG ================================
+    name:                       str             = "noop_benchmark"
+    results_output_path:        Path            = Path(os.environ.get('BENCHMARK_OUTPUT', ROOT_DIR / 'experiments'))
+    operation_type:             OperationType   = OperationType.AUTO
+    time_between_runs_in_ms:    int             = 0
+
+    run_table_backend:          RunTableBackend = RunTableBackend[os.environ.get('BENCHMARK_BACKEND', 'CSV')]
+    run_isolation:              RunIsolationType = RunIsolationType[os.environ.get('BENCHMARK_ISOLATION', 'PROCESS')]
+
+    """Every run stores the time spent in its phases in timeline.json, which the benchmark aggregates"""
+    record_phase_timings:       bool            = True
+
+    def __init__(self):
+        EventSubscriptionController.subscribe_to_multiple_events([
+            (RunnerEvents.START_RUN        , self.noop             ),
+            (RunnerEvents.START_MEASUREMENT, self.noop             ),
+            (RunnerEvents.INTERACT         , self.noop             ),
+            (RunnerEvents.STOP_MEASUREMENT , self.noop             ),
+            (RunnerEvents.STOP_RUN         , self.noop             ),
+            (RunnerEvents.POPULATE_RUN_DATA, self.populate_run_data),
+        ])
+        self.run_table_model = None  # Initialized later
+
+    def create_run_table_model(self) -> RunTableModel:
+        factors = [FactorModel(f"factor_{i}", list(range(self.nr_levels))) for i in range(self.nr_factors)]
+        self.run_table_model = RunTableModel(
+            factors=factors,
+            repetitions=self.nr_repetitions,
+            data_columns=[f"data_{i}" for i in range(self.nr_data_columns)]
+        )
+        return self.run_table_model
+
+    def noop(self, context: RunnerContext) -> None:
+        pass
+
+    def populate_run_data(self, context: RunnerContext) -> Optional[Dict[str, Any]]:
+        return {data_column: 0 for data_column in self.run_table_model.get_data_columns()}
+
+    # ================================ DO NOT ALTER BELOW THIS LINE ================================
+    experiment_path:            Path             = None
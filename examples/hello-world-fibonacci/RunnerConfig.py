@@ -117,7 +117,7 @@ class RunnerConfig:
 
         return {"energy": eb_summary["total_joules"],
                 "runtime": eb_summary["runtime_seconds"], 
-                "memory": max(eb_log["USED_MEMORY"].values())}
+                "memory": int(eb_log["USED_MEMORY"].max())}
 
     def after_experiment(self) -> None:
         """Perform any activity required after stopping the experiment here
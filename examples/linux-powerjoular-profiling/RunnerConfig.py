@@ -14,7 +14,6 @@ from os.path import dirname, realpath
 
 import time
 import subprocess
-import numpy as np
 
 class RunnerConfig:
     ROOT_DIR = Path(dirname(realpath(__file__)))
@@ -133,8 +132,9 @@ class RunnerConfig:
         # a second csv for that target will be generated
         # results_process = self.meter.parse_log(self.meter.target_logfile)
         return {
-            'avg_cpu': round(np.mean(list(results_global['CPU Utilization'].values())), 3),
-            'total_energy': round(sum(list(results_global['CPU Power'].values())), 3),
+            'avg_cpu': round(results_global.mean('CPU Utilization'), 3),
+            # The CPU power (W) integrated over the time of the samples (s)
+            'total_energy': round(results_global.integrate('CPU Power'), 3),
         }
 
     def after_experiment(self) -> None:
@@ -11,7 +11,6 @@ from typing import Dict, List, Any, Optional
 from pathlib import Path
 from os.path import dirname, realpath
 
-import numpy as np
 import time
 import subprocess
 import shlex
@@ -142,8 +141,8 @@ class RunnerConfig:
                                        column_names=["cpu_usage", "memory_usage"])
 
         return {
-            "avg_cpu": round(np.mean(list(results['cpu_usage'].values())), 3),
-            "avg_mem": round(np.mean(list(results['memory_usage'].values())), 3)
+            "avg_cpu": round(results.mean('cpu_usage'), 3),
+            "avg_mem": round(results.mean('memory_usage'), 3)
         }
 
     def after_experiment(self) -> None:
@@ -9,7 +9,6 @@ from Plugins.Profilers.NvidiaML import NvidiaML, NVML_Sample, NVML_Field, NVML_G
 
 from typing import Dict, List, Any, Optional
 from pathlib import Path
-import numpy as np
 import time
 from os.path import dirname, realpath
 
@@ -73,7 +72,8 @@ class RunnerConfig:
                                          NVML_Field.NVML_FI_DEV_TOTAL_ENERGY_CONSUMPTION],
                                  samples=[NVML_Sample.NVML_ENC_UTILIZATION_SAMPLES,
                                           NVML_Sample.NVML_DEC_UTILIZATION_SAMPLES],
-                                 settings={"GpuOperationMode": (NVML_GPU_Operation_Mode.NVML_GOM_ALL_ON,)})
+                                 settings={"GpuOperationMode": (NVML_GPU_Operation_Mode.NVML_GOM_ALL_ON,)},
+                                 log_format="binary")
 
         # Show stats about available GPUs
         devices = self.profiler.list_devices(print_dev=True)
@@ -91,7 +91,7 @@ class RunnerConfig:
         For example, starting the target system to measure.
         Activities after starting the run should also be performed here."""
 
-        self.profiler.logfile = context.run_dir / "nvml_log.json"
+        self.profiler.logfile = context.run_dir / "nvml_log.bin"
 
         # Start your GPU based target program here
 
@@ -123,11 +123,11 @@ class RunnerConfig:
         # Aggregate some data for results
         return {
             "avg_enc": 0 if len(nvml_log["enc_utilization_samples"]) == 0
-                       else np.mean(list(map(lambda x: x[1], nvml_log["enc_utilization_samples"]))),
+                       else nvml_log["enc_utilization_samples"].mean("value"),
             "avg_dec": 0 if len(nvml_log["dec_utilization_samples"]) == 0
-                       else np.mean(list(map(lambda x: x[1], nvml_log["dec_utilization_samples"]))),
+                       else nvml_log["dec_utilization_samples"].mean("value"),
             "avg_pstate": 0 if len(nvml_log["NVML_PERFORMANCE_STATE"]) == 0
-                       else np.mean(list(map(lambda x: x[1], nvml_log["NVML_PERFORMANCE_STATE"]))),
+                       else nvml_log["NVML_PERFORMANCE_STATE"].mean("value"),
         }
 
     def after_experiment(self) -> None:
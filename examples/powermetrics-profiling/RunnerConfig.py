@@ -110,7 +110,7 @@ class RunnerConfig:
         Returns a dictionary with keys `self.run_table_model.data_columns` and their values populated"""
         
         # Retrieve data from run
-        run_results = self.meter.parse_log(context.run_dir / "powermetrics.plist")
+        run_results = self.meter.parse_log(context.run_dir / "powermetrics.plist", keys=["processor"])
 
         # Parse it as required for your experiment and add it to the run table
         return {
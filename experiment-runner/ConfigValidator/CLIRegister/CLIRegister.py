@@ -1,6 +1,8 @@
 import os
 import uuid
 import inspect
+from importlib import util
+from pathlib import Path
 from typing import List
 from shutil import copyfile
 from tabulate import tabulate
@@ -9,6 +11,11 @@ from ConfigValidator.Config.RunnerConfig import RunnerConfig
 from ExperimentOrchestrator.Misc.BashHeaders import BashHeaders
 from ExperimentOrchestrator.Misc.PathValidation import is_path_exists_or_creatable_portable
 from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+from ProgressManager.Output.SQLiteOutputManager import SQLiteOutputManager
+from ProgressManager.Output.RunTableOutputManager import RunTableOutputManager
+from ProgressManager.Output.ParquetOutputManager import ParquetOutputManager
+from ProgressManager.Output.TraceRecorder import TraceRecorder
+from ConfigValidator.Config.Validation.ConfigValidator import ConfigValidator
 from ConfigValidator.CustomErrors.CLIErrors import *
 
 class ConfigCreate:
@@ -77,6 +84,88 @@ class Prepare:
     def execute(args=None) -> None:
         pass
 
+class RunTableExport:
+    @staticmethod
+    def description_params() -> str:
+        return "<path_to_experiment_dir>"
+
+    @staticmethod
+    def description_short() -> str:
+        return "Exports the run table of an experiment using the SQLite backend to its run_table.csv"
+
+    @staticmethod
+    def description_long() -> str:
+        output.console_log_bold("With `run_table_backend = RunTableBackend.SQLITE`, run_table.csv is only written at every checkpoint.\n"
+                                "run-table-export writes it from run_table.db right away, e.g. while the experiment is running.")
+
+    @staticmethod
+    def execute(args=None) -> None:
+        if args is None or len(args) != 3:
+            raise CommandNotRecognisedError
+
+        experiment_path = Path(args[2])
+        if not (experiment_path / SQLiteOutputManager.run_table_file).is_file():
+            raise InvalidUserSpecifiedPathError(experiment_path / SQLiteOutputManager.run_table_file)
+
+        destination = SQLiteOutputManager(experiment_path).export_csv()
+        output.console_log_OK(f"Successfully exported the run table to: {destination}")
+
+class ParquetExport:
+    @staticmethod
+    def description_params() -> str:
+        return "<path_to_config.py>"
+
+    @staticmethod
+    def description_short() -> str:
+        return "Exports the run table and profiler logs of an experiment to Parquet (requires pyarrow)"
+
+    @staticmethod
+    def description_long() -> str:
+        output.console_log_bold("parquet-export writes the run table and the profiler logs of the experiment of the given config "
+                                "to <experiment_path>/parquet, as at the end of an experiment with `export_parquet = True`.\n"
+                                "Logs that were exported before, and did not change since, are skipped.")
+
+    @staticmethod
+    def execute(args=None) -> None:
+        if args is None or len(args) != 3 or not args[2].endswith('.py'):
+            raise CommandNotRecognisedError
+
+        spec = util.spec_from_file_location(Path(args[2]).stem, args[2])
+        config_file = util.module_from_spec(spec)
+        spec.loader.exec_module(config_file)
+
+        config = config_file.RunnerConfig()
+        ConfigValidator.validate_config(config)
+        factor_names = [factor.factor_name for factor in config.create_run_table_model().get_factors()]
+
+        ParquetOutputManager(config.experiment_path, factor_names, config.parquet_log_readers) \
+            .export(RunTableOutputManager.create(config).read_run_table())
+
+class TraceExport:
+    @staticmethod
+    def description_params() -> str:
+        return "<path_to_experiment_dir>"
+
+    @staticmethod
+    def description_short() -> str:
+        return "Exports the trace events recorded so far (export_trace) to trace.json"
+
+    @staticmethod
+    def description_long() -> str:
+        output.console_log_bold("With `export_trace = True`, trace.json is written at the end of the experiment.\n"
+                                "trace-export writes it from trace.jsonl right away, e.g. while the experiment is running, or after it crashed.")
+
+    @staticmethod
+    def execute(args=None) -> None:
+        if args is None or len(args) != 3:
+            raise CommandNotRecognisedError
+
+        experiment_path = Path(args[2])
+        if not (experiment_path / TraceRecorder.events_file).is_file():
+            raise InvalidUserSpecifiedPathError(experiment_path / TraceRecorder.events_file)
+
+        TraceRecorder().export(experiment_path)
+
 class Help:
     @staticmethod
     def description_params() -> str:
@@ -106,6 +195,9 @@ class CLIRegister:
     register = {
         "config-create":    ConfigCreate,
         "prepare":          Prepare,
+        "run-table-export": RunTableExport,
+        "parquet-export":   ParquetExport,
+        "trace-export":     TraceExport,
         "help":             Help
     }
 
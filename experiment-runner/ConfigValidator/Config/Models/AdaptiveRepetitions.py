@@ -0,0 +1,70 @@
+import math
+import statistics
+from typing import Dict, List, Optional
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+
+
+class AdaptiveRepetitions:
+    """Sequential stopping rule for the repetitions of a treatment combination.
+
+    After the `repetitions` of the run table model, a combination is repeated again (in rounds, up to
+    `max_repetitions` in total) as long as, for any of the watched data columns, the confidence interval of the mean
+    is wider than `max_ci_half_width` (in the unit of the data column), or the relative standard error
+    (standard error / |mean|) exceeds `max_relative_standard_error`. At least one of both targets must be given."""
+
+    def __init__(self,
+                 data_columns: List[str],
+                 max_repetitions: int,
+                 max_ci_half_width: Optional[float] = None,
+                 max_relative_standard_error: Optional[float] = None,
+                 confidence_level: float = 0.95
+                 ):
+        if not data_columns:
+            raise BaseError("Adaptive repetitions need at least one data column to watch!")
+        if max_ci_half_width is None and max_relative_standard_error is None:
+            raise BaseError("Adaptive repetitions need a confidence interval half-width or relative standard error target!")
+        if not 0 < confidence_level < 1:
+            raise BaseError("The confidence level of adaptive repetitions must lie between 0 and 1!")
+
+        self.data_columns = data_columns
+        self.max_repetitions = max_repetitions
+        self.max_ci_half_width = max_ci_half_width
+        self.max_relative_standard_error = max_relative_standard_error
+        self.confidence_level = confidence_level
+
+    def is_satisfied(self, samples: Dict[str, List[float]]) -> bool:
+        """Whether the measured values (per watched data column) of a treatment combination meet the targets"""
+        for data_column in self.data_columns:
+            values = samples.get(data_column, [])
+            if len(values) < 2:
+                return False
+
+            standard_error = statistics.stdev(values) / math.sqrt(len(values))
+            if self.max_ci_half_width is not None:
+                t = self.t_quantile(0.5 + self.confidence_level / 2, len(values) - 1)
+                if t * standard_error > self.max_ci_half_width:
+                    return False
+
+            if self.max_relative_standard_error is not None:
+                mean = statistics.fmean(values)
+                if standard_error > 0 and (mean == 0 or standard_error / abs(mean) > self.max_relative_standard_error):
+                    return False
+        return True
+
+    @staticmethod
+    def t_quantile(p: float, degrees_of_freedom: int) -> float:
+        """Quantile function of Student's t-distribution.
+        Exact for 1 and 2 degrees of freedom, a Cornish-Fisher expansion around the normal quantile otherwise."""
+        if degrees_of_freedom == 1:
+            return math.tan(math.pi * (p - 0.5))
+        if degrees_of_freedom == 2:
+            return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+
+        z = statistics.NormalDist().inv_cdf(p)
+        v = degrees_of_freedom
+        return (z
+                + (z ** 3 + z) / (4 * v)
+                + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * v ** 2)
+                + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * v ** 3)
+                + (79 * z ** 9 + 776 * z ** 7 + 1482 * z ** 5 - 1920 * z ** 3 - 945 * z) / (92160 * v ** 4))
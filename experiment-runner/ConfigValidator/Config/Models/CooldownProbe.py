@@ -0,0 +1,81 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+
+
+class CooldownProbe(ABC):
+    """A cheap reading of the system state, polled between runs.
+    The system has cooled down once the reading is at most `tolerance` above the baseline reading."""
+
+    def __init__(self, name: str, tolerance: float):
+        self.name = name
+        self.tolerance = tolerance
+
+    @abstractmethod
+    def read(self) -> float:
+        pass
+
+    def is_cooled_down(self, reading: float, baseline: float) -> bool:
+        return reading <= baseline + self.tolerance
+
+
+class ThermalZoneProbe(CooldownProbe):
+    """The highest temperature (in °C) of the thermal zones under /sys/class/thermal.
+    `zone_types` limits the probe to zones of the given types (e.g. ['x86_pkg_temp']), by default all zones are used."""
+
+    def __init__(self,
+                 zone_types: Optional[List[str]] = None,
+                 tolerance_in_celsius: float = 2.0,
+                 thermal_path: Path = Path('/sys/class/thermal')
+                 ):
+        super().__init__('thermal', tolerance_in_celsius)
+
+        self.__zones = []
+        for zone in sorted(thermal_path.glob('thermal_zone*')):
+            zone_type = (zone / 'type').read_text().strip() if (zone / 'type').exists() else ''
+            if zone_types is None or zone_type in zone_types:
+                self.__zones.append(zone / 'temp')
+
+        if not self.__zones:
+            raise BaseError(f"No thermal zones found under {thermal_path}")
+
+    def read(self) -> float:
+        # Temperatures are reported in millidegrees Celsius
+        return max(int(zone.read_text()) for zone in self.__zones) / 1000
+
+
+class CpuUtilizationProbe(CooldownProbe):
+    """The CPU utilization (in %) of the whole system since the previous reading, from /proc/stat"""
+
+    def __init__(self, tolerance_in_percent: float = 5.0, stat_path: Path = Path('/proc/stat')):
+        super().__init__('cpu_utilization', tolerance_in_percent)
+        self.__stat_path = stat_path
+        self.__previous = self.__read_times()
+
+    def __read_times(self):
+        with open(self.__stat_path, 'r') as stat:
+            # cpu  user nice system idle iowait irq softirq steal guest guest_nice
+            times = [int(value) for value in stat.readline().split()[1:9]]
+        return sum(times), times[3] + times[4]
+
+    def read(self) -> float:
+        total, idle = self.__read_times()
+        previous_total, previous_idle = self.__previous
+        self.__previous = (total, idle)
+
+        if total == previous_total:
+            return 0.0
+        return 100 * (1 - (idle - previous_idle) / (total - previous_total))
+
+
+class CallbackProbe(CooldownProbe):
+    """Any reading provided by the given callback, e.g. the power draw reported by an external meter"""
+
+    def __init__(self, name: str, callback: Callable[[], float], tolerance: float):
+        super().__init__(name, tolerance)
+        self.__callback = callback
+
+    def read(self) -> float:
+        return float(self.__callback())
@@ -0,0 +1,227 @@
+import itertools
+import math
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+import numpy as np
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+
+
+class DesignModel(ABC):
+    """An experimental design selects the treatment combinations that make up the run table.
+
+    Designs work on treatment level indices: given the number of levels of every factor, `generate()` returns the
+    (sorted, unique) indices of the selected combinations in the row-major grid of all combinations.
+    Exclusions and repetitions are applied by the RunTableModel afterwards, the same as for the full factorial design."""
+
+    @abstractmethod
+    def generate(self, radices: List[int]) -> np.ndarray:
+        pass
+
+    @staticmethod
+    def grid_indices(levels: np.ndarray, radices: List[int]) -> np.ndarray:
+        """Turn a (runs x factors) array of treatment level indices into sorted, unique grid indices"""
+        strides = np.array([math.prod(radices[pos + 1:]) for pos in range(len(radices))], dtype=np.int64)
+        return np.unique(levels.astype(np.int64) @ strides)
+
+
+class FullFactorialDesign(DesignModel):
+    """Every combination of treatment levels. This is the default design."""
+
+    def generate(self, radices: List[int]) -> np.ndarray:
+        return np.arange(math.prod(radices), dtype=np.int64)
+
+
+class FractionalFactorialDesign(DesignModel):
+    """A regular 2^(k-p) fractional factorial design of the given resolution, for factors with two treatment levels.
+
+    Resolution III keeps main effects free of each other, resolution IV also keeps them free of two-factor
+    interactions, and resolution V keeps two-factor interactions free of each other.
+    The smallest number of runs (2^k) for which generators are found is used."""
+
+    __SEARCH_BUDGET = 100000  # Nodes to visit when searching for generators, before trying a larger fraction
+
+    def __init__(self, resolution: int = 4):
+        if resolution not in (3, 4, 5):
+            raise BaseError("Fractional factorial designs support resolution III, IV and V only!")
+        self.resolution = resolution
+
+    def generate(self, radices: List[int]) -> np.ndarray:
+        if any(radix != 2 for radix in radices):
+            raise BaseError("Fractional factorial designs require exactly two treatment levels for every factor!")
+
+        nr_factors = len(radices)
+        for nr_base in range(1, nr_factors + 1):
+            generators = self.generators(nr_factors, nr_base)
+            if generators is not None:
+                break
+
+        # The base factors form a full factorial, every added factor is the product (parity) of its generator word
+        runs = np.arange(2 ** nr_base, dtype=np.int64)
+        columns = [(runs >> bit) & 1 for bit in range(nr_base)]
+        for generator in generators:
+            column = np.zeros(len(runs), dtype=np.int64)
+            for bit in range(nr_base):
+                if generator >> bit & 1:
+                    column ^= (runs >> bit) & 1
+            columns.append(column)
+        return self.grid_indices(np.stack(columns, axis=1), radices)
+
+    def generators(self, nr_factors: int, nr_base: int) -> Optional[List[int]]:
+        """Generator words (bitmasks over the base factors) for the added factors, or None if none are found
+        that reach the resolution with `nr_base` base factors."""
+        nr_added = nr_factors - nr_base
+        if nr_added == 0:
+            return []
+
+        candidates = sorted((word for word in range(1, 2 ** nr_base) if bin(word).count('1') >= self.resolution - 1),
+                            key=lambda word: (bin(word).count('1'), word))
+        budget = [self.__SEARCH_BUDGET]
+
+        def search(start: int, chosen: List[int], defining_words: List[int]) -> Optional[List[int]]:
+            if len(chosen) == nr_added:
+                return chosen
+            for idx in range(start, len(candidates) - (nr_added - len(chosen) - 1)):
+                budget[0] -= 1
+                if budget[0] < 0:
+                    return None
+
+                # The defining word of the added factor includes the added factor itself
+                word = candidates[idx] | (1 << (nr_base + len(chosen)))
+                new_words = [word] + [word ^ existing for existing in defining_words]
+                if all(bin(w).count('1') >= self.resolution for w in new_words):
+                    found = search(idx + 1, chosen + [candidates[idx]], defining_words + new_words)
+                    if found is not None:
+                        return found
+            return None
+
+        return search(0, [], [])
+
+
+class OrthogonalArrayDesign(DesignModel):
+    """A strength 2 orthogonal array (Rao-Hamming construction), for factors that all have the same prime number
+    of treatment levels. Every pair of factors is seen in every combination of their levels equally often,
+    so all main effects are estimable from s^k runs."""
+
+    def generate(self, radices: List[int]) -> np.ndarray:
+        levels = radices[0]
+        if any(radix != levels for radix in radices):
+            raise BaseError("Orthogonal array designs require the same number of treatment levels for every factor!")
+        if levels < 2 or any(levels % d == 0 for d in range(2, math.isqrt(levels) + 1)):
+            raise BaseError("Orthogonal array designs require a prime number of treatment levels!")
+
+        nr_factors = len(radices)
+        nr_base = 1
+        while (levels ** nr_base - 1) // (levels - 1) < nr_factors:
+            nr_base += 1
+
+        # Columns are the non-zero vectors of GF(s)^k with a leading 1, starting with the unit vectors
+        vectors = [v for v in itertools.product(range(levels), repeat=nr_base)
+                   if any(v) and v[next(i for i, x in enumerate(v) if x)] == 1]
+        vectors.sort(key=lambda v: (sum(1 for x in v if x) != 1, v[::-1]))
+        columns = np.array(vectors[:nr_factors], dtype=np.int64).T
+
+        runs = np.array(list(itertools.product(range(levels), repeat=nr_base)), dtype=np.int64)
+        return self.grid_indices((runs @ columns) % levels, radices)
+
+
+class LatinHypercubeDesign(DesignModel):
+    """Latin hypercube sampling: every factor's range is split in `samples` strata that are each sampled once.
+    The samples are mapped onto the treatment levels in order, so every level is used (close to) equally often.
+    Samples that end up on the same treatment combination are only run once.
+    The seed is fixed, so that the same run table is generated when the experiment is resumed (or by other nodes),
+    pass another seed to draw other combinations."""
+
+    def __init__(self, samples: int, seed: int = 0):
+        if samples < 1:
+            raise BaseError("A Latin hypercube design needs at least one sample!")
+        self.samples = samples
+        self.seed = seed
+
+    def generate(self, radices: List[int]) -> np.ndarray:
+        rng = np.random.default_rng(self.seed)
+        columns = []
+        for radix in radices:
+            points = (rng.permutation(self.samples) + rng.random(self.samples)) / self.samples
+            columns.append(np.minimum((points * radix).astype(np.int64), radix - 1))
+        return self.grid_indices(np.stack(columns, axis=1), radices)
+
+
+class SobolDesign(DesignModel):
+    """The first `samples` points of a Sobol sequence, mapped onto the treatment levels.
+    Supports up to 24 factors. With a seed, the sequence is randomized with a digital shift.
+    Samples that end up on the same treatment combination are only run once."""
+
+    __BITS = 32
+    # Joe & Kuo (new-joe-kuo-6.21201) primitive polynomials (degree s, coefficients a) and initial direction numbers m
+    # for dimensions 2 onwards. The first dimension uses m = 1 for every bit.
+    __DIRECTION_NUMBERS = [
+        (1, 0, [1]),
+        (2, 1, [1, 3]),
+        (3, 1, [1, 3, 1]),
+        (3, 2, [1, 1, 1]),
+        (4, 1, [1, 1, 3, 3]),
+        (4, 4, [1, 3, 5, 13]),
+        (5, 2, [1, 1, 5, 5, 17]),
+        (5, 4, [1, 1, 5, 5, 5]),
+        (5, 7, [1, 1, 7, 11, 19]),
+        (5, 11, [1, 1, 5, 1, 1]),
+        (5, 13, [1, 1, 1, 3, 11]),
+        (5, 14, [1, 3, 5, 5, 31]),
+        (6, 1, [1, 3, 3, 9, 7, 49]),
+        (6, 13, [1, 1, 1, 15, 21, 21]),
+        (6, 16, [1, 3, 1, 13, 27, 49]),
+        (6, 19, [1, 1, 1, 15, 7, 5]),
+        (6, 22, [1, 3, 1, 15, 13, 25]),
+        (6, 25, [1, 1, 5, 5, 19, 61]),
+        (7, 1, [1, 3, 7, 11, 23, 15, 103]),
+        (7, 4, [1, 3, 7, 13, 13, 15, 69]),
+        (7, 7, [1, 1, 3, 13, 7, 35, 63]),
+        (7, 8, [1, 3, 5, 9, 1, 25, 53]),
+        (7, 14, [1, 3, 1, 13, 9, 35, 107]),
+    ]
+
+    def __init__(self, samples: int, seed: Optional[int] = None):
+        if not 1 <= samples <= 2 ** self.__BITS:
+            raise BaseError(f"A Sobol design needs between 1 and 2^{self.__BITS} samples!")
+        self.samples = samples
+        self.seed = seed
+
+    @classmethod
+    def __direction_numbers(cls, dimension: int) -> List[int]:
+        if dimension == 0:
+            return [1 << (cls.__BITS - 1 - bit) for bit in range(cls.__BITS)]
+
+        s, a, m = cls.__DIRECTION_NUMBERS[dimension - 1]
+        m = list(m)
+        for bit in range(s, cls.__BITS):
+            value = m[bit - s] ^ (m[bit - s] << s)
+            for k in range(1, s):
+                if a >> (s - 1 - k) & 1:
+                    value ^= m[bit - k] << k
+            m.append(value)
+        return [m[bit] << (cls.__BITS - 1 - bit) for bit in range(cls.__BITS)]
+
+    def points(self, dimensions: int) -> np.ndarray:
+        """The (samples x dimensions) integer coordinates of the sequence, in units of 2^-32"""
+        if dimensions > len(self.__DIRECTION_NUMBERS) + 1:
+            raise BaseError(f"Sobol designs support up to {len(self.__DIRECTION_NUMBERS) + 1} factors!")
+
+        index = np.arange(self.samples, dtype=np.int64)
+        gray = index ^ (index >> 1)
+        shifts = np.random.default_rng(self.seed).integers(0, 2 ** self.__BITS, dimensions) if self.seed is not None \
+            else np.zeros(dimensions, dtype=np.int64)
+
+        points = np.zeros((self.samples, dimensions), dtype=np.int64)
+        for dimension in range(dimensions):
+            directions = self.__direction_numbers(dimension)
+            for bit in range(min(self.__BITS, max(1, (self.samples - 1).bit_length()))):
+                points[:, dimension] ^= np.where((gray >> bit) & 1, directions[bit], 0)
+            points[:, dimension] ^= shifts[dimension]
+        return points
+
+    def generate(self, radices: List[int]) -> np.ndarray:
+        points = self.points(len(radices))
+        levels = (points * np.array(radices, dtype=np.int64)) >> self.__BITS
+        return self.grid_indices(levels, radices)
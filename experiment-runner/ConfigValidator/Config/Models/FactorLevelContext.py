@@ -0,0 +1,16 @@
+from typing import Any
+
+from ExtendedTyping.Typing import SupportsStr
+
+
+class FactorLevelContext:
+    """The treatment level of a factor that is set up (SETUP_FACTOR_LEVEL) or torn down (TEARDOWN_FACTOR_LEVEL).
+
+    `setup` holds what an earlier setup of the treatment level returned, so that its artifacts (e.g. a build path)
+    can be reused: when setting up it is None if the level was not set up before, when tearing down it is the value
+    the setup returned."""
+
+    def __init__(self, factor_name: str, treatment: SupportsStr, setup: Any = None):
+        self.factor_name = factor_name
+        self.treatment = treatment
+        self.setup = setup
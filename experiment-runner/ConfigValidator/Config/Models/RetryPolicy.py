@@ -0,0 +1,31 @@
+from typing import Tuple, Type
+
+
+class RetryPolicy:
+    """How often a failed run is tried again before it is marked as FAILED.
+
+    Only runs that raised one of the `retry_on` exceptions, or (with `retry_on_timeout`) exceeded a phase timeout,
+    are retried. Attempt n+1 starts `backoff_in_ms * backoff_factor^(n-1)` ms (at most `max_backoff_in_ms`) after
+    attempt n failed."""
+
+    def __init__(self,
+                 max_attempts: int = 1,
+                 backoff_in_ms: int = 1000,
+                 backoff_factor: float = 2.0,
+                 max_backoff_in_ms: int = 60000,
+                 retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+                 retry_on_timeout: bool = True
+                 ):
+        self.max_attempts = max_attempts
+        self.backoff_in_ms = backoff_in_ms
+        self.backoff_factor = backoff_factor
+        self.max_backoff_in_ms = max_backoff_in_ms
+        self.retry_on = tuple(retry_on)
+        self.retry_on_timeout = retry_on_timeout
+
+    def is_retryable(self, exception: BaseException) -> bool:
+        return isinstance(exception, self.retry_on)
+
+    def delay_in_ms(self, attempt: int) -> int:
+        """Time to wait after the given (1-based) attempt failed"""
+        return round(min(self.max_backoff_in_ms, self.backoff_in_ms * self.backoff_factor ** (attempt - 1)))
@@ -0,0 +1,12 @@
+from enum import Enum, auto
+
+class RunIsolationType(Enum):
+    """If set to PROCESS, every run is executed in its own freshly forked process.
+    Runs cannot influence each other through state left behind in the config (or any imported module)."""
+    PROCESS = auto()
+
+    """If set to WORKER, runs are executed by long-lived worker processes, which are recycled after
+    `RunnerConfig.worker_max_runs` runs or once they grow beyond `RunnerConfig.worker_max_memory_in_mb`.
+    This avoids the process creation cost per run, but state left behind by a run remains visible to the next runs
+    executed by the same worker."""
+    WORKER = auto()
@@ -0,0 +1,11 @@
+from enum import Enum, auto
+
+class RunTableBackend(Enum):
+    """If set to CSV, the run table is kept in `run_table.csv`, finished runs are journaled and folded into it
+    every `RunnerConfig.run_table_checkpoint_interval` runs."""
+    CSV = auto()
+
+    """If set to SQLITE, the run table is kept in the `run_table` table of `run_table.db`, with typed factor columns.
+    Finished runs update their row in a transaction, so any number of runs can store their data at the same time.
+    `run_table.csv` is exported from it at every checkpoint and at the end of the experiment."""
+    SQLITE = auto()
@@ -1,20 +1,30 @@
-import itertools
+import math
 import random
-from typing import Dict, List, Tuple
+import numpy as np
+from typing import Dict, List, Optional, Set, Tuple
 
 from ConfigValidator.CustomErrors.BaseError import BaseError
 from ExtendedTyping.Typing import SupportsStr
-from ProgressManager.RunTable.Models.RunProgress import RunProgress
+from ProgressManager.RunTable.Models.RunTable import RunTable
 from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.DesignModel import DesignModel
+from ConfigValidator.Config.Models.AdaptiveRepetitions import AdaptiveRepetitions
+from ConfigValidator.Config.Models.SwitchCostOrdering import SwitchCostOrdering
 
 
 class RunTableModel:
+    __GRID_CHUNK_SIZE = 2 ** 20
+
     def __init__(self,
                  factors: List[FactorModel],
                  exclude_combinations: List[Dict[FactorModel, List[SupportsStr]]] = None,
                  repetitions: int = 1,
                  data_columns: List[str] = None,
-                 shuffle: bool = False
+                 shuffle: bool = False,
+                 shuffle_seed: Optional[int] = None,
+                 design: Optional[DesignModel] = None,
+                 adaptive_repetitions: Optional[AdaptiveRepetitions] = None,
+                 ordering: Optional[SwitchCostOrdering] = None
                  ):
         if exclude_combinations is None:
             exclude_combinations = {}
@@ -30,11 +40,24 @@ class RunTableModel:
         if len(set(data_columns)) != len(data_columns):
             raise BaseError("Duplicate data column detected!")
 
+        if adaptive_repetitions is not None:
+            if not set(adaptive_repetitions.data_columns).issubset(data_columns):
+                raise BaseError("Adaptive repetitions can only watch data columns of the run table!")
+            if adaptive_repetitions.max_repetitions < repetitions:
+                raise BaseError("The maximum number of adaptive repetitions is smaller than the number of repetitions!")
+
+        if shuffle and ordering is not None:
+            raise BaseError("A run table is either shuffled or ordered by switch costs, not both!")
+
         self.__factors = factors
         self.__exclude_combinations = exclude_combinations
         self.__repetitions = repetitions
         self.__data_columns = data_columns
         self.__shuffle = shuffle
+        self.__shuffle_seed = shuffle_seed
+        self.__design = design
+        self.__adaptive_repetitions = adaptive_repetitions
+        self.__ordering = ordering
 
     def get_factors(self) -> List[FactorModel]:
         return self.__factors
@@ -42,57 +65,91 @@ class RunTableModel:
     def get_data_columns(self) -> List[str]:
         return self.__data_columns
 
-    def generate_experiment_run_table(self) -> List[Dict]:
-        def __filter_list(full_list: List[Tuple]):
-            if len(self.__exclude_combinations) == 0:
-                return full_list
-
-            to_remove_indices = []
-            for exclusion in self.__exclude_combinations:
-                # Construct the exclusion tuples
-                list_of_lists = []
-                indexes = []
-                for factor, treatment_list in exclusion.items():
-                    list_of_lists.append(treatment_list)
-                    indexes.append(self.__factors.index(factor))
-                exclude_combinations_list = list(itertools.product(*list_of_lists))
-
-                # Mark the exclusions in the full table
-                for idx, elem in enumerate(full_list):
-                    for exclude_combo in exclude_combinations_list:
-                        if all([exclude_combo[i] == elem[indexes[i]] for i in range(len(indexes))]):
-                            to_remove_indices.append(idx)
-
-            to_remove_indices.sort(reverse=True)
-            for idx in to_remove_indices:
-                del full_list[idx]
-            return full_list
-
-        list_of_lists = [factor.treatments for factor in self.__factors]
-        combinations_list = list(itertools.product(*list_of_lists))
-        filtered_list = __filter_list(combinations_list)
-
-        column_names = ['__run_id', '__done']  # Needed for experiment-runner functionality
-        for factor in self.__factors:
-            column_names.append(factor.factor_name)
-
-        if self.__data_columns:
-            for data_column in self.__data_columns:
-                column_names.append(data_column)
-
-        experiment_run_table = []
-        for j in range(self.__repetitions):
-            for i, combo in enumerate(filtered_list):
-                row_list = list(combo)
-                row_list.insert(0, f'run_{i}_repetition_{j}')  # __run_id
-                row_list.insert(1, RunProgress.TODO)  # __done
-
-                if self.__data_columns:
-                    for _ in self.__data_columns:
-                        row_list.append(" ")
-                experiment_run_table.append(dict(zip(column_names, row_list)))
-
+    def get_adaptive_repetitions(self) -> Optional[AdaptiveRepetitions]:
+        return self.__adaptive_repetitions
+
+    def __indexed_exclusions(self) -> List[List[Tuple[int, Set[int]]]]:
+        """Translate every exclusion into (factor position, excluded treatment level indices) pairs,
+        so that they can be matched against treatment level indices instead of the (arbitrary) treatment objects."""
+        factor_positions = {factor: pos for pos, factor in enumerate(self.__factors)}
+        level_indices = [{treatment: idx for idx, treatment in enumerate(factor.treatments)} for factor in self.__factors]
+
+        indexed_exclusions = []
+        for exclusion in self.__exclude_combinations:
+            indexed_exclusion = []
+            for factor, treatment_list in exclusion.items():
+                if factor not in factor_positions:
+                    raise BaseError(f"Excluded combination refers to unknown factor {factor.factor_name}!")
+
+                pos = factor_positions[factor]
+                # Treatments that are not levels of the factor can never match
+                levels = {level_indices[pos][t] for t in treatment_list if t in level_indices[pos]}
+                indexed_exclusion.append((pos, levels))
+
+            if all(levels for _, levels in indexed_exclusion):
+                indexed_exclusions.append(indexed_exclusion)
+        return indexed_exclusions
+
+    def __filtered_combinations(self) -> Tuple[List[List], Optional[np.ndarray]]:
+        """Returns the remaining treatment levels of every factor, and the indices of the remaining combinations
+        in the (row-major) grid of those levels, or None if the whole grid remains.
+        The design, if any, selects combinations from the grid of the levels that remain after single-factor exclusions."""
+        level_ranges = [list(range(len(factor.treatments))) for factor in self.__factors]
+        combo_exclusions = []
+        for exclusion in self.__indexed_exclusions():
+            if len(exclusion) == 1:
+                # Exclusions on a single factor simply drop levels from the grid
+                pos, levels = exclusion[0]
+                level_ranges[pos] = [idx for idx in level_ranges[pos] if idx not in levels]
+            else:
+                combo_exclusions.append(exclusion)
+
+        treatments = [[factor.treatments[idx] for idx in level_ranges[pos]] for pos, factor in enumerate(self.__factors)]
+        radices = [len(levels) for levels in level_ranges]
+        design = self.__design.generate(radices) if self.__design is not None and all(radices) else None
+        if not combo_exclusions:
+            return treatments, design
+
+        # Mark the exclusions with a mask over the grid (or the design), one vectorized pass per exclusion.
+        # The grid is processed in chunks, so memory use is bounded by the remaining combinations.
+        strides = [math.prod(radices[pos + 1:]) for pos in range(len(radices))]
+        grid_size = math.prod(radices) if design is None else len(design)
+        exclusion_levels = [[(pos, [i for i, idx in enumerate(level_ranges[pos]) if idx in levels]) for pos, levels in exclusion]
+                            for exclusion in combo_exclusions]
+
+        remaining = []
+        for chunk_start in range(0, grid_size, self.__GRID_CHUNK_SIZE):
+            chunk_end = min(grid_size, chunk_start + self.__GRID_CHUNK_SIZE)
+            grid = np.arange(chunk_start, chunk_end, dtype=np.int64) if design is None else design[chunk_start:chunk_end]
+            excluded = np.zeros(len(grid), dtype=bool)
+            for exclusion in exclusion_levels:
+                matches = np.ones(len(grid), dtype=bool)
+                for pos, grid_levels in exclusion:
+                    matches &= np.isin((grid // strides[pos]) % radices[pos], grid_levels)
+                excluded |= matches
+            remaining.append(grid[~excluded])
+
+        return treatments, np.concatenate(remaining) if remaining else np.zeros(0, dtype=np.int64)
+
+    def generate_run_table(self) -> RunTable:
+        """Generate the run table lazily. Rows are only materialized when accessed."""
+        treatments, combinations = self.__filtered_combinations()
+
+        shuffle_seed = None
         if self.__shuffle:
-            random.shuffle(experiment_run_table)
-        return experiment_run_table
+            shuffle_seed = self.__shuffle_seed if self.__shuffle_seed is not None else random.randrange(2 ** 32)
+
+        run_table = RunTable(
+            factor_names=[factor.factor_name for factor in self.__factors],
+            treatments=treatments,
+            data_columns=self.__data_columns,
+            repetitions=self.__repetitions,
+            combinations=combinations,
+            shuffle_seed=shuffle_seed
+        )
+        if self.__ordering is not None and len(run_table) > 0:
+            run_table.reorder_rows(self.__ordering.order(self.__factors, run_table.treatment_level_indices(), self.__repetitions))
+        return run_table
 
+    def generate_experiment_run_table(self) -> List[Dict]:
+        return list(self.generate_run_table())
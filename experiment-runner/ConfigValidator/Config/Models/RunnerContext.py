@@ -1,9 +1,11 @@
 from pathlib import Path
+from typing import Any, Dict, Optional
 
 
 class RunnerContext:
 
-    def __init__(self, execute_run: dict, run_nr: int, run_dir: Path):
+    def __init__(self, execute_run: dict, run_nr: int, run_dir: Path, factor_setup: Optional[Dict[str, Any]] = None):
         self.execute_run = execute_run
         self.run_nr = run_nr
         self.run_dir = run_dir
+        self.factor_setup = factor_setup or {}  # factor name -> what setting up the treatment level of the run returned
@@ -0,0 +1,107 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+
+
+class SwitchCostOrdering:
+    """Order the runs to reduce the time spent switching the treatment levels of expensive factors between runs
+    (e.g. recompiling a target, changing a power limit or rebooting a VM), with restricted randomization.
+
+    `switch_costs_in_ms` gives the time it takes to change the treatment level of a factor, factors without a cost
+    are cheap to change. The runs are blocked on the expensive factors, the most expensive one outermost: all runs
+    with one treatment level of that factor are executed together, within them all runs with one level of the next
+    expensive factor, and so on. The order of the blocks, and of the runs within the innermost blocks, is random.
+    A block starts with the treatment level the previous run ended with when it can, which saves a switch.
+
+    With `block_repetitions`, every repetition is a block of its own (a randomized complete block design), so that
+    the treatment levels of the expensive factors are not confounded with time. Without it, all repetitions of a
+    treatment combination are executed in one block, which switches the least, but only the cheap factors are
+    randomized in time. The saving compared to a shuffled run table is logged when the run table is generated."""
+
+    def __init__(self,
+                 switch_costs_in_ms: Dict[FactorModel, float],
+                 block_repetitions: bool = True,
+                 seed: Optional[int] = None
+                 ):
+        if not switch_costs_in_ms:
+            raise BaseError("Switch cost ordering needs the switch cost of at least one factor!")
+        if any(cost < 0 for cost in switch_costs_in_ms.values()):
+            raise BaseError("Switch costs cannot be negative!")
+
+        self.switch_costs_in_ms = switch_costs_in_ms
+        self.block_repetitions = block_repetitions
+        self.seed = seed
+
+    def order(self, factors: List[FactorModel], levels: np.ndarray, repetitions: int) -> np.ndarray:
+        """The order of the rows of a run table, given the (combinations x factors) treatment level indices of its
+        combinations. Row `repetition * combinations + combination` is a repetition of a combination."""
+        unknown_factors = [factor.factor_name for factor in self.switch_costs_in_ms if factor not in factors]
+        if unknown_factors:
+            raise BaseError(f"Switch costs are given for unknown factors {', '.join(unknown_factors)}!")
+
+        costs = np.array([self.switch_costs_in_ms.get(factor, 0) for factor in factors], dtype=np.float64)
+        blocked = [pos for pos in np.argsort(-costs, kind='stable') if costs[pos] > 0]
+        nr_combinations = len(levels)
+        rng = np.random.default_rng(self.seed)
+
+        rows = np.arange(nr_combinations * repetitions, dtype=np.int64)
+        row_levels = np.tile(levels, (repetitions, 1))
+        blocks = np.split(rows, repetitions) if self.block_repetitions else [rows]
+
+        order = []
+        for block in blocks:
+            previous = row_levels[order[-1][-1]] if order else None
+            order.extend(self.__order_block(block, row_levels, blocked, previous, rng))
+        order = np.concatenate(order) if order else rows
+
+        cost = self.switch_cost(row_levels[order], costs)
+        shuffled_cost = self.expected_shuffled_switch_cost(row_levels, costs)
+        if shuffled_cost > 0:
+            output.console_log_OK(f"Switch cost ordering: switching treatment levels takes {cost / 1000:.1f}s, "
+                                  f"{shuffled_cost / 1000:.1f}s expected for a shuffled run table "
+                                  f"(saves {(shuffled_cost - cost) / 1000:.1f}s, {100 * (1 - cost / shuffled_cost):.0f}%)")
+        return order
+
+    def __order_block(self, rows: np.ndarray, row_levels: np.ndarray, blocked: List[int],
+                      previous: Optional[np.ndarray], rng: np.random.Generator) -> List[np.ndarray]:
+        """The rows in blocks of the treatment levels of the blocked factors, as consecutive arrays"""
+        if not blocked:
+            return [rng.permutation(rows)]
+
+        pos = blocked[0]
+        block_levels = row_levels[rows, pos]
+        level_order = rng.permutation(np.unique(block_levels))
+        if previous is not None and previous[pos] in level_order:
+            level_order = np.concatenate([[previous[pos]], level_order[level_order != previous[pos]]])
+
+        ordered = []
+        for level in level_order:
+            ordered.extend(self.__order_block(rows[block_levels == level], row_levels, blocked[1:], previous, rng))
+            previous = row_levels[ordered[-1][-1]]
+        return ordered
+
+    @staticmethod
+    def switch_cost(ordered_levels: np.ndarray, costs: np.ndarray) -> float:
+        """The total cost of the level switches between consecutive rows of (rows x factors) treatment level indices"""
+        switches = (ordered_levels[1:] != ordered_levels[:-1]).sum(axis=0)
+        return float(switches @ costs)
+
+    @staticmethod
+    def expected_shuffled_switch_cost(row_levels: np.ndarray, costs: np.ndarray) -> float:
+        """The expected total switch cost of a uniformly random order of the rows: two consecutive rows have the same
+        level of a factor with probability sum(n_l * (n_l - 1)) / (n * (n - 1)), where n_l rows have level l."""
+        nr_rows = len(row_levels)
+        if nr_rows < 2:
+            return 0.0
+
+        expected = 0.0
+        for pos, cost in enumerate(costs):
+            if cost > 0:
+                counts = np.unique(row_levels[:, pos], return_counts=True)[1].astype(np.float64)
+                same = (counts * (counts - 1)).sum() / (nr_rows * (nr_rows - 1))
+                expected += cost * (nr_rows - 1) * (1 - same)
+        return expected
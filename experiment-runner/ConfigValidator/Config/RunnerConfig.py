@@ -3,11 +3,16 @@ from EventManager.EventSubscriptionController import EventSubscriptionController
 from ConfigValidator.Config.Models.RunTableModel import RunTableModel
 from ConfigValidator.Config.Models.FactorModel import FactorModel
 from ConfigValidator.Config.Models.RunnerContext import RunnerContext
+from ConfigValidator.Config.Models.FactorLevelContext import FactorLevelContext
 from ConfigValidator.Config.Models.OperationType import OperationType
+from ConfigValidator.Config.Models.RunIsolationType import RunIsolationType
+from ConfigValidator.Config.Models.RunTableBackend import RunTableBackend
+from ConfigValidator.Config.Models.RetryPolicy import RetryPolicy
+from ConfigValidator.Config.Models.CooldownProbe import CooldownProbe
 from ExtendedTyping.Typing import SupportsStr
 from ProgressManager.Output.OutputProcedure import OutputProcedure as output
 
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 from pathlib import Path
 from os.path import dirname, realpath
 
@@ -28,25 +33,132 @@ class RunnerConfig:
     operation_type:             OperationType   = OperationType.AUTO
 
     """The time Experiment Runner will wait after a run completes.
-    This can be essential to accommodate for cooldown periods on some systems."""
+    This can be essential to accommodate for cooldown periods on some systems.
+    With `cooldown_probes`, this is the maximum time to wait."""
     time_between_runs_in_ms:    int             = 1000
 
+    """Where the run table is kept. `RunTableBackend.CSV` keeps it in run_table.csv, `RunTableBackend.SQLITE` keeps it
+    in run_table.db (typed columns, transactional row updates) and exports run_table.csv at every checkpoint.
+    This parameter is optional and defaults to `RunTableBackend.CSV`."""
+    run_table_backend:          RunTableBackend = RunTableBackend.CSV
+
+    """Only execute the runs whose `__run_id` or treatment levels (compared as str) are among the given values,
+    e.g. `{'__run_id': ['run_3_repetition_0']}` or `{'example_factor1': ['example_treatment2']}`. The other runs remain
+    in the run table as they are, e.g. to (re)do a subset of the runs when restarting an experiment.
+    This parameter is optional and defaults to no filter (all runs)."""
+    run_filter:                 Dict[str, List] = {}
+
+    """Finished runs are journaled, and folded into run_table.csv after this many runs (and at the end of the experiment).
+    This parameter is optional and defaults to 100."""
+    run_table_checkpoint_interval: int          = 100
+
+    """The number of runs Experiment Runner may execute at the same time. Only use this for experiments that are not
+    energy-sensitive, as concurrent runs influence each other's measurements.
+    This parameter is optional and defaults to 1 (one run at a time)."""
+    max_parallel_runs:          int             = 1
+
+    """The named resources (e.g. "cores 0-7", "gpu0") runs can claim through `resource_slots_for_run()`.
+    Runs claiming the same slot never execute at the same time, and a slot is only reused after `time_between_runs_in_ms`.
+    This parameter is optional and defaults to no slots."""
+    resource_slots:             List[str]       = []
+
+    """How runs are isolated from each other. `RunIsolationType.PROCESS` forks a fresh process for every run,
+    `RunIsolationType.WORKER` reuses long-lived worker processes (see `worker_max_runs` and `worker_max_memory_in_mb`).
+    This parameter is optional and defaults to `RunIsolationType.PROCESS`."""
+    run_isolation:              RunIsolationType = RunIsolationType.PROCESS
+
+    """With `RunIsolationType.WORKER`, a worker process is replaced after executing this many runs,
+    or once its resident memory exceeds `worker_max_memory_in_mb` (None for no limit).
+    These parameters are optional and default to 50 runs and no memory limit."""
+    worker_max_runs:            int             = 50
+    worker_max_memory_in_mb:    Optional[int]   = None
+
+    """Probes (e.g. `ThermalZoneProbe()`, `CpuUtilizationProbe()`, `CallbackProbe(...)`) that are polled every
+    `cooldown_poll_interval_in_ms` after a run. The wait ends as soon as every probe is back within its tolerance
+    of the baseline captured after `before_experiment()`, but takes at least `cooldown_min_in_ms`
+    and at most `time_between_runs_in_ms`. The time waited is recorded in the `__cooldown_ms` column of the run table.
+    Only available with `max_parallel_runs` = 1.
+    These parameters are optional and default to no probes (a fixed wait), 0ms and 500ms."""
+    cooldown_probes:            List[CooldownProbe] = []
+    cooldown_min_in_ms:         int             = 0
+    cooldown_poll_interval_in_ms: int           = 500
+
+    """Maximum time (in ms) a run may spend in a hook, e.g. `{RunnerEvents.INTERACT: 600000}`.
+    Applies to START_RUN, START_MEASUREMENT, INTERACT, STOP_MEASUREMENT, STOP_RUN and POPULATE_RUN_DATA.
+    A run exceeding a timeout is killed, together with all processes it started.
+    This parameter is optional and defaults to no timeouts."""
+    run_phase_timeouts_in_ms:   Dict[RunnerEvents, int] = {}
+
+    """Whether, when and how often runs that raised an exception or timed out are tried again,
+    e.g. `RetryPolicy(max_attempts=3, backoff_in_ms=5000, retry_on=(ConnectionError,))`.
+    Runs that still fail are marked as FAILED in the run table, and are tried again when the experiment is restarted.
+    This parameter is optional and defaults to `RetryPolicy()` (a single attempt)."""
+    run_retry_policy:           RetryPolicy     = RetryPolicy()
+
+    """Call `populate_run_data()` in up to `populate_run_data_workers` background processes, after the run ended,
+    so that parsing raw measurement data overlaps the time between runs and the next run.
+    `populate_run_data()` then only has the context of the run: read the raw data from `context.run_dir`,
+    as attributes set on the config in the other hooks of the run are not available.
+    A `run_phase_timeouts_in_ms` timeout of POPULATE_RUN_DATA still applies, a run exceeding it is marked as FAILED.
+    These parameters are optional and default to False (called at the end of the run) and 1 process."""
+    defer_populate_run_data:    bool            = False
+    populate_run_data_workers:  int             = 1
+
+    """Record how long every phase of a run takes, timestamped with time.monotonic_ns(): the duration of every hook
+    from start_run() to populate_run_data() is stored in the `__t_<phase>_ms` data columns (e.g. `__t_interact_ms`),
+    and the whole timeline of the run, including framework overhead such as forking the run's process,
+    starting and stopping EnergiBridge and storing the run data, in `timeline.json` in the run directory.
+    This parameter is optional and defaults to False."""
+    record_phase_timings:       bool            = False
+
+    """Export a trace of the whole experiment to `trace.json` (Chrome Trace Event format) after `after_experiment()`,
+    to be viewed in Perfetto (https://ui.perfetto.dev) or chrome://tracing. It shows the time spent in every hook,
+    the phases and framework overhead of every run, cooldowns, the start() and stop() of profiler plugins,
+    and writes to the run table. The events are collected in `trace.jsonl` while the experiment executes.
+    This parameter is optional and defaults to False."""
+    export_trace:               bool            = False
+
+    """Export the run table and the profiler logs in the run directories to Parquet files under
+    `<experiment_path>/parquet` after `after_experiment()`, for fast analysis (requires `pip install pyarrow`).
+    Logs are found by file name: the default output files of the profiler plugins (e.g. ps.csv, energibridge.csv),
+    and the files in `parquet_log_readers`, which maps a file name to a function reading it into a pandas DataFrame.
+    The export can also be run (again) with `python experiment-runner/ parquet-export <path_to_config.py>`.
+    These parameters are optional and default to False (no export) and no additional logs."""
+    export_parquet:             bool            = False
+    parquet_log_readers:        Dict[str, Callable[[Path], Any]] = {}
+
+    """Execute the experiment with several experiment-runner processes (nodes) at once, on one or more hosts that share
+    the experiment path (e.g. over NFS): start `python experiment-runner/ <path_to_config.py>` on every node.
+    Every node claims the runs it executes with a lease in the shared run table, renewed while the run executes.
+    A run is taken over by another node if its lease is not renewed within `distributed_lease_in_ms`
+    (e.g. the node crashed), so the clocks of the hosts must be synchronized. Every node writes the results it has
+    to run_table.csv at its checkpoints, the last node to finish writes the complete run table.
+    Requires `run_table_backend` = RunTableBackend.SQLITE, `max_parallel_runs` = 1 and `defer_populate_run_data` = False,
+    adaptive repetitions are not supported.
+    These parameters are optional and default to False (a single node) and 60000 (1 minute)."""
+    distributed_execution:      bool            = False
+    distributed_lease_in_ms:    int             = 60000
+
     # Dynamic configurations can be one-time satisfied here before the program takes the config as-is
     # e.g. Setting some variable based on some criteria
     def __init__(self):
         """Executes immediately after program start, on config load"""
 
         EventSubscriptionController.subscribe_to_multiple_events([
-            (RunnerEvents.BEFORE_EXPERIMENT, self.before_experiment),
-            (RunnerEvents.BEFORE_RUN       , self.before_run       ),
-            (RunnerEvents.START_RUN        , self.start_run        ),
-            (RunnerEvents.START_MEASUREMENT, self.start_measurement),
-            (RunnerEvents.INTERACT         , self.interact         ),
-            (RunnerEvents.STOP_MEASUREMENT , self.stop_measurement ),
-            (RunnerEvents.STOP_RUN         , self.stop_run         ),
-            (RunnerEvents.POPULATE_RUN_DATA, self.populate_run_data),
-            (RunnerEvents.AFTER_EXPERIMENT , self.after_experiment )
+            (RunnerEvents.BEFORE_EXPERIMENT    , self.before_experiment    ),
+            # (RunnerEvents.SETUP_FACTOR_LEVEL   , self.setup_factor_level   ),  # set up treatment levels only when they change
+            # (RunnerEvents.TEARDOWN_FACTOR_LEVEL, self.teardown_factor_level),
+            (RunnerEvents.BEFORE_RUN           , self.before_run           ),
+            (RunnerEvents.START_RUN            , self.start_run            ),
+            (RunnerEvents.START_MEASUREMENT    , self.start_measurement    ),
+            (RunnerEvents.INTERACT             , self.interact             ),
+            (RunnerEvents.STOP_MEASUREMENT     , self.stop_measurement     ),
+            (RunnerEvents.STOP_RUN             , self.stop_run             ),
+            (RunnerEvents.POPULATE_RUN_DATA    , self.populate_run_data    ),
+            (RunnerEvents.AFTER_EXPERIMENT     , self.after_experiment     )
         ])
+        # More callbacks can subscribe next to these hooks, see EventManager/Models/SubscriberMode.py, e.g.
+        # EventSubscriptionController.add_subscriber(RunnerEvents.START_MEASUREMENT, self.start_profiler, priority=-1, mode=SubscriberMode.THREAD)
         self.run_table_model = None  # Initialized later
 
         output.console_log("Custom config loaded")
@@ -62,16 +174,41 @@ class RunnerConfig:
                 {factor1: ['example_treatment1']},                   # all runs having treatment "example_treatment1" will be excluded
                 {factor1: ['example_treatment2'], factor2: [True]},  # all runs having the combination ("example_treatment2", True) will be excluded
             ],
-            data_columns=['avg_cpu', 'avg_mem']
+            data_columns=['avg_cpu', 'avg_mem'],
+            # design=LatinHypercubeDesign(samples=4),  # run a fraction of the combinations, see ConfigValidator/Config/Models/DesignModel.py
+            # adaptive_repetitions=AdaptiveRepetitions(['avg_cpu'], max_repetitions=10, max_relative_standard_error=0.02),  # repeat noisy combinations more often
+            # ordering=SwitchCostOrdering({factor1: 30000}),  # switch expensive factors as little as possible, see ConfigValidator/Config/Models/SwitchCostOrdering.py
         )
         return self.run_table_model
 
+    def resource_slots_for_run(self, run_variation: Dict) -> List[str]:
+        """Return the `resource_slots` the given run variation needs while it executes.
+        Only used when `max_parallel_runs` > 1. This method is optional, without it runs claim no slots."""
+        return []
+
     def before_experiment(self) -> None:
         """Perform any activity required before starting the experiment here
         Invoked only once during the lifetime of the program."""
 
         output.console_log("Config.before_experiment() called!")
 
+    def setup_factor_level(self, context: FactorLevelContext) -> Any:
+        """Perform any activity required to set up the treatment level `context.treatment` of factor
+        `context.factor_name` here, e.g. building the target. Only called before a run whose treatment level
+        of the factor differs from the previous run. The returned value (e.g. a build path) is passed to the runs
+        of the level as `context.factor_setup[factor_name]`, and as `context.setup` to later setups of the level,
+        so that they can reuse what was built. Only called when subscribed to SETUP_FACTOR_LEVEL in `__init__`."""
+
+        output.console_log(f"Config.setup_factor_level() called for {context.factor_name} = {context.treatment}!")
+        return context.setup
+
+    def teardown_factor_level(self, context: FactorLevelContext) -> None:
+        """Perform any activity required to tear down the treatment level of a factor here, before another level
+        of the factor is set up, or at the end of the experiment. `context.setup` holds what its setup returned.
+        Only called when subscribed to TEARDOWN_FACTOR_LEVEL in `__init__`."""
+
+        output.console_log(f"Config.teardown_factor_level() called for {context.factor_name} = {context.treatment}!")
+
     def before_run(self) -> None:
         """Perform any activity required before starting a run.
         No context is available here as the run is not yet active (BEFORE RUN)"""
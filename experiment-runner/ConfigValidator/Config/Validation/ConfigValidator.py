@@ -3,11 +3,17 @@ from tabulate import tabulate
 import os
 import subprocess
 import platform
+import importlib.util
 
 from ExperimentOrchestrator.Misc.DictConversion import class_to_dict
 from ExperimentOrchestrator.Misc.PathValidation import is_path_exists_or_creatable_portable
 from ConfigValidator.Config.RunnerConfig import RunnerConfig
 from ConfigValidator.Config.Models.OperationType import OperationType
+from ConfigValidator.Config.Models.RunIsolationType import RunIsolationType
+from ConfigValidator.Config.Models.RunTableBackend import RunTableBackend
+from ConfigValidator.Config.Models.RetryPolicy import RetryPolicy
+from ConfigValidator.Config.Models.CooldownProbe import CooldownProbe
+from ExperimentOrchestrator.Experiment.Run.RunWatchdog import RunPhase
 from ConfigValidator.CustomErrors.ConfigErrors import (ConfigInvalidError, ConfigAttributeInvalidError)
 
 class ConfigValidator:
@@ -85,6 +91,69 @@ class ConfigValidator:
             
             if not hasattr(config, "self_measure_logfile"):
                 config.self_measure_logfile = None
+
+        if not hasattr(config, "run_table_backend"):
+            config.run_table_backend = RunTableBackend.CSV
+
+        if not hasattr(config, "run_filter"):
+            config.run_filter = {}
+
+        if not hasattr(config, "run_table_checkpoint_interval"):
+            config.run_table_checkpoint_interval = 100
+
+        if not hasattr(config, "max_parallel_runs"):
+            config.max_parallel_runs = 1
+
+        if not hasattr(config, "resource_slots"):
+            config.resource_slots = []
+
+        if not hasattr(config, "run_isolation"):
+            config.run_isolation = RunIsolationType.PROCESS
+
+        if not hasattr(config, "worker_max_runs"):
+            config.worker_max_runs = 50
+
+        if not hasattr(config, "worker_max_memory_in_mb"):
+            config.worker_max_memory_in_mb = None
+
+        if not hasattr(config, "cooldown_probes"):
+            config.cooldown_probes = []
+
+        if not hasattr(config, "cooldown_min_in_ms"):
+            config.cooldown_min_in_ms = 0
+
+        if not hasattr(config, "cooldown_poll_interval_in_ms"):
+            config.cooldown_poll_interval_in_ms = 500
+
+        if not hasattr(config, "run_phase_timeouts_in_ms"):
+            config.run_phase_timeouts_in_ms = {}
+
+        if not hasattr(config, "run_retry_policy"):
+            config.run_retry_policy = RetryPolicy()
+
+        if not hasattr(config, "defer_populate_run_data"):
+            config.defer_populate_run_data = False
+
+        if not hasattr(config, "populate_run_data_workers"):
+            config.populate_run_data_workers = 1
+
+        if not hasattr(config, "record_phase_timings"):
+            config.record_phase_timings = False
+
+        if not hasattr(config, "export_trace"):
+            config.export_trace = False
+
+        if not hasattr(config, "export_parquet"):
+            config.export_parquet = False
+
+        if not hasattr(config, "parquet_log_readers"):
+            config.parquet_log_readers = {}
+
+        if not hasattr(config, "distributed_execution"):
+            config.distributed_execution = False
+
+        if not hasattr(config, "distributed_lease_in_ms"):
+            config.distributed_lease_in_ms = 60000
             
         # Convert class to dictionary with utility method
         ConfigValidator.config_values_or_exception_dict = class_to_dict(config)
@@ -98,6 +167,116 @@ class ConfigValidator:
                                 (lambda a, b: not isinstance(a, b))
                             )
 
+        # run_table_backend
+        ConfigValidator.__check_expression('run_table_backend', config.run_table_backend, RunTableBackend,
+                                (lambda a, b: not isinstance(a, b))
+                            )
+
+        # run_filter
+        ConfigValidator.__check_expression('run_filter', config.run_filter, "dict of __run_id or factor name -> list of values",
+                                (lambda a, b: not isinstance(a, dict) or
+                                              not all(isinstance(k, str) and isinstance(v, list) for k, v in a.items()))
+                            )
+
+        # run_table_checkpoint_interval
+        ConfigValidator.__check_expression('run_table_checkpoint_interval', config.run_table_checkpoint_interval, "int >= 1",
+                                (lambda a, b: not isinstance(a, int) or a < 1)
+                            )
+
+        # max_parallel_runs
+        ConfigValidator.__check_expression('max_parallel_runs', config.max_parallel_runs, "int >= 1",
+                                (lambda a, b: not isinstance(a, int) or a < 1)
+                            )
+        ConfigValidator.__check_expression('max_parallel_runs', config.max_parallel_runs, "1 with OperationType.SEMI",
+                                (lambda a, b: config.operation_type is OperationType.SEMI and a != 1)
+                            )
+
+        # resource_slots
+        ConfigValidator.__check_expression('resource_slots', config.resource_slots, "list of unique slot names",
+                                (lambda a, b: not isinstance(a, list) or len(set(a)) != len(a))
+                            )
+
+        # run_isolation
+        ConfigValidator.__check_expression('run_isolation', config.run_isolation, RunIsolationType,
+                                (lambda a, b: not isinstance(a, b))
+                            )
+        if config.run_isolation is RunIsolationType.WORKER:
+            ConfigValidator.__check_expression('worker_max_runs', config.worker_max_runs, "int >= 1",
+                                    (lambda a, b: not isinstance(a, int) or a < 1)
+                                )
+            ConfigValidator.__check_expression('worker_max_memory_in_mb', config.worker_max_memory_in_mb, "None or int >= 1",
+                                    (lambda a, b: a is not None and (not isinstance(a, int) or a < 1))
+                                )
+
+        # cooldown_probes
+        ConfigValidator.__check_expression('cooldown_probes', config.cooldown_probes, "list of CooldownProbe",
+                                (lambda a, b: not isinstance(a, list) or not all(isinstance(p, CooldownProbe) for p in a))
+                            )
+        if config.cooldown_probes:
+            ConfigValidator.__check_expression('cooldown_probes', config.cooldown_probes, "max_parallel_runs == 1",
+                                    (lambda a, b: config.max_parallel_runs != 1)
+                                )
+            ConfigValidator.__check_expression('cooldown_min_in_ms', config.cooldown_min_in_ms, "0 <= int <= time_between_runs_in_ms",
+                                    (lambda a, b: not isinstance(a, int) or not 0 <= a <= config.time_between_runs_in_ms)
+                                )
+            ConfigValidator.__check_expression('cooldown_poll_interval_in_ms', config.cooldown_poll_interval_in_ms, "int >= 1",
+                                    (lambda a, b: not isinstance(a, int) or a < 1)
+                                )
+
+        # run_phase_timeouts_in_ms
+        ConfigValidator.__check_expression('run_phase_timeouts_in_ms', config.run_phase_timeouts_in_ms,
+                                "dict of run phase (RunnerEvents) -> int >= 1",
+                                (lambda a, b: not isinstance(a, dict) or
+                                              not all(k in RunPhase.RUN_PHASES and isinstance(v, int) and v >= 1 for k, v in a.items()))
+                            )
+
+        # run_retry_policy
+        ConfigValidator.__check_expression('run_retry_policy', config.run_retry_policy, "RetryPolicy with max_attempts >= 1",
+                                (lambda a, b: not isinstance(a, RetryPolicy) or not isinstance(a.max_attempts, int) or a.max_attempts < 1)
+                            )
+
+        # defer_populate_run_data
+        ConfigValidator.__check_expression('defer_populate_run_data', config.defer_populate_run_data, bool,
+                                (lambda a, b: not isinstance(a, b))
+                            )
+        ConfigValidator.__check_expression('populate_run_data_workers', config.populate_run_data_workers, "int >= 1",
+                                (lambda a, b: not isinstance(a, int) or a < 1)
+                            )
+
+        # record_phase_timings
+        ConfigValidator.__check_expression('record_phase_timings', config.record_phase_timings, bool,
+                                (lambda a, b: not isinstance(a, b))
+                            )
+
+        # export_trace
+        ConfigValidator.__check_expression('export_trace', config.export_trace, bool,
+                                (lambda a, b: not isinstance(a, b))
+                            )
+
+        # export_parquet
+        ConfigValidator.__check_expression('export_parquet', config.export_parquet, "bool (True requires pyarrow)",
+                                (lambda a, b: not isinstance(a, bool) or (a and importlib.util.find_spec("pyarrow") is None))
+                            )
+        ConfigValidator.__check_expression('parquet_log_readers', config.parquet_log_readers,
+                                "dict of file name -> function reading it, or None",
+                                (lambda a, b: not isinstance(a, dict) or
+                                              not all(isinstance(k, str) and (v is None or callable(v)) for k, v in a.items()))
+                            )
+
+        # distributed_execution
+        ConfigValidator.__check_expression('distributed_execution', config.distributed_execution, bool,
+                                (lambda a, b: not isinstance(a, b))
+                            )
+        if config.distributed_execution:
+            ConfigValidator.__check_expression('distributed_execution', config.distributed_execution,
+                                "run_table_backend == RunTableBackend.SQLITE, max_parallel_runs == 1 and defer_populate_run_data == False",
+                                (lambda a, b: config.run_table_backend is not RunTableBackend.SQLITE
+                                              or config.max_parallel_runs != 1 or config.defer_populate_run_data)
+                            )
+        ConfigValidator.__check_expression('distributed_lease_in_ms', config.distributed_lease_in_ms, "int >= 1000",
+                                (lambda a, b: not isinstance(a, int) or a < 1000)
+                            )
+
         # Results output path
         ConfigValidator.__check_expression("results_output_path", 
                             config.results_output_path,
@@ -2,9 +2,9 @@ from ConfigValidator.CustomErrors.BaseError import BaseError
 from ExperimentOrchestrator.Misc.BashHeaders import BashHeaders
 
 class ExperimentOutputFileDoesNotExistError(BaseError):
-    def __init__(self):
+    def __init__(self, run_table_file: str = "run_table.csv"):
         super().__init__("The " + BashHeaders.UNDERLINE + "experiment_path" + BashHeaders.ENDC + BashHeaders.FAIL + 
                             " (experiment output folder) exists, but the " + 
-                            BashHeaders.UNDERLINE + "run_table.csv" + BashHeaders.ENDC + BashHeaders.FAIL +
+                            BashHeaders.UNDERLINE + run_table_file + BashHeaders.ENDC + BashHeaders.FAIL +
                             " does not exist.\n" +
-                            "Experiment-runner cannot restart!")
\ No newline at end of file
+                            "Experiment-runner cannot restart!")
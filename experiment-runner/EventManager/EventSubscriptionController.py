@@ -1,12 +1,30 @@
-from typing import Callable, List, Tuple
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from itertools import groupby
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from EventManager.Models.RunnerEvents import RunnerEvents
+from EventManager.Models.EventSubscriber import EventSubscriber
+from EventManager.Models.SubscriberMode import SubscriberMode
+from ProgressManager.Output.TraceRecorder import TraceRecorder
 
 class EventSubscriptionController:
-    __call_back_register: dict = dict()
+    __call_back_register: Dict[RunnerEvents, EventSubscriber] = dict()         # The hook of the config, per event
+    __subscriber_register: Dict[RunnerEvents, List[EventSubscriber]] = dict()  # Every subscriber, in subscription order
 
     @staticmethod
-    def subscribe_to_single_event(event: RunnerEvents, callback_method: Callable):
-            EventSubscriptionController.__call_back_register[event] = callback_method
+    def subscribe_to_single_event(event: RunnerEvents, callback_method: Optional[Callable]):
+        """Subscribe the hook of the config to the event, replacing the hook subscribed before (None only removes it)"""
+        subscribers = EventSubscriptionController.__subscriber_register.setdefault(event, [])
+        previous = EventSubscriptionController.__call_back_register.pop(event, None)
+        position = subscribers.index(previous) if previous is not None else len(subscribers)
+        if previous is not None:
+            subscribers.remove(previous)
+
+        if callback_method is not None:
+            subscriber = EventSubscriber(callback_method)
+            EventSubscriptionController.__call_back_register[event] = subscriber
+            subscribers.insert(position, subscriber)
 
     @staticmethod
     def subscribe_to_multiple_events(subscriptions: List[Tuple[RunnerEvents, Callable]]):
@@ -14,21 +32,96 @@ class EventSubscriptionController:
             event, callback = sub[0], sub[1]
             EventSubscriptionController.subscribe_to_single_event(event, callback)
 
+    @staticmethod
+    def add_subscriber(event: RunnerEvents, callback_method: Callable, priority: int = 0,
+                       mode: SubscriberMode = SubscriberMode.SYNC) -> EventSubscriber:
+        """Subscribe a callback (e.g. of a plugin) to the event, next to the hook of the config and the other subscribers.
+        Returns the subscriber, to unsubscribe it with `remove_subscriber()`."""
+        subscriber = EventSubscriber(callback_method, priority, mode)
+        EventSubscriptionController.__subscriber_register.setdefault(event, []).append(subscriber)
+        return subscriber
+
+    @staticmethod
+    def remove_subscriber(event: RunnerEvents, subscriber: EventSubscriber):
+        """Unsubscribe a subscriber from the event, which may also be the hook of the config"""
+        subscribers = EventSubscriptionController.__subscriber_register.get(event, [])
+        if subscriber in subscribers:
+            subscribers.remove(subscriber)
+        if EventSubscriptionController.__call_back_register.get(event) is subscriber:
+            del EventSubscriptionController.__call_back_register[event]
+
+    @staticmethod
+    def get_subscribers(event: RunnerEvents) -> List[EventSubscriber]:
+        """The subscribers of the event, in the order they are called"""
+        return sorted(EventSubscriptionController.__subscriber_register.get(event, []), key=lambda subscriber: subscriber.priority)
+
+    @staticmethod
+    def has_subscribers(event: RunnerEvents) -> bool:
+        return bool(EventSubscriptionController.__subscriber_register.get(event))
+
     @staticmethod
     def raise_event(event: RunnerEvents, runner_context=None):
-        try:
-            event_callback = EventSubscriptionController.__call_back_register[event]
-        except KeyError:
+        """Call the subscribers of the event. Returns the first result that is not None, or for POPULATE_RUN_DATA
+        the results merged into a single dict (later subscribers overriding the columns of earlier ones)."""
+        subscribers = EventSubscriptionController.get_subscribers(event)
+        if not subscribers:
             return None
 
-        if runner_context:
-            return event_callback(runner_context)
-        else:
-            return event_callback()
+        args = (runner_context,) if runner_context else ()
+        with TraceRecorder().span(event.name.lower(), 'hook'):
+            if len(subscribers) == 1 and subscribers[0].mode is SubscriberMode.SYNC:
+                return subscribers[0].callback(*args)
+
+            results = []
+            for _, group in groupby(subscribers, key=lambda subscriber: subscriber.priority):
+                results += EventSubscriptionController.__call_group(list(group), args)
+            return EventSubscriptionController.__merge_results(event, results)
 
     @staticmethod
     def get_event_callback(event: RunnerEvents):
         try:
-            return EventSubscriptionController.__call_back_register[event]
+            return EventSubscriptionController.__call_back_register[event].callback
         except KeyError:
             return None
+
+    @staticmethod
+    def __call_group(group: List[EventSubscriber], args: Tuple) -> List[Any]:
+        """Call subscribers of the same priority: THREAD and ASYNC subscribers at the same time as the SYNC ones,
+        which are called one after the other. Returns their results in subscription order."""
+        results = [None] * len(group)
+        threaded = [(i, subscriber) for i, subscriber in enumerate(group) if subscriber.mode is SubscriberMode.THREAD]
+        awaited = [(i, subscriber) for i, subscriber in enumerate(group) if subscriber.mode is SubscriberMode.ASYNC]
+        concurrent = len(threaded) + (1 if awaited else 0)
+
+        with ThreadPoolExecutor(max_workers=concurrent) if concurrent else nullcontext() as executor:
+            thread_futures = [(i, executor.submit(subscriber.callback, *args)) for i, subscriber in threaded]
+            # All coroutines share a single event loop, in a thread of its own
+            async_future = executor.submit(asyncio.run, EventSubscriptionController.__gather(
+                [subscriber.callback for _, subscriber in awaited], args)) if awaited else None
+
+            for i, subscriber in enumerate(group):
+                if subscriber.mode is SubscriberMode.SYNC:
+                    results[i] = subscriber.callback(*args)
+
+            # result() raises what the subscriber raised
+            for i, future in thread_futures:
+                results[i] = future.result()
+            if async_future is not None:
+                for (i, _), result in zip(awaited, async_future.result()):
+                    results[i] = result
+        return results
+
+    @staticmethod
+    async def __gather(callbacks: List[Callable], args: Tuple) -> List[Any]:
+        return list(await asyncio.gather(*(callback(*args) for callback in callbacks)))
+
+    @staticmethod
+    def __merge_results(event: RunnerEvents, results: List[Any]):
+        if event is RunnerEvents.POPULATE_RUN_DATA:
+            merged = None
+            for result in results:
+                if result is not None:
+                    merged = {**(merged or dict()), **result}
+            return merged
+
+        return next((result for result in results if result is not None), None)
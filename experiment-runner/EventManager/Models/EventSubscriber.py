@@ -0,0 +1,15 @@
+import inspect
+from typing import Callable
+
+from EventManager.Models.SubscriberMode import SubscriberMode
+
+
+class EventSubscriber:
+    """A callback subscribed to an event. Subscribers are called in ascending `priority`, those with the same
+    priority in the order they subscribed. The hooks the config subscribes (`subscribe_to_single_event()`)
+    have priority 0, so subscribers with a negative priority are called before them."""
+
+    def __init__(self, callback: Callable, priority: int = 0, mode: SubscriberMode = SubscriberMode.SYNC):
+        self.callback = callback
+        self.priority = priority
+        self.mode = SubscriberMode.ASYNC if inspect.iscoroutinefunction(callback) else mode
@@ -1,13 +1,15 @@
 from enum import Enum, auto
 
 class RunnerEvents(Enum):
-    BEFORE_EXPERIMENT = auto()
-    BEFORE_RUN        = auto()
-    START_RUN         = auto()
-    START_MEASUREMENT = auto()
-    INTERACT          = auto()
-    CONTINUE          = auto()
-    STOP_MEASUREMENT  = auto()
-    STOP_RUN          = auto()
-    POPULATE_RUN_DATA = auto()
-    AFTER_EXPERIMENT  = auto()
+    BEFORE_EXPERIMENT     = auto()
+    SETUP_FACTOR_LEVEL    = auto()
+    TEARDOWN_FACTOR_LEVEL = auto()
+    BEFORE_RUN            = auto()
+    START_RUN             = auto()
+    START_MEASUREMENT     = auto()
+    INTERACT              = auto()
+    CONTINUE              = auto()
+    STOP_MEASUREMENT      = auto()
+    STOP_RUN              = auto()
+    POPULATE_RUN_DATA     = auto()
+    AFTER_EXPERIMENT      = auto()
@@ -0,0 +1,14 @@
+from enum import Enum, auto
+
+class SubscriberMode(Enum):
+    """If set to SYNC, the subscriber is called in the thread raising the event, after the subscribers before it."""
+    SYNC = auto()
+
+    """If set to THREAD, the subscriber is called in a thread of its own, at the same time as the other
+    THREAD and ASYNC subscribers of the same priority (e.g. to start several profilers at once).
+    The event is only done once every subscriber has returned."""
+    THREAD = auto()
+
+    """If set to ASYNC, the subscriber is a coroutine function, awaited together with the other ASYNC subscribers
+    of the same priority. Coroutine functions are always subscribed as ASYNC."""
+    ASYNC = auto()
@@ -0,0 +1,62 @@
+import time
+from typing import List
+
+from ConfigValidator.Config.Models.CooldownProbe import CooldownProbe
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+
+
+###     =========================================================
+###     |                                                       |
+###     |                   CooldownController                  |
+###     |       - Capture a baseline of the cooldown probes     |
+###     |         before the first run                          |
+###     |       - Wait after a run until every probe is back    |
+###     |         within its tolerance of the baseline          |
+###     |                                                       |
+###     |       * Waits at least `min_wait_in_ms` and at most   |
+###     |         `max_wait_in_ms`, polling in between          |
+###     |                                                       |
+###     =========================================================
+class CooldownController:
+
+    def __init__(self, probes: List[CooldownProbe], min_wait_in_ms: int, max_wait_in_ms: int, poll_interval_in_ms: int):
+        self.probes = probes
+        self.min_wait_in_ms = min_wait_in_ms
+        self.max_wait_in_ms = max_wait_in_ms
+        self.poll_interval_in_ms = poll_interval_in_ms
+        self.baseline: List[float] = []
+
+    def __read(self) -> List[float]:
+        return [probe.read() for probe in self.probes]
+
+    def capture_baseline(self):
+        # Readings can be relative to the previous one (e.g. CPU utilization), so one polling interval is measured
+        self.__read()
+        time.sleep(self.poll_interval_in_ms / 1000)
+        self.baseline = self.__read()
+
+        output.console_log_bold("Cooldown baseline: " + ", ".join(
+            f"{probe.name}={reading:.2f}" for probe, reading in zip(self.probes, self.baseline)))
+
+    def cool_down(self) -> int:
+        """Wait until the system has cooled down, returns the time waited in ms"""
+        start = time.monotonic()
+        min_end = start + self.min_wait_in_ms / 1000
+        max_end = start + self.max_wait_in_ms / 1000
+
+        self.__read()
+        while True:
+            now = time.monotonic()
+            if now >= max_end:
+                output.console_log_WARNING(f"Cooldown did not reach the baseline within {self.max_wait_in_ms}ms")
+                break
+
+            time.sleep(min(self.poll_interval_in_ms / 1000, max_end - now))
+            readings = self.__read()
+            if time.monotonic() >= min_end and all(probe.is_cooled_down(reading, baseline)
+                                                   for probe, reading, baseline in zip(self.probes, readings, self.baseline)):
+                break
+
+        cooldown_ms = round((time.monotonic() - start) * 1000)
+        output.console_log_bold(f"Run fully ended, cooled down in {cooldown_ms}ms")
+        return cooldown_ms
@@ -1,14 +1,28 @@
 import time
 import multiprocessing
+import multiprocessing.connection
+from collections import defaultdict
+from contextlib import nullcontext
+from typing import Dict, Iterable, List, Optional
 
 from ConfigValidator.Config.Models.Metadata import Metadata
 from ConfigValidator.CustomErrors.BaseError import BaseError
 from ProgressManager.Output.JSONOutputManager import JSONOutputManager
 from ProgressManager.RunTable.Models.RunProgress import RunProgress
+from ProgressManager.RunTable.Models.RunTable import RunTable
 from ConfigValidator.Config.Models.OperationType import OperationType
 from EventManager.Models.RunnerEvents import RunnerEvents
-from ProgressManager.Output.CSVOutputManager import CSVOutputManager
-from ExperimentOrchestrator.Experiment.Run.RunController import RunController
+from ProgressManager.Output.RunTableOutputManager import RunTableOutputManager
+from ProgressManager.Output.ParquetOutputManager import ParquetOutputManager
+from ProgressManager.Output.TraceRecorder import TraceRecorder
+from ExperimentOrchestrator.Experiment.Run.RunExecutor import RunExecutor
+from ExperimentOrchestrator.Experiment.Run.RunWatchdog import RunFailure
+from ExperimentOrchestrator.Experiment.Run.DeferredRunData import DeferredRunData
+from ExperimentOrchestrator.Experiment.Run.RunTimeline import RunTimeline
+from ExperimentOrchestrator.Experiment.ResourceSlotPool import ResourceSlotPool
+from ExperimentOrchestrator.Experiment.RunCoordinator import RunCoordinator
+from ExperimentOrchestrator.Experiment.FactorSetupController import FactorSetupController
+from ExperimentOrchestrator.Experiment.Cooldown.CooldownController import CooldownController
 from ConfigValidator.Config.RunnerConfig import RunnerConfig
 from ProgressManager.Output.OutputProcedure import OutputProcedure as output
 from EventManager.EventSubscriptionController import EventSubscriptionController
@@ -21,6 +35,13 @@ from ConfigValidator.CustomErrors.ProgressErrors import AllRunsCompletedOnRestar
 ###     |       - Init and perform runs of correct type         |
 ###     |       - Perform experiment overhead                   |
 ###     |       - Perform run overhead (time_btwn_runs)         |
+###     |       - Set up factor levels when they change         |
+###     |       - Schedule parallel runs over resource slots    |
+###     |       - Schedule adaptive repetitions                 |
+###     |       - Kill hanging runs, retry failed runs          |
+###     |       - Share the runs with other nodes (distributed) |
+###     |       - Export results to Parquet                     |
+###     |       - Export a trace of the experiment              |
 ###     |       - Signal experiment end (ClientRunner)          |
 ###     |                                                       |
 ###     |       * Experiment config that should be used         |
@@ -34,7 +55,7 @@ class ExperimentController:
         self.config = config
         self.metadata = metadata
 
-        self.csv_data_manager = CSVOutputManager(self.config.experiment_path)
+        self.run_table_data_manager = RunTableOutputManager.create(self.config)
         self.json_data_manager = JSONOutputManager(self.config.experiment_path)
         run_tbl = self.config.create_run_table_model()
         
@@ -45,111 +66,364 @@ class ExperimentController:
 
             run_tbl._RunTableModel__data_columns.append("self-measure")
 
-        self.run_table = run_tbl.generate_experiment_run_table()
+        # Record the time actually waited after every run
+        self.cooldown = None
+        if self.config.cooldown_probes:
+            self.cooldown = CooldownController(self.config.cooldown_probes,
+                                               self.config.cooldown_min_in_ms,
+                                               self.config.time_between_runs_in_ms,
+                                               self.config.cooldown_poll_interval_in_ms)
+            run_tbl._RunTableModel__data_columns.append("__cooldown_ms")
+
+        # Record the duration of every phase of the runs
+        if self.config.record_phase_timings:
+            run_tbl._RunTableModel__data_columns.extend(RunTimeline.data_columns())
+
+        self.run_table = run_tbl.generate_run_table()
+
+        # Only execute the runs selected by their run id or treatment levels (compared as str())
+        self.run_filter = {column: set(map(str, values)) for column, values in self.config.run_filter.items()}
+        unknown_columns = [column for column in self.run_filter if column not in ['__run_id'] + [factor.factor_name for factor in run_tbl.get_factors()]]
+        if unknown_columns:
+            raise BaseError(f"The run_filter selects on {', '.join(unknown_columns)}, which are not factors of the run table")
         
+        # Several experiment-runner processes (nodes) can execute the runs of the experiment together
+        self.coordinator = None
+        if self.config.distributed_execution:
+            if self.config.run_table_model.get_adaptive_repetitions() is not None:
+                raise BaseError("Adaptive repetitions are not supported with distributed execution")
+            self.coordinator = RunCoordinator(self.config.experiment_path, self.config.distributed_lease_in_ms)
+
         # Create experiment output folder, and in case that it exists, check if we can resume
         self.restarted = False
+        with self.coordinator.setup() if self.coordinator is not None else nullcontext():
+            if self.__experiment_path_exists():
+                output.console_log_WARNING(f"Reusing already existing experiment path: {self.config.experiment_path}")
+                self.__resume()
+            else:
+                self.run_table_data_manager.write_run_table(self.run_table)
+                self.json_data_manager.write_metadata(self.metadata)
+
+        output.console_log_WARNING("Experiment run table created...")
+
+        # Record a trace of the experiment, also in the processes forked from here on
+        if self.config.export_trace:
+            TraceRecorder().enable(self.config.experiment_path)
+
+    def __experiment_path_exists(self) -> bool:
+        if self.coordinator is not None:
+            # The experiment path is shared by the nodes, the first one creates the run table
+            return self.coordinator.run_table_exists()
+
         try:
             self.config.experiment_path.mkdir(parents=True, exist_ok=False)
+            return False
         except FileExistsError:
-            output.console_log_WARNING(f"Reusing already existing experiment path: {self.config.experiment_path}")
-            existing_run_table = self.csv_data_manager.read_run_table()
-
-            # First sanity check. If there is no "TODO" in the __done column, simply abort.
-            todo_run_found = any([current_run['__done'] != RunProgress.DONE for current_run in existing_run_table])
-            if not todo_run_found:
-                raise BaseError("The experiment was restarted, but all runs have already been completed.")
-
-            # The experiment has been restarted as there is >=1 "TODO" variations in the CSV file
-            # In order to resume a previous experiment, the following conditions must hold true:
-            #   1. The column names of the stored run_table and the generated one must match
-            #   2. The stored md5sum for the code must match the current one
-
-            # check column names
-            if not set(existing_run_table[0].keys()) == set(self.run_table[0].keys()):
-                raise BaseError("The generated run table from the config file, and the found run table in the CSV in "
-                                "the experiment output path, do not define the same columns!"
-                                )
-            # check md5sum
-            existing_metadata = self.json_data_manager.read_metadata()
-            if existing_metadata.md5sum != self.metadata.md5sum:  # check md5sum
-                cont = output.query_yes_no("md5sum mismatch! This can occur if the configuration code "
-                                           "has changed since the last run. Continue anyway?", default=None)
-                if not cont:
-                    raise BaseError("Aborting due to md5sum mismatch.")
-
-                output.console_log_WARNING(f"Updating md5sum from {existing_metadata.md5sum.hex()} to {self.metadata.md5sum.hex()}")
-                self.json_data_manager.write_metadata(self.metadata)
+            return True
+
+    def __resume(self):
+        existing_run_table = self.run_table_data_manager.read_run_table()
+
+        # In order to resume a previous experiment, the following conditions must hold true:
+        #   1. The stored run_table and the generated one must define the same columns and runs,
+        #      with the same treatment levels
+        #   2. The stored md5sum for the code must match the current one
+        # The generated run table takes over the order and the progress of the stored one, the data of finished
+        # runs is already stored in the run table and the runs still to do start out with empty data columns.
+        resume_report = self.run_table.reconcile(existing_run_table)
+        if resume_report.has_drift:
+            raise BaseError("The generated run table from the config file, and the run table stored in "
+                            "the experiment output path, differ:\n" + resume_report.drift_summary())
 
-            self.restarted = True
-            assert(len(existing_run_table) == len(self.run_table))
-
-            # Re-order the generated run table to match the already existing one
-            tmp_run_table = []
-            for existing_var in existing_run_table:
-                for generated_var in self.run_table:
-                    if existing_var['__run_id'] == generated_var['__run_id']:
-                        tmp_run_table.append(generated_var)
-                        break
-            self.run_table = tmp_run_table
-            for existing_var, generated_var in zip(existing_run_table, self.run_table):
-                assert(existing_var['__run_id'] == generated_var['__run_id'])
-
-            # Fill in the run_table.
-            # Note that the stored run_table has only a str() representation of the factor treatment levels.
-            # The generated one can have arbitrary python objects.
-            for existing_var, generated_var in zip(existing_run_table, self.run_table):
-                assert (existing_var['__run_id'] == generated_var['__run_id'])
-
-                for k in map(lambda factor: factor.factor_name,
-                             self.config.run_table_model.get_factors()):  # treatment levels remain the same
-                    assert (str(generated_var[k]) == str(existing_var[k]))
-
-                for k in set(self.config.run_table_model.get_data_columns()).union(
-                        ['__done']):  # update data columns and __done column
-                    generated_var[k] = existing_var[k]
-
-            output.console_log_WARNING(">> WARNING << -- Experiment is restarted!")
-        if not self.restarted:
-            self.csv_data_manager.write_run_table(self.run_table)
+        # If there is no "TODO" (or FAILED) run left, simply abort.
+        if resume_report.count(RunProgress.DONE) == len(self.run_table) \
+                and self.config.run_table_model.get_adaptive_repetitions() is None:
+            raise BaseError("The experiment was restarted, but all runs have already been completed.")
+
+        # check md5sum
+        existing_metadata = self.json_data_manager.read_metadata()
+        if existing_metadata.md5sum != self.metadata.md5sum:  # check md5sum
+            cont = output.query_yes_no("md5sum mismatch! This can occur if the configuration code "
+                                       "has changed since the last run. Continue anyway?", default=None)
+            if not cont:
+                raise BaseError("Aborting due to md5sum mismatch.")
+
+            output.console_log_WARNING(f"Updating md5sum from {existing_metadata.md5sum.hex()} to {self.metadata.md5sum.hex()}")
             self.json_data_manager.write_metadata(self.metadata)
 
-        output.console_log_WARNING("Experiment run table created...")
+        self.restarted = True
+        output.console_log_WARNING(f"Resuming the stored run table: {resume_report.summary()}")
+        output.console_log_WARNING(">> WARNING << -- Experiment is restarted!")
 
     def do_experiment(self):
         output.console_log_OK("Experiment setup completed...")
+        experiment_start_ns = time.monotonic_ns()
 
         # -- Before experiment
         # TODO: From a user perspective, it would be nice to know if this is a restarted experiment or not (in case something failed)
         output.console_log_WARNING("Calling before_experiment config hook")
         EventSubscriptionController.raise_event(RunnerEvents.BEFORE_EXPERIMENT)
 
+        if self.cooldown is not None:
+            self.cooldown.capture_baseline()
+
         # -- Experiment
-        for current_run in self.run_table:
-            if current_run['__done'] == RunProgress.DONE:
-                continue
+        self.runs_since_checkpoint = 0
+        self.run_executor = RunExecutor.create(self.config)
+        self.deferred_run_data = None
+        if self.config.defer_populate_run_data:
+            self.deferred_run_data = DeferredRunData(self.run_table_data_manager, self.config.populate_run_data_workers,
+                                                     self.config.run_phase_timeouts_in_ms.get(RunnerEvents.POPULATE_RUN_DATA))
+        self.factor_setup = None
+        if FactorSetupController.is_subscribed():
+            self.factor_setup = FactorSetupController([factor.factor_name for factor in self.config.run_table_model.get_factors()],
+                                                      exclusive=self.config.max_parallel_runs == 1)
+        try:
+            runs = []
+            self.selected_combinations = set()
+            for current_run in self.run_table:
+                if self.__is_selected(current_run):
+                    self.selected_combinations.add(RunTable.parse_run_id(current_run['__run_id'])[0])
+                    if current_run['__done'] != RunProgress.DONE:
+                        runs.append(current_run)
+            if self.run_filter:
+                output.console_log_WARNING(f"The run_filter selects the runs of {len(self.selected_combinations)} "
+                                           f"treatment combinations, {len(runs)} runs are still to be done")
+            if self.coordinator is not None:
+                # Only execute the runs no other node executes (or executed) already
+                output.console_log_WARNING(f"Distributed execution as node {self.coordinator.node_id}")
+                runs = self.coordinator.claim_runs(runs)
 
-            output.console_log_WARNING("Calling before_run config hook")
-            EventSubscriptionController.raise_event(RunnerEvents.BEFORE_RUN)
+            while True:
+                if self.config.max_parallel_runs > 1:
+                    self.__do_runs_parallel(runs)
+                else:
+                    self.__do_runs_sequential(runs)
+
+                if self.deferred_run_data is not None:
+                    self.deferred_run_data.wait()
 
-            run_controller = RunController(current_run, self.config, (self.run_table.index(current_run) + 1), len(self.run_table))
-            perform_run = multiprocessing.Process(
-                target=run_controller.do_run,
-                args=[]
-            )
-            perform_run.start()
-            perform_run.join()
+                # Adaptive repetitions: keep on repeating the combinations that have not been measured precisely enough
+                runs = self.__schedule_adaptive_repetitions()
+                if not runs:
+                    break
+        finally:
+            self.run_executor.shutdown()
+            if self.deferred_run_data is not None:
+                self.deferred_run_data.shutdown()
+            if self.factor_setup is not None:
+                self.factor_setup.teardown_all()
+
+        self.run_table_data_manager.checkpoint()
+        output.console_log_OK("Experiment completed...")
+
+        # -- After experiment
+        output.console_log_WARNING("Calling after_experiment config hook")
+        EventSubscriptionController.raise_event(RunnerEvents.AFTER_EXPERIMENT)
+
+        if self.config.export_parquet:
+            factor_names = [factor.factor_name for factor in self.config.run_table_model.get_factors()]
+            ParquetOutputManager(self.config.experiment_path, factor_names, self.config.parquet_log_readers) \
+                .export(self.run_table_data_manager.read_run_table())
+
+        if self.config.export_trace:
+            TraceRecorder().record(self.config.name, 'experiment', experiment_start_ns, time.monotonic_ns())
+            TraceRecorder().export(self.config.experiment_path)
+
+    def __do_runs_sequential(self, runs: Iterable[Dict]):
+        for current_run in runs:
+            attempt = 1
+            while True:
+                perform_run = self.__start_run(current_run)
+                if perform_run is None:
+                    break
+                while not self.__wait([perform_run]):
+                    pass
+                retry_in_ms = self.__run_finished(current_run, self.run_executor.finish(perform_run), attempt)
+                if retry_in_ms is None:
+                    break
+
+                self.__sleep(retry_in_ms / 1000)
+                attempt += 1
+
+            if perform_run is None:
+                continue
 
             time_btwn_runs = self.config.time_between_runs_in_ms
-            if time_btwn_runs > 0:
+            if self.cooldown is not None:
+                with TraceRecorder().span('cooldown', 'experiment'):
+                    cooldown_ms = self.cooldown.cool_down()
+                self.run_table_data_manager.update_row_data({'__run_id': current_run['__run_id'], '__cooldown_ms': cooldown_ms})
+            elif time_btwn_runs > 0:
                 output.console_log_bold(f"Run fully ended, waiting for: {time_btwn_runs}ms == {time_btwn_runs / 1000}s")
-                time.sleep(time_btwn_runs / 1000)
+                with TraceRecorder().span('time_between_runs', 'experiment'):
+                    time.sleep(time_btwn_runs / 1000)
 
             if self.config.operation_type is OperationType.SEMI:
                 EventSubscriptionController.raise_event(RunnerEvents.CONTINUE)
 
-        output.console_log_OK("Experiment completed...")
+    def __do_runs_parallel(self, runs: List[Dict]):
+        # Runs holding disjoint resource slots execute concurrently, runs that need the same slot are serialized.
+        # Instead of waiting between runs, a released slot is only reused once time_between_runs_in_ms has passed.
+        slot_pool = ResourceSlotPool(self.config.resource_slots, self.config.time_between_runs_in_ms)
+        pending = []  # (run, slots, attempt, time.monotonic() before which the run may not start)
+        for current_run in runs:
+            slots = self.__resource_slots_for_run(current_run)
+            slot_pool.validate(slots)
+            pending.append((current_run, slots, 1, 0))
 
-        # -- After experiment
-        output.console_log_WARNING("Calling after_experiment config hook")
-        EventSubscriptionController.raise_event(RunnerEvents.AFTER_EXPERIMENT)
+        output.console_log_WARNING(f"Executing up to {self.config.max_parallel_runs} runs in parallel")
+        active = dict()  # run executor waitable -> (run, slots, attempt)
+        while pending or active:
+            # Start runs in run table order, skipping over the ones whose slots are still taken or that back off
+            idx = 0
+            while idx < len(pending) and len(active) < self.config.max_parallel_runs:
+                current_run, slots, attempt, not_before = pending[idx]
+                if not_before > time.monotonic() or not slot_pool.is_available(slots):
+                    idx += 1
+                    continue
+
+                slot_pool.acquire(slots)
+                perform_run = self.__start_run(current_run)
+                del pending[idx]
+                if perform_run is None:
+                    slot_pool.release(slots)
+                    continue
+                active[perform_run] = (current_run, slots, attempt)
+
+            # Time until a waiting run may be startable again, as a slot comes out of its cooldown or a retry backs off
+            now = time.monotonic()
+            backoff = min((not_before - now for *_, not_before in pending if not_before > now), default=0)
+            wake_up = min([t for t in [slot_pool.seconds_until_release(), backoff] if t > 0], default=0)
+
+            if not active:
+                time.sleep(wake_up)
+                continue
+
+            timeout = wake_up if pending and len(active) < self.config.max_parallel_runs else None
+            for perform_run in self.__wait(list(active.keys()), timeout or None):
+                current_run, slots, attempt = active.pop(perform_run)
+                failure = self.run_executor.finish(perform_run)
+                slot_pool.release(slots)
+
+                retry_in_ms = self.__run_finished(current_run, failure, attempt)
+                if retry_in_ms is not None:
+                    pending.insert(0, (current_run, slots, attempt + 1, time.monotonic() + retry_in_ms / 1000))
+
+    def __wait(self, waitables: List, timeout: Optional[float] = None) -> List:
+        """Wait for runs to end (see multiprocessing.connection.wait), meanwhile killing the runs that exceed
+        the timeout of the phase they are in."""
+        if self.config.run_phase_timeouts_in_ms:
+            # Runs can enter a phase with a timeout at any moment, so look at them at least every second
+            deadline = self.run_executor.seconds_until_next_deadline()
+            poll = min(1.0, deadline) if deadline is not None else 1.0
+            timeout = poll if timeout is None else min(timeout, poll)
+        if self.coordinator is not None:
+            # Renew the leases of the executing runs, before other nodes take them over
+            interval = self.coordinator.heartbeat_interval_in_s
+            timeout = interval if timeout is None else min(timeout, interval)
+
+        ready = multiprocessing.connection.wait(waitables, timeout=timeout)
+        self.run_executor.kill_expired_runs()
+        if self.coordinator is not None:
+            self.coordinator.heartbeat()
+        return ready
+
+    def __sleep(self, seconds: float):
+        """time.sleep(), meanwhile renewing the leases of the runs this node executes"""
+        while self.coordinator is not None and seconds > self.coordinator.heartbeat_interval_in_s:
+            time.sleep(self.coordinator.heartbeat_interval_in_s)
+            seconds -= self.coordinator.heartbeat_interval_in_s
+            self.coordinator.heartbeat()
+        time.sleep(seconds)
+
+    def __start_run(self, current_run):
+        """Starts the run, or returns None if the lease on it was lost before it started (another node executes it)"""
+        # Setting up factor levels and the before_run hook can take longer than the lease, keep on renewing it meanwhile
+        with self.coordinator.keep_alive() if self.coordinator is not None else nullcontext():
+            factor_setup = self.factor_setup.setup(current_run) if self.factor_setup is not None else None
+
+            output.console_log_WARNING("Calling before_run config hook")
+            EventSubscriptionController.raise_event(RunnerEvents.BEFORE_RUN)
+
+        if self.coordinator is not None:
+            self.coordinator.heartbeat(force=True)
+            if not self.coordinator.holds(current_run['__run_id']):
+                output.console_log_FAIL(f"Skipping run {current_run['__run_id']}, its lease was taken over by another node")
+                return None
+
+        return self.run_executor.start(current_run, (self.run_table.index(current_run) + 1), len(self.run_table), factor_setup)
+
+    def __run_finished(self, current_run: Dict, failure: Optional[RunFailure], attempt: int) -> Optional[int]:
+        """Returns the time (in ms) after which a failed run should be tried again, or None if it should not."""
+        retry_in_ms = None
+        if failure is not None:
+            retry_policy = self.config.run_retry_policy
+            if failure.retryable and attempt < retry_policy.max_attempts:
+                retry_in_ms = retry_policy.delay_in_ms(attempt)
+                output.console_log_WARNING(f"Retrying run {current_run['__run_id']} in {retry_in_ms}ms "
+                                           f"(attempt {attempt + 1} of {retry_policy.max_attempts})")
+            else:
+                output.console_log_FAIL(f"Run {current_run['__run_id']} failed after {attempt} attempt(s)")
+                self.run_table_data_manager.update_row_data({'__run_id': current_run['__run_id'], '__done': RunProgress.FAILED})
+        elif self.deferred_run_data is not None:
+            self.deferred_run_data.submit(current_run, self.run_table.index(current_run) + 1,
+                                          self.config.experiment_path / current_run['__run_id'],
+                                          self.factor_setup.setup_of(current_run) if self.factor_setup is not None else None)
+
+        if self.deferred_run_data is not None:
+            self.deferred_run_data.collect()
+
+        # Other nodes only take over a run that is not done after it is released (and failed), or its lease expired
+        if self.coordinator is not None and retry_in_ms is None:
+            self.coordinator.release(current_run['__run_id'])
+
+        # Checkpoint the stored run table every so often (the CSV backend folds its journal into run_table.csv)
+        self.runs_since_checkpoint += 1
+        if self.runs_since_checkpoint >= self.config.run_table_checkpoint_interval:
+            self.run_table_data_manager.checkpoint()
+            self.runs_since_checkpoint = 0
+
+        return retry_in_ms
+
+    def __is_selected(self, current_run: Dict) -> bool:
+        return all(str(current_run[column]) in values for column, values in self.run_filter.items())
+
+    def __resource_slots_for_run(self, current_run) -> List[str]:
+        resource_slots_for_run = getattr(self.config, 'resource_slots_for_run', None)
+        if resource_slots_for_run is None:
+            return []
+
+        return list(resource_slots_for_run(current_run) or [])
+
+    def __schedule_adaptive_repetitions(self) -> List[Dict]:
+        """Append another repetition of every treatment combination whose measurements do not meet the targets of the
+        adaptive repetitions yet, both to the run table and to the stored run table. Returns the appended runs."""
+        adaptive_repetitions = self.config.run_table_model.get_adaptive_repetitions()
+        if adaptive_repetitions is None:
+            return []
+
+        # The measurements are only stored by the runs themselves
+        samples = defaultdict(lambda: defaultdict(list))
+        for stored_run in self.run_table_data_manager.read_run_table():
+            if stored_run['__done'] != RunProgress.DONE:
+                continue
+
+            combination, _ = RunTable.parse_run_id(stored_run['__run_id'])
+            for data_column in adaptive_repetitions.data_columns:
+                try:
+                    samples[combination][data_column].append(float(stored_run[data_column]))
+                except (TypeError, ValueError):
+                    pass  # Not filled in by populate_run_data
+
+        combinations = [combination for combination in range(self.run_table.nr_combinations)
+                        if combination in self.selected_combinations
+                        and self.run_table.repetitions_of(combination) < adaptive_repetitions.max_repetitions
+                        and not adaptive_repetitions.is_satisfied(samples[combination])]
+        if not combinations:
+            return []
+
+        new_runs = self.run_table.append_repetitions(combinations)
+        self.run_table_data_manager.append_run_table(new_runs)
+        output.console_log_WARNING(f"Adaptive repetitions: {len(new_runs)} treatment combinations need another repetition")
+        return new_runs
@@ -0,0 +1,75 @@
+from typing import Any, Dict, List, Tuple
+
+from ConfigValidator.Config.Models.FactorLevelContext import FactorLevelContext
+from EventManager.Models.RunnerEvents import RunnerEvents
+from EventManager.EventSubscriptionController import EventSubscriptionController
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+
+
+###     =========================================================
+###     |                                                       |
+###     |                 FactorSetupController                 |
+###     |       - Set up the treatment level of a factor        |
+###     |         (SETUP_FACTOR_LEVEL) only when it differs     |
+###     |         from the level of the previous run, and       |
+###     |         tear the previous one down                    |
+###     |         (TEARDOWN_FACTOR_LEVEL)                       |
+###     |       - Memoize what the setup of every treatment     |
+###     |         level returned, for later setups of it        |
+###     |                                                       |
+###     |       * With runs executing in parallel, runs of      |
+###     |         different levels overlap, so levels are only  |
+###     |         torn down at the end of the experiment        |
+###     |                                                       |
+###     =========================================================
+class FactorSetupController:
+
+    def __init__(self, factor_names: List[str], exclusive: bool = True):
+        self.factor_names = factor_names
+        self.exclusive = exclusive
+
+        self.__cache: Dict[Tuple[str, str], Any] = dict()       # (factor name, str(level)) -> setup result
+        self.__active: Dict[str, Dict[str, Any]] = {factor_name: dict() for factor_name in factor_names}  # str(level) -> level
+
+    @staticmethod
+    def is_subscribed() -> bool:
+        return EventSubscriptionController.has_subscribers(RunnerEvents.SETUP_FACTOR_LEVEL) or \
+               EventSubscriptionController.has_subscribers(RunnerEvents.TEARDOWN_FACTOR_LEVEL)
+
+    def setup(self, run: Dict) -> Dict[str, Any]:
+        """Set up the treatment levels of the given run that are not set up yet.
+        Returns what their setup returned, for every factor (see `RunnerContext.factor_setup`)."""
+        for factor_name in self.factor_names:
+            level, key = run[factor_name], str(run[factor_name])
+            active = self.__active[factor_name]
+            if key in active:
+                continue
+
+            if self.exclusive:
+                for active_key, active_level in list(active.items()):
+                    self.__teardown(factor_name, active_key, active_level)
+
+            output.console_log_WARNING(f"Setting up {factor_name} = {key}")
+            result = EventSubscriptionController.raise_event(RunnerEvents.SETUP_FACTOR_LEVEL,
+                                                             FactorLevelContext(factor_name, level, self.__cache.get((factor_name, key))))
+            if result is not None:
+                self.__cache[(factor_name, key)] = result
+            active[key] = level
+
+        return self.setup_of(run)
+
+    def setup_of(self, run: Dict) -> Dict[str, Any]:
+        """What the setup of the treatment levels of the given run returned, for every factor"""
+        return {factor_name: self.__cache.get((factor_name, str(run[factor_name]))) for factor_name in self.factor_names}
+
+    def teardown_all(self):
+        """Tear down every treatment level that is set up, at the end of the experiment"""
+        for factor_name, active in self.__active.items():
+            for key, level in list(active.items()):
+                self.__teardown(factor_name, key, level)
+
+    def __teardown(self, factor_name: str, key: str, level):
+        output.console_log_WARNING(f"Tearing down {factor_name} = {key}")
+        del self.__active[factor_name][key]
+        EventSubscriptionController.raise_event(RunnerEvents.TEARDOWN_FACTOR_LEVEL,
+                                                FactorLevelContext(factor_name, level, self.__cache.get((factor_name, key))))
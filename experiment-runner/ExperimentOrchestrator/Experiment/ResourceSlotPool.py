@@ -0,0 +1,59 @@
+import time
+from typing import Dict, Iterable, List
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+
+
+###     =========================================================
+###     |                                                       |
+###     |                    ResourceSlotPool                   |
+###     |       - Keep track of the named resource slots        |
+###     |         (e.g. "cores 0-7", "gpu0") that are in use    |
+###     |         by the runs executing in parallel             |
+###     |                                                       |
+###     |       * A slot can only be held by one run at a       |
+###     |         time, runs sharing a slot are serialized      |
+###     |                                                       |
+###     =========================================================
+class ResourceSlotPool:
+
+    def __init__(self, slots: List[str], cooldown_in_ms: int = 0):
+        if len(set(slots)) != len(slots):
+            raise BaseError("Duplicate resource slot name detected!")
+
+        self.__slots = set(slots)
+        self.__held = set()
+        self.__cooldown_in_ms = cooldown_in_ms
+        self.__available_at: Dict[str, float] = dict()
+
+    @property
+    def slots(self) -> List[str]:
+        return sorted(self.__slots)
+
+    def validate(self, requested: Iterable[str]):
+        unknown = set(requested) - self.__slots
+        if unknown:
+            raise BaseError(f"Run requested undeclared resource slot(s): {', '.join(sorted(unknown))}")
+
+    def is_available(self, requested: Iterable[str]) -> bool:
+        now = time.monotonic()
+        return all(slot not in self.__held and self.__available_at.get(slot, 0) <= now for slot in requested)
+
+    def acquire(self, requested: Iterable[str]):
+        if not self.is_available(requested):
+            raise BaseError(f"Resource slot(s) {', '.join(sorted(requested))} are not available")
+
+        self.__held.update(requested)
+
+    def release(self, requested: Iterable[str]):
+        # A released slot is only handed out again after the time between runs has passed
+        available_at = time.monotonic() + self.__cooldown_in_ms / 1000
+        for slot in requested:
+            self.__held.discard(slot)
+            self.__available_at[slot] = available_at
+
+    def seconds_until_release(self) -> float:
+        """Time until the next slot, that is not held by a run, comes out of its cooldown (0 if none is cooling down)."""
+        now = time.monotonic()
+        waiting = [at - now for slot, at in self.__available_at.items() if slot not in self.__held and at > now]
+        return min(waiting, default=0)
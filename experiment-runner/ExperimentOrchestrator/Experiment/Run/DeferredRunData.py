@@ -0,0 +1,132 @@
+import os
+import time
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import dill
+
+from ConfigValidator.Config.Models.RunnerContext import RunnerContext
+from EventManager.Models.RunnerEvents import RunnerEvents
+from EventManager.EventSubscriptionController import EventSubscriptionController
+from ExperimentOrchestrator.Experiment.Run.RunWatchdog import kill_process_tree
+from ProgressManager.Output.RunTableOutputManager import RunTableOutputManager
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+_started = None  # The queue on which the pool processes report the runs they start
+
+
+def _init_worker(started):
+    global _started
+    _started = started
+
+
+def _populate_run_data(run_id: str, context: bytes):
+    # Executes in a pool process, forked from the experiment runner after the config subscribed to the events
+    _started.put((run_id, os.getpid(), time.monotonic()))
+    return EventSubscriptionController.raise_event(RunnerEvents.POPULATE_RUN_DATA, dill.loads(context))
+
+
+###     =========================================================
+###     |                                                       |
+###     |                    DeferredRunData                    |
+###     |       - Call populate_run_data in background          |
+###     |         processes, so that parsing the raw data of    |
+###     |         a run overlaps the cooldown and the next run  |
+###     |       - Store the data of the run, and mark it as     |
+###     |         DONE, once populate_run_data returns          |
+###     |                                                       |
+###     |       * Results are stored by the caller's thread,    |
+###     |         from `collect()` and `wait()`                 |
+###     |       * A run exceeding the POPULATE_RUN_DATA timeout |
+###     |         is FAILED, its pool process is killed         |
+###     |                                                       |
+###     =========================================================
+class DeferredRunData:
+
+    def __init__(self, data_manager: RunTableOutputManager, max_workers: int, timeout_in_ms: Optional[int] = None):
+        self.data_manager = data_manager
+        self.max_workers = max_workers
+        self.timeout_in_ms = timeout_in_ms
+        self.__started = multiprocessing.get_context('fork').SimpleQueue()
+        self.__pool = self.__create_pool()
+        self.__pending: Dict[Future, Tuple[str, bytes]] = dict()  # future -> (run id, context)
+        self.__running: Dict[str, Tuple[int, float]] = dict()     # run id -> (pid, time.monotonic() it started)
+
+    def submit(self, variation: Dict, current_run: int, run_dir: Path, factor_setup: Optional[Dict[str, Any]] = None):
+        # dill, as treatment levels can be arbitrary python objects
+        context = dill.dumps(RunnerContext(variation, current_run, run_dir, factor_setup))
+        self.__submit(variation['__run_id'], context)
+
+    def collect(self):
+        """Store the data of the runs for which populate_run_data has returned, and fail the runs that exceeded
+        the timeout, without blocking"""
+        self.__update_running()
+        for future in [future for future in self.__pending if future.done()]:
+            self.__store(future)
+        self.__kill_expired_runs()
+
+    def wait(self):
+        """Store the data of all submitted runs, waiting for populate_run_data to return (or time out)"""
+        if self.__pending:
+            output.console_log_WARNING(f"Waiting for populate_run_data of {len(self.__pending)} run(s)")
+        while self.__pending:
+            # Look at the running ones at least every second, as they can start at any moment
+            wait(list(self.__pending.keys()), timeout=1.0 if self.timeout_in_ms is not None else None,
+                 return_when=FIRST_COMPLETED)
+            self.collect()
+
+    def shutdown(self):
+        self.__pool.shutdown(wait=True, cancel_futures=True)
+
+    def __create_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context('fork'),
+                                   initializer=_init_worker, initargs=(self.__started,))
+
+    def __submit(self, run_id: str, context: bytes):
+        self.__pending[self.__pool.submit(_populate_run_data, run_id, context)] = (run_id, context)
+
+    def __update_running(self):
+        while not self.__started.empty():
+            run_id, pid, started = self.__started.get()
+            self.__running[run_id] = (pid, started)
+
+    def __kill_expired_runs(self):
+        if self.timeout_in_ms is None:
+            return
+
+        deadline = time.monotonic() - self.timeout_in_ms / 1000
+        expired = [future for future, (run_id, _) in self.__pending.items()
+                   if run_id in self.__running and self.__running[run_id][1] < deadline]
+        if not expired:
+            return
+
+        for future in expired:
+            run_id, _ = self.__pending.pop(future)
+            output.console_log_FAIL(f"populate_run_data of run {run_id} exceeded its timeout of {self.timeout_in_ms}ms")
+            kill_process_tree(self.__running.pop(run_id)[0])
+            self.data_manager.update_row_data({'__run_id': run_id, '__done': RunProgress.FAILED})
+
+        # Killing a pool process breaks the pool, the runs it did not complete start over in a new one
+        broken_pool, self.__pool = self.__pool, self.__create_pool()
+        broken_pool.shutdown(wait=True)
+        for future in list(self.__pending.keys()):
+            if isinstance(future.exception(), BrokenProcessPool):
+                run_id, context = self.__pending.pop(future)
+                self.__running.pop(run_id, None)
+                self.__submit(run_id, context)
+
+    def __store(self, future: Future):
+        run_id, _ = self.__pending.pop(future)
+        self.__running.pop(run_id, None)
+        try:
+            user_run_data = future.result()
+        except Exception as e:
+            output.console_log_FAIL(f"populate_run_data failed for run {run_id}:\n{type(e).__name__}: {e}")
+            self.data_manager.update_row_data({'__run_id': run_id, '__done': RunProgress.FAILED})
+            return
+
+        self.data_manager.update_row_data({'__run_id': run_id, **(user_run_data or {}), '__done': RunProgress.DONE})
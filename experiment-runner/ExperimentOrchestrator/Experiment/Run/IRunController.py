@@ -1,12 +1,15 @@
-from typing import Dict
+from typing import Any, Dict, Optional
 
-from ProgressManager.Output.CSVOutputManager import CSVOutputManager
+from ProgressManager.Output.RunTableOutputManager import RunTableOutputManager
 from pathlib import Path
 from abc import ABC, abstractmethod
 from multiprocessing import Event
 
 from ConfigValidator.Config.RunnerConfig import RunnerConfig
 from ConfigValidator.Config.Models.RunnerContext import RunnerContext
+from EventManager.Models.RunnerEvents import RunnerEvents
+from ExperimentOrchestrator.Experiment.Run.RunWatchdog import RunPhase
+from ExperimentOrchestrator.Experiment.Run.RunTimeline import RunTimeline
 
 class IRunController(ABC):
     run_dir: Path = None
@@ -14,22 +17,36 @@ class IRunController(ABC):
     variation: Dict = None
     config: RunnerConfig = None
     run_context: RunnerContext = None
-    data_manager: CSVOutputManager = None
+    data_manager: RunTableOutputManager = None
 
-    def __init__(self, variation: Dict, config: RunnerConfig, current_run: int, total_runs: int):
+    def __init__(self, variation: Dict, config: RunnerConfig, current_run: int, total_runs: int,
+                 phase: Optional[RunPhase] = None, factor_setup: Optional[Dict[str, Any]] = None):
         self.run_dir = config.experiment_path / variation['__run_id']
         self.run_dir.mkdir(parents=True, exist_ok=True)
 
         self.variation = variation
         self.config = config
         self.current_run = current_run
-        self.run_context = RunnerContext(self.variation, self.current_run, self.run_dir)
-        self.data_manager = CSVOutputManager(self.config.experiment_path)
+        self.run_context = RunnerContext(self.variation, self.current_run, self.run_dir, factor_setup)
+        self.data_manager = RunTableOutputManager.create(self.config)
+        self.phase = phase  # Reported to the run watchdog of the experiment controller
+        self.timeline = RunTimeline()
 
         self.run_completed_event = Event()
 
         print(f"\n-----------------NEW RUN [{current_run} / {total_runs}]-----------------\n")
 
+    def enter_phase(self, phase: Optional[RunnerEvents]):
+        self.timeline.enter(phase.name.lower() if phase is not None else None)
+        if self.phase is not None:
+            self.phase.enter(phase)
+
     @abstractmethod
     def do_run(self):
+        """Execute the run in a separate process"""
+        pass
+
+    @abstractmethod
+    def run(self):
+        """Execute the run in the calling process"""
         pass
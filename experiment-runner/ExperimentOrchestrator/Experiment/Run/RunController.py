@@ -1,4 +1,5 @@
 import subprocess
+import time
 import os
 
 from ProgressManager.RunTable.Models.RunProgress import RunProgress
@@ -7,6 +8,7 @@ from EventManager.EventSubscriptionController import EventSubscriptionController
 from ExperimentOrchestrator.Architecture.Processify import processify
 from ExperimentOrchestrator.Experiment.Run.IRunController import IRunController
 from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+from ProgressManager.Output.TraceRecorder import TraceRecorder
 
 class RunController(IRunController):
     # Start EnergiBridge measurements
@@ -52,36 +54,61 @@ class RunController(IRunController):
 
     @processify
     def do_run(self):
-        # Start EnergiBridge
-        self.start_eb()
-
-        # -- Start run
-        output.console_log_WARNING("Calling start_run config hook")
-        EventSubscriptionController.raise_event(RunnerEvents.START_RUN, self.run_context)
-
-        # -- Start measurement
-        output.console_log_WARNING("... Starting measurement ...")
-        EventSubscriptionController.raise_event(RunnerEvents.START_MEASUREMENT, self.run_context)
-
-        # -- Start interaction
-        output.console_log_WARNING("Calling interaction config hook")
-        EventSubscriptionController.raise_event(RunnerEvents.INTERACT, self.run_context)
-        output.console_log_OK("... Run completed ...")
+        TraceRecorder().name_process(f"run {self.variation['__run_id']}")
+        self.run()
 
-        # -- Stop measurement
-        output.console_log_WARNING("... Stopping measurement ...")
-        EventSubscriptionController.raise_event(RunnerEvents.STOP_MEASUREMENT, self.run_context)
+    def run(self):
+        # Time from setting up the run (in the experiment controller) until it executes, e.g. forking its process
+        self.timeline.record('dispatch', self.timeline.created_ns, time.monotonic_ns())
 
-        # -- Stop run
-        output.console_log_WARNING("Calling stop_run config hook")
-        EventSubscriptionController.raise_event(RunnerEvents.STOP_RUN, self.run_context)
+        # Start EnergiBridge
+        if self.config.self_measure:
+            with self.timeline.measure('start_energibridge'):
+                self.start_eb()
 
-        # -- Collect data from measurements
-        output.console_log_WARNING("Calling populate_run_data config hook")
-        user_run_data = EventSubscriptionController.raise_event(RunnerEvents.POPULATE_RUN_DATA, self.run_context)
+        # Also leave the last phase when a hook raises, so that it ends in the timeline and the watchdog no longer times it
+        try:
+            # -- Start run
+            output.console_log_WARNING("Calling start_run config hook")
+            self.enter_phase(RunnerEvents.START_RUN)
+            EventSubscriptionController.raise_event(RunnerEvents.START_RUN, self.run_context)
+
+            # -- Start measurement
+            output.console_log_WARNING("... Starting measurement ...")
+            self.enter_phase(RunnerEvents.START_MEASUREMENT)
+            EventSubscriptionController.raise_event(RunnerEvents.START_MEASUREMENT, self.run_context)
+
+            # -- Start interaction
+            output.console_log_WARNING("Calling interaction config hook")
+            self.enter_phase(RunnerEvents.INTERACT)
+            EventSubscriptionController.raise_event(RunnerEvents.INTERACT, self.run_context)
+            output.console_log_OK("... Run completed ...")
+
+            # -- Stop measurement
+            output.console_log_WARNING("... Stopping measurement ...")
+            self.enter_phase(RunnerEvents.STOP_MEASUREMENT)
+            EventSubscriptionController.raise_event(RunnerEvents.STOP_MEASUREMENT, self.run_context)
+
+            # -- Stop run
+            output.console_log_WARNING("Calling stop_run config hook")
+            self.enter_phase(RunnerEvents.STOP_RUN)
+            EventSubscriptionController.raise_event(RunnerEvents.STOP_RUN, self.run_context)
+
+            # -- Collect data from measurements
+            if self.config.defer_populate_run_data:
+                # Called afterwards by the experiment controller, in a background process
+                user_run_data = None
+            else:
+                output.console_log_WARNING("Calling populate_run_data config hook")
+                self.enter_phase(RunnerEvents.POPULATE_RUN_DATA)
+                user_run_data = EventSubscriptionController.raise_event(RunnerEvents.POPULATE_RUN_DATA, self.run_context)
+        finally:
+            self.enter_phase(None)
         
         # Stop EnergiBridge
-        self.stop_eb()
+        if self.config.self_measure:
+            with self.timeline.measure('stop_energibridge'):
+                self.stop_eb()
 
         if user_run_data:
             # TODO: check if data columns exist and if yes, if they match
@@ -90,5 +117,16 @@ class RunController(IRunController):
         else:
             updated_run_data = self.run_context.execute_run
 
-        updated_run_data['__done'] = RunProgress.DONE
-        self.data_manager.update_row_data(updated_run_data)
+        if self.config.defer_populate_run_data:
+            # The run is only DONE once its data has been populated
+            updated_run_data = {k: v for k, v in updated_run_data.items() if k != '__done'}
+        else:
+            updated_run_data['__done'] = RunProgress.DONE
+        if self.config.record_phase_timings:
+            updated_run_data = {**updated_run_data, **self.timeline.durations_in_ms()}
+
+        with self.timeline.measure('store_run_data'):
+            self.data_manager.update_row_data(updated_run_data)
+        if self.config.record_phase_timings:
+            self.timeline.write(self.run_dir, self.variation['__run_id'])
+        TraceRecorder().record(self.variation['__run_id'], 'run', self.timeline.created_ns, time.monotonic_ns())
@@ -0,0 +1,158 @@
+import math
+import multiprocessing
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from ConfigValidator.Config.RunnerConfig import RunnerConfig
+from ConfigValidator.Config.Models.RunIsolationType import RunIsolationType
+from EventManager.Models.RunnerEvents import RunnerEvents
+from ExperimentOrchestrator.Experiment.Run.RunController import RunController
+from ExperimentOrchestrator.Experiment.Run.RunWatchdog import RunFailure, RunPhase, kill_process_tree
+from ExperimentOrchestrator.Experiment.Run.RunWorker import RunWorker
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+
+
+class RunExecutor(ABC):
+    """Starts runs in the background. `start()` returns an object that can be passed to
+    `multiprocessing.connection.wait()`, and that becomes ready once the run has ended.
+    It must then be handed back to `finish()`, which returns a RunFailure if the run did not complete.
+
+    Runs report the hook they are executing, `kill_expired_runs()` kills the runs that exceed the timeout of
+    their current phase, together with all processes they started."""
+
+    def __init__(self, config: RunnerConfig):
+        self.config = config
+        self._phases: Dict[object, RunPhase] = dict()
+        self._timed_out: Dict[object, RunnerEvents] = dict()
+
+    @abstractmethod
+    def start(self, variation: Dict, current_run: int, total_runs: int, factor_setup: Optional[Dict[str, Any]] = None):
+        pass
+
+    @abstractmethod
+    def finish(self, waitable) -> Optional[RunFailure]:
+        pass
+
+    @abstractmethod
+    def _kill(self, waitable):
+        pass
+
+    def shutdown(self):
+        pass
+
+    def seconds_until_next_deadline(self) -> Optional[float]:
+        """Time until the first phase timeout of a running run expires, None if no run has a timeout"""
+        deadline = min((phase.seconds_until_deadline() for waitable, phase in self._phases.items()
+                        if waitable not in self._timed_out), default=math.inf)
+        return None if deadline == math.inf else deadline
+
+    def kill_expired_runs(self):
+        for waitable, phase in self._phases.items():
+            if waitable in self._timed_out or not phase.expired():
+                continue
+
+            self._timed_out[waitable] = phase.phase
+            output.console_log_FAIL(f"Run exceeded the timeout of {phase.phase.name}, killing it")
+            self._kill(waitable)
+
+    def _timeout_failure(self, waitable) -> Optional[RunFailure]:
+        self._phases.pop(waitable, None)
+        phase = self._timed_out.pop(waitable, None)
+        if phase is None:
+            return None
+        return RunFailure(f"Run exceeded the timeout of {phase.name}", self.config.run_retry_policy.retry_on_timeout)
+
+    @staticmethod
+    def create(config: RunnerConfig) -> 'RunExecutor':
+        if config.run_isolation is RunIsolationType.WORKER:
+            return WorkerRunExecutor(config)
+        return ProcessRunExecutor(config)
+
+
+class ProcessRunExecutor(RunExecutor):
+    """One freshly forked process per run"""
+
+    def __init__(self, config: RunnerConfig):
+        super().__init__(config)
+        self.__processes: Dict[object, multiprocessing.Process] = dict()
+
+    def start(self, variation: Dict, current_run: int, total_runs: int, factor_setup: Optional[Dict[str, Any]] = None):
+        phase = RunPhase(self.config.run_phase_timeouts_in_ms)
+        run_controller = RunController(variation, self.config, current_run, total_runs, phase, factor_setup)
+
+        # The outcome is sent back over a pipe, which also reaches EOF when the process dies without sending it
+        connection, run_connection = multiprocessing.Pipe(duplex=False)
+        perform_run = multiprocessing.Process(
+            target=self.__perform_run,
+            args=[run_controller, run_connection]
+        )
+        perform_run.start()
+        run_connection.close()
+
+        self.__processes[connection] = perform_run
+        self._phases[connection] = phase
+        return connection
+
+    def __perform_run(self, run_controller: RunController, connection):
+        error, retryable = None, False
+        try:
+            run_controller.do_run()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"  # Includes the traceback of the run's subprocess
+            retryable = self.config.run_retry_policy.is_retryable(e)
+
+        connection.send((error, retryable))
+        connection.close()
+
+    def finish(self, waitable) -> Optional[RunFailure]:
+        perform_run = self.__processes.pop(waitable)
+        try:
+            error, retryable = waitable.recv()
+        except (EOFError, OSError):
+            error, retryable = f"Run process {perform_run.pid} died during the run", True
+        waitable.close()
+        perform_run.join()
+
+        failure = self._timeout_failure(waitable)
+        if failure is None and error:
+            output.console_log_FAIL(f"Run failed:\n{error}")
+            failure = RunFailure(error, retryable)
+        return failure
+
+    def _kill(self, waitable):
+        kill_process_tree(self.__processes[waitable].pid)
+
+
+class WorkerRunExecutor(RunExecutor):
+    """A pool of long-lived worker processes, one per run that may execute at the same time"""
+
+    def __init__(self, config: RunnerConfig):
+        super().__init__(config)
+        self.__workers: List[RunWorker] = []
+
+    def start(self, variation: Dict, current_run: int, total_runs: int, factor_setup: Optional[Dict[str, Any]] = None):
+        worker = next((w for w in self.__workers if not w.busy), None)
+        if worker is None:
+            worker = RunWorker(self.config, self.config.worker_max_runs, self.config.worker_max_memory_in_mb)
+            self.__workers.append(worker)
+
+        worker.submit(variation, current_run, total_runs, factor_setup)
+        self._phases[worker.connection] = worker.phase
+        return worker.connection
+
+    def finish(self, waitable) -> Optional[RunFailure]:
+        worker = next(w for w in self.__workers if w.connection is waitable)
+        if not worker.collect():
+            output.console_log_WARNING(f"Recycling run worker {worker.process.pid}")
+            worker.stop()
+            self.__workers.remove(worker)
+
+        return self._timeout_failure(waitable) or worker.failure
+
+    def _kill(self, waitable):
+        next(w for w in self.__workers if w.connection is waitable).kill()
+
+    def shutdown(self):
+        for worker in self.__workers:
+            worker.stop()
+        self.__workers = []
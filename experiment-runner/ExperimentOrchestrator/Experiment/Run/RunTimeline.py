@@ -0,0 +1,67 @@
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ExperimentOrchestrator.Experiment.Run.RunWatchdog import RunPhase
+from ProgressManager.Output.TraceRecorder import TraceRecorder
+
+
+class RunTimeline:
+    """The phases of a run, timestamped with time.monotonic_ns(): the hooks (RunnerEvents) the run executes, and the
+    framework overhead around them (e.g. forking the run's process, starting EnergiBridge, storing the run data).
+
+    The durations of the hooks can be stored as `__t_<phase>_ms` data columns, the whole timeline in `timeline.json`
+    in the run directory. time.monotonic_ns() is system-wide, so phases recorded by different processes line up."""
+
+    timeline_file = 'timeline.json'
+
+    def __init__(self):
+        self.created_ns = time.monotonic_ns()
+        self.phases: List[Tuple[str, int, int]] = []  # (name, start, end)
+        self.__current: Optional[Tuple[str, int]] = None
+
+    @staticmethod
+    def data_columns() -> List[str]:
+        return [f'__t_{phase.name.lower()}_ms' for phase in RunPhase.RUN_PHASES]
+
+    def enter(self, name: Optional[str]):
+        """End the current phase, if any, and start the given one (None only ends the current phase)"""
+        now = time.monotonic_ns()
+        if self.__current is not None:
+            self.phases.append((self.__current[0], self.__current[1], now))
+        self.__current = (name, now) if name is not None else None
+
+    def record(self, name: str, start_ns: int, end_ns: int):
+        """Record a phase of framework overhead, which also shows in the experiment trace (hooks are traced themselves)"""
+        self.phases.append((name, start_ns, end_ns))
+        TraceRecorder().record(name, 'overhead', start_ns, end_ns)
+
+    @contextmanager
+    def measure(self, name: str):
+        start_ns = time.monotonic_ns()
+        try:
+            yield
+        finally:
+            self.record(name, start_ns, time.monotonic_ns())
+
+    def durations_in_ms(self) -> Dict[str, float]:
+        """The time spent in every phase of the run, for its `__t_<phase>_ms` data columns"""
+        durations = dict()
+        for name, start_ns, end_ns in self.phases:
+            column = f'__t_{name}_ms'
+            durations[column] = durations.get(column, 0) + (end_ns - start_ns) / 1e6
+        return {column: round(duration, 3) for column, duration in durations.items() if column in self.data_columns()}
+
+    def write(self, run_dir: Path, run_id: str):
+        timeline = {
+            'run_id': run_id,
+            'clock': 'time.monotonic_ns',
+            # time.monotonic_ns() + offset is the wall clock time (time.time_ns()), to relate the phases to profiler logs
+            'wall_clock_offset_ns': time.time_ns() - time.monotonic_ns(),
+            'phases': [{'name': name, 'start_ns': start_ns, 'end_ns': end_ns, 'duration_ms': round((end_ns - start_ns) / 1e6, 3)}
+                       for name, start_ns, end_ns in self.phases]
+        }
+        with open(run_dir / self.timeline_file, 'w') as f:
+            json.dump(timeline, f, indent=2)
@@ -0,0 +1,65 @@
+import math
+import time
+import multiprocessing
+from typing import Dict, Optional
+
+import psutil
+
+from EventManager.Models.RunnerEvents import RunnerEvents
+
+
+class RunFailure:
+    """Why a run did not complete, and whether the retry policy allows it to be tried again"""
+
+    def __init__(self, error: str, retryable: bool):
+        self.error = error
+        self.retryable = retryable
+
+
+class RunPhase:
+    """The hook (RunnerEvents) a run is currently executing, shared with the experiment controller.
+
+    The process executing the run calls `enter()` for every phase, the controller polls `expired()`.
+    The state lives in shared memory, created before the run's process is forked."""
+
+    RUN_PHASES = [RunnerEvents.START_RUN, RunnerEvents.START_MEASUREMENT, RunnerEvents.INTERACT,
+                  RunnerEvents.STOP_MEASUREMENT, RunnerEvents.STOP_RUN, RunnerEvents.POPULATE_RUN_DATA]
+
+    def __init__(self, timeouts_in_ms: Dict[RunnerEvents, int]):
+        self.__timeouts_in_ms = timeouts_in_ms
+        self.__phase = multiprocessing.RawValue('i', 0)
+        self.__deadline = multiprocessing.RawValue('d', math.inf)  # time.monotonic() is system-wide
+
+    def enter(self, phase: Optional[RunnerEvents]):
+        """Start the given phase, or leave the current one (None)"""
+        timeout_in_ms = self.__timeouts_in_ms.get(phase) if phase is not None else None
+        self.__deadline.value = math.inf
+        self.__phase.value = phase.value if phase is not None else 0
+        if timeout_in_ms is not None:
+            self.__deadline.value = time.monotonic() + timeout_in_ms / 1000
+
+    @property
+    def phase(self) -> Optional[RunnerEvents]:
+        return RunnerEvents(self.__phase.value) if self.__phase.value else None
+
+    def seconds_until_deadline(self) -> float:
+        return max(0.0, self.__deadline.value - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.__deadline.value
+
+
+def kill_process_tree(pid: int):
+    """Kill the given process and everything it started (e.g. the target system of a run)"""
+    try:
+        process = psutil.Process(pid)
+        processes = process.children(recursive=True) + [process]
+    except psutil.NoSuchProcess:
+        return
+
+    for process in processes:
+        try:
+            process.kill()
+        except psutil.NoSuchProcess:
+            pass
+    psutil.wait_procs(processes, timeout=5)
@@ -0,0 +1,118 @@
+import os
+import sys
+import traceback
+import multiprocessing
+from typing import Any, Dict, Optional
+
+import dill
+import psutil
+
+from ConfigValidator.Config.RunnerConfig import RunnerConfig
+from ExperimentOrchestrator.Experiment.Run.RunController import RunController
+from ExperimentOrchestrator.Experiment.Run.RunWatchdog import RunFailure, RunPhase, kill_process_tree
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+from ProgressManager.Output.TraceRecorder import TraceRecorder
+
+
+###     =========================================================
+###     |                                                       |
+###     |                       RunWorker                       |
+###     |       - Long-lived process executing the runs it      |
+###     |         receives over a pipe, one at a time           |
+###     |       - Asks to be recycled after `max_runs` runs,    |
+###     |         or when its memory use grows too large        |
+###     |                                                       |
+###     =========================================================
+class RunWorker:
+
+    def __init__(self, config: RunnerConfig, max_runs: int, max_memory_in_mb: Optional[int] = None):
+        self.config = config
+        self.max_runs = max_runs
+        self.max_memory_in_mb = max_memory_in_mb
+        self.busy = False
+        self.failure: Optional[RunFailure] = None
+        self.phase = RunPhase(config.run_phase_timeouts_in_ms)
+
+        self.__connection, worker_connection = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=self.__serve, args=[worker_connection])
+        self.process.start()
+        worker_connection.close()  # Only the worker holds this end, so its death shows up as EOF
+
+    @property
+    def connection(self):
+        """Becomes readable (for `multiprocessing.connection.wait`) once the submitted run has finished"""
+        return self.__connection
+
+    def submit(self, variation: Dict, current_run: int, total_runs: int, factor_setup: Optional[Dict[str, Any]] = None):
+        # dill, as treatment levels can be arbitrary python objects
+        self.__connection.send_bytes(dill.dumps((variation, current_run, total_runs, factor_setup)))
+        self.busy = True
+
+    def collect(self) -> bool:
+        """Collect the outcome of the submitted run, a failed run leaves its RunFailure in `failure`.
+        Returns whether the worker is still usable."""
+        self.busy = False
+        self.failure = None
+        try:
+            error, retryable, recycle = self.__connection.recv()
+        except (EOFError, OSError):
+            output.console_log_FAIL(f"Run worker {self.process.pid} died during the run")
+            self.failure = RunFailure(f"Run worker {self.process.pid} died during the run", retryable=True)
+            self.process.join()
+            return False
+
+        if error:
+            output.console_log_FAIL(f"Run failed in worker {self.process.pid}:\n{error}")
+            self.failure = RunFailure(error, retryable)
+
+        if recycle:
+            self.process.join()
+        return not recycle
+
+    def kill(self):
+        """Kill the worker, and every process started by the run it is executing"""
+        kill_process_tree(self.process.pid)
+
+    def stop(self):
+        if self.process.is_alive():
+            try:
+                self.__connection.send_bytes(dill.dumps(None))
+            except (BrokenPipeError, OSError):
+                pass
+            self.process.join()
+        self.__connection.close()
+
+    def __serve(self, connection):
+        runs_done = 0
+        process = psutil.Process(os.getpid())
+        TraceRecorder().name_process("run worker")
+
+        while True:
+            try:
+                job = dill.loads(connection.recv_bytes())
+            except EOFError:
+                break
+            if job is None:
+                break
+
+            variation, current_run, total_runs, factor_setup = job
+            error, retryable = None, False
+            try:
+                RunController(variation, self.config, current_run, total_runs, self.phase, factor_setup).run()
+            except Exception as e:
+                ex_type, ex_value, tb = sys.exc_info()
+                error = f"{ex_type.__name__}: {ex_value}\n{''.join(traceback.format_tb(tb))}"
+                retryable = self.config.run_retry_policy.is_retryable(e)
+            finally:
+                self.phase.enter(None)
+
+            runs_done += 1
+            recycle = runs_done >= self.max_runs
+            if self.max_memory_in_mb is not None:
+                recycle |= process.memory_info().rss > self.max_memory_in_mb * 1024 * 1024
+
+            connection.send((error, retryable, recycle))
+            if recycle:
+                break
+
+        connection.close()
@@ -0,0 +1,166 @@
+import os
+import time
+import fcntl
+import socket
+import sqlite3
+import threading
+from contextlib import closing, contextmanager
+from enum import Enum, auto
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+from ProgressManager.Output.SQLiteOutputManager import SQLiteOutputManager
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+
+class LeaseState(Enum):
+    CLAIMED = auto()    # The lease was granted to this node
+    BUSY = auto()       # Another node holds an unexpired lease
+    DONE = auto()       # The run is already done
+
+
+###     =========================================================
+###     |                                                       |
+###     |                     RunCoordinator                    |
+###     |       - Let experiment-runner processes (nodes), on   |
+###     |         one or more hosts sharing the experiment      |
+###     |         path, divide the runs of an experiment        |
+###     |       - Runs are claimed with a lease in the shared   |
+###     |         run_table.db, renewed while the run executes  |
+###     |       - Leases of crashed nodes expire, after which   |
+###     |         other nodes claim the run                     |
+###     |                                                       |
+###     |       * Leases expire on wall clock time, the clocks  |
+###     |         of the hosts must be synchronized (NTP)       |
+###     |                                                       |
+###     =========================================================
+class RunCoordinator:
+    lock_file = 'coordinator.lock'
+    table_name = 'run_leases'
+
+    def __init__(self, experiment_path: Path, lease_in_ms: int, node_id: Optional[str] = None):
+        self.experiment_path = experiment_path
+        self.lease_in_s = lease_in_ms / 1000
+        self.heartbeat_interval_in_s = self.lease_in_s / 3
+        self.node_id = node_id or f"{socket.gethostname()}-{os.getpid()}"
+
+        self.__held: Dict[str, float] = dict()  # run id -> expiry of the lease
+        self.__last_heartbeat = 0.0
+        self.__heartbeat_lock = threading.Lock()
+
+    @contextmanager
+    def setup(self):
+        """Serialize the setup of the experiment over all nodes, so that only the first creates the run table.
+        Creates the experiment path if needed."""
+        self.experiment_path.mkdir(parents=True, exist_ok=True)
+        with open(self.experiment_path / self.lock_file, 'a') as lock:
+            fcntl.lockf(lock, fcntl.LOCK_EX)  # POSIX record lock, these also work on NFS
+            try:
+                yield
+                with self.__transaction() as connection:
+                    connection.execute(f"CREATE TABLE IF NOT EXISTS {self.table_name} "
+                                       f"(__run_id TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)")
+            finally:
+                fcntl.lockf(lock, fcntl.LOCK_UN)
+
+    def run_table_exists(self) -> bool:
+        return (self.experiment_path / SQLiteOutputManager.run_table_file).exists()
+
+    def claim(self, run_id: str) -> LeaseState:
+        with self.__transaction() as connection:
+            done = connection.execute("SELECT __done FROM run_table WHERE __run_id = ?", [run_id]).fetchone()
+            if done is None or done[0] == RunProgress.DONE.name:
+                return LeaseState.DONE
+
+            now = time.time()
+            lease = connection.execute(f"SELECT owner, expires_at FROM {self.table_name} WHERE __run_id = ?",
+                                       [run_id]).fetchone()
+            if lease is not None and lease[0] != self.node_id and lease[1] > now:
+                return LeaseState.BUSY
+            if lease is not None and lease[0] != self.node_id:
+                output.console_log_WARNING(f"Coordinator: The lease of {lease[0]} on {run_id} expired, taking over the run")
+
+            connection.execute(f"INSERT OR REPLACE INTO {self.table_name} (__run_id, owner, expires_at) VALUES (?, ?, ?)",
+                               [run_id, self.node_id, now + self.lease_in_s])
+        self.__held[run_id] = now + self.lease_in_s
+        return LeaseState.CLAIMED
+
+    def release(self, run_id: str):
+        with self.__transaction() as connection:
+            connection.execute(f"DELETE FROM {self.table_name} WHERE __run_id = ? AND owner = ?", [run_id, self.node_id])
+        self.__held.pop(run_id, None)
+
+    def holds(self, run_id: str) -> bool:
+        """Whether this node (still) holds the lease on the run, as of the last heartbeat"""
+        return run_id in self.__held
+
+    def heartbeat(self, force: bool = False):
+        """Renew the leases held by this node, at most once every heartbeat interval unless forced"""
+        with self.__heartbeat_lock:
+            now = time.time()
+            if not self.__held or (not force and now - self.__last_heartbeat < self.heartbeat_interval_in_s):
+                return
+
+            self.__last_heartbeat = now
+            with self.__transaction() as connection:
+                for run_id in list(self.__held.keys()):
+                    renewed = connection.execute(f"UPDATE {self.table_name} SET expires_at = ? WHERE __run_id = ? AND owner = ?",
+                                                 [now + self.lease_in_s, run_id, self.node_id]).rowcount
+                    if renewed:
+                        self.__held[run_id] = now + self.lease_in_s
+                    else:
+                        output.console_log_FAIL(f"Coordinator: Lost the lease on {run_id}, another node may execute it as well")
+                        del self.__held[run_id]
+
+    @contextmanager
+    def keep_alive(self):
+        """Renew the leases from a background thread, while the node does work that does not heartbeat itself
+        (e.g. the setup of factor levels and the before_run hook)"""
+        stopped = threading.Event()
+
+        def renew_leases():
+            while not stopped.wait(self.heartbeat_interval_in_s):
+                self.heartbeat()
+
+        thread = threading.Thread(target=renew_leases, name='lease-heartbeat', daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stopped.set()
+            thread.join()
+
+    def claim_runs(self, runs: Iterable[Dict], poll_interval_in_s: Optional[float] = None) -> Iterator[Dict]:
+        """Claim the given runs one by one, in order, yielding the ones claimed. The caller releases them.
+
+        Runs leased by other nodes are skipped and tried again afterwards, until they are done or their lease expires.
+        Every node tries a run once, so a run that failed on another node is tried again here."""
+        poll_interval_in_s = poll_interval_in_s or self.heartbeat_interval_in_s
+        remaining = list(runs)
+        while remaining:
+            busy = []
+            for run in remaining:
+                state = self.claim(run['__run_id'])
+                if state is LeaseState.CLAIMED:
+                    yield run
+                elif state is LeaseState.BUSY:
+                    busy.append(run)
+
+            remaining = busy
+            if remaining:
+                output.console_log_WARNING(f"Coordinator: Waiting for {len(remaining)} runs executing on other nodes")
+                time.sleep(poll_interval_in_s)
+
+    @contextmanager
+    def __transaction(self):
+        connection = sqlite3.connect(self.experiment_path / SQLiteOutputManager.run_table_file,
+                                     timeout=SQLiteOutputManager.busy_timeout_in_s, isolation_level=None)
+        with closing(connection):
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
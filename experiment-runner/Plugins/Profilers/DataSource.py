@@ -14,6 +14,9 @@ import os
 import subprocess
 import threading
 import queue
+import time
+
+from ProgressManager.Output.TraceRecorder import TraceRecorder
 
 class ParameterDict(UserDict):
     def valid_key(self, key):
@@ -76,6 +79,11 @@ class DataSource(ABC):
     def __init__(self):
         self._validate_platform()
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Show the time spent starting and stopping the profilers in the experiment trace (export_trace)
+        TraceRecorder.trace_methods(cls, ['start', 'stop'], 'profiler')
+
     def _validate_platform(self):
         if platform.system() in self.supported_platforms:
             return
@@ -119,6 +127,7 @@ class DataSource(ABC):
     @staticmethod
     @abstractmethod
     def parse_log(logfile):
+        """Read a log of the source, into a TimeSeries for tabular logs"""
         pass
 
 class CLISource(DataSource):
@@ -253,6 +262,53 @@ class CLISource(DataSource):
         self._validate_stop(stdout.decode("utf-8"), stderr.decode("utf-8"))
         return stdout.decode("utf-8")
 
+class SamplingScheduler:
+    """Paces a sampling loop on absolute deadlines of time.monotonic_ns(): the n-th sample is due at
+    start + n * interval, however long the samples before it took, so the series does not drift.
+
+    A sample that starts late, but before the next deadline, is still taken. Deadlines that passed entirely
+    (e.g. after a sample that took longer than the interval) are skipped and counted in `missed`,
+    rather than sampled in a burst to catch up."""
+    def __init__(self, interval_ms: float, stop_event: threading.Event = None, immediate: bool = True):
+        self.interval_ns = int(interval_ms * 1_000_000)
+        self.stop_event = stop_event
+        self.immediate = immediate  # Whether the first sample is due at the start, or an interval later
+
+        self.samples = 0
+        self.missed = 0
+        # time.monotonic_ns() + offset is the wall clock time (time.time_ns()) at the start of sampling
+        self.wall_clock_offset_ns = time.time_ns() - time.monotonic_ns()
+        self.__next_ns = None
+
+    def __iter__(self):
+        """Yields the time.monotonic_ns() at which every sample is taken, until `stop_event` is set"""
+        self.__next_ns = time.monotonic_ns() + (0 if self.immediate else self.interval_ns)
+        while self.wait():
+            self.samples += 1
+            yield time.monotonic_ns()
+
+    def wait(self) -> bool:
+        """Wait for the next deadline. Returns False if `stop_event` was set instead."""
+        now = time.monotonic_ns()
+        if now - self.__next_ns >= self.interval_ns:
+            missed = (now - self.__next_ns) // self.interval_ns
+            self.missed += missed
+            self.__next_ns += missed * self.interval_ns
+
+        timeout = max(self.__next_ns - now, 0) / 1e9
+        if self.stop_event is not None:
+            if self.stop_event.wait(timeout):
+                return False
+        elif timeout > 0:
+            time.sleep(timeout)
+
+        self.__next_ns += self.interval_ns
+        return True
+
+    def wall_clock_ns(self, monotonic_ns: int) -> int:
+        """The time.time_ns() of a sample timestamp, unaffected by changes of the wall clock during sampling"""
+        return monotonic_ns + self.wall_clock_offset_ns
+
 class DeviceSource(DataSource):
     def __init__(self):
         super().__init__()
@@ -265,6 +321,9 @@ class DeviceSource(DataSource):
         self.stop_thread = threading.Event()
         self.thread_queue = queue.Queue(maxsize=1)
 
+        # Paces the samples of log(), see sampling_schedule()
+        self.scheduler = None
+
     def __del__(self):
         if self.device_handle:
             self.close_device()
@@ -293,6 +352,16 @@ class DeviceSource(DataSource):
         if threading.current_thread().name != "DeviceWorker":
             raise RuntimeError("Dont call log directly, call start() to begin logging")
 
+    def sampling_schedule(self, immediate: bool = True) -> SamplingScheduler:
+        """The sampling loop for log(), every `sample_frequency` ms until stop() is called"""
+        self.scheduler = SamplingScheduler(self.sample_frequency, self.stop_thread, immediate)
+        return self.scheduler
+
+    @property
+    def missed_samples(self) -> int:
+        """The number of samples that were skipped, as the ones before them took too long"""
+        return self.scheduler.missed if self.scheduler is not None else 0
+
     def start(self):
         if self.process:
             raise RuntimeError("This module has already been started. Call stop() to start again")
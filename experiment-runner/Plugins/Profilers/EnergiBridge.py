@@ -2,6 +2,7 @@ from pathlib import Path
 import pandas as pd
 import re
 from Plugins.Profilers.DataSource import CLISource, ParameterDict, ValueRef
+from Plugins.Profilers.TimeSeries import TimeSeries
 
 # Supported Paramters for the PowerJoular metrics plugin
 ENERGIBRIDGE_PARAMETERS = {
@@ -56,7 +57,7 @@ class EnergiBridge(CLISource):
         return Path(self.logfile).parent / Path(self.logfile.name.split(".")[0] + "-summary.txt")
     
     def _stat_delta(self, data, stat):
-        return list(data[stat].values())[-1] - list(data[stat].values())[0]
+        return data[stat][-1] - data[stat][0]
 
     # Less accurate than the summary from EB, but better than nothing
     # TODO: EnergiBridge calculates this differently in a system dependent way,
@@ -95,9 +96,14 @@ class EnergiBridge(CLISource):
         return cmd + f" -- {self.target_program}"
 
     @staticmethod
-    def parse_log(logfile: Path, summary_logfile: Path|None=None):
+    def parse_log(logfile: Path, summary_logfile: Path|None=None, as_dict: bool = False):
         # Things are already in csv format here, no checks needed
-        log_data = pd.read_csv(logfile).to_dict()
+        df = pd.read_csv(logfile)
+        if as_dict:
+            log_data = df.to_dict()
+        else:
+            # The Time column holds the time of every sample in ms since the epoch
+            log_data = TimeSeries.from_dataframe(df, df["Time"].to_numpy() / 1000 if "Time" in df.columns else None)
 
         if not summary_logfile:
             return log_data
@@ -4,11 +4,13 @@ import inspect
 import json
 import re
 import pynvml as nvml
+import numpy as np
 from pathlib import Path
 import threading
 from collections.abc import Callable
 
 from Plugins.Profilers.DataSource import DeviceSource, ParameterDict
+from Plugins.Profilers.TimeSeries import TimeSeries
 
 # Define a custom enum wrapper to help generating enums from the nvml enums
 class NVML_EnumMeta(enum.EnumType):
@@ -101,6 +103,100 @@ NVML_CONFIG_PARAMETERS = {
     "PowerManagementLimit":             (int,)
 }
 
+# The formats NvidiaML can write its log in: "json" dumps all measurements at once when logging stops,
+# "ndjson" and "binary" stream them to the logfile in batches while logging
+NVML_LOG_FORMATS = ["json", "ndjson", "binary"]
+
+# A binary log starts with this magic, followed by NVML_RECORD records. The names of the metrics,
+# indexed by the "metric" field of the records, are stored next to it in <logfile>.metrics.json
+NVML_BINARY_MAGIC = b"NVMLLOG1"
+NVML_RECORD = np.dtype([("metric", "<u4"), ("error", "<i4"), ("timestamp", "<i8"), ("value", "<f8")])
+
+# The unit of the timestamps in the logs, us since the epoch for every format and metric: samples (NVML_Sample)
+# keep the timestamps NVML took them at on the device, queries and fields have the (wall clock) time their
+# sample of the sampling schedule was due at
+NVML_TIMESTAMP_UNIT = 1e-6
+
+# The logs are parsed into an array of these per metric: the timestamp (in NVML_TIMESTAMP_UNIT),
+# the value (nan on an error) and the nvml error code (0 if the measurement succeeded)
+NVML_SAMPLE = np.dtype([("timestamp", "<i8"), ("value", "<f8"), ("error", "<i4")])
+
+def nvml_flatten(name, value):
+    """Split a measurement into numeric metrics, dicts (and nvml structs) into one metric per key named
+    <name>.<key>. Yields (name, value, error code) tuples, values that are not numbers are left out."""
+    if isinstance(value, nvml.NVMLError):
+        yield name, np.nan, value.value
+    elif isinstance(value, dict):
+        for key, sub_value in value.items():
+            yield from nvml_flatten(f"{name}.{key}", sub_value)
+    elif hasattr(value, "_fields_"):
+        for field in value._fields_:
+            yield from nvml_flatten(f"{name}.{field[0]}", getattr(value, field[0]))
+    elif isinstance(value, (int, float)):
+        yield name, float(value), 0
+
+class NVML_LogWriter:
+    """Streams measurements to a "ndjson" or "binary" log in batches of `batch_size` records,
+    so the memory used while logging does not grow with the length of the run"""
+    def __init__(self, logfile: Path, log_format: str, batch_size: int = 1024):
+        if log_format not in ["ndjson", "binary"]:
+            raise RuntimeError(f"Unexpected log format: {log_format}, expected ndjson or binary")
+
+        self.logfile = Path(logfile)
+        self.log_format = log_format
+        self.batch_size = batch_size
+
+        self.__metrics: dict[str, int] = {}
+        self.__new_metrics = False
+        self.__count = 0
+        if log_format == "binary":
+            self.__batch = np.empty(batch_size, dtype=NVML_RECORD)
+            self.__file = open(self.logfile, "wb")
+            self.__file.write(NVML_BINARY_MAGIC)
+        else:
+            self.__batch = []
+            self.__file = open(self.logfile, "w")
+
+    @staticmethod
+    def metrics_file(logfile: Path) -> Path:
+        return Path(f"{logfile}.metrics.json")
+
+    def write(self, name: str, timestamp: int, value):
+        for metric, metric_value, error in nvml_flatten(name, value):
+            if self.log_format == "binary":
+                if metric not in self.__metrics:
+                    self.__metrics[metric] = len(self.__metrics)
+                    self.__new_metrics = True
+                self.__batch[self.__count] = (self.__metrics[metric], error, timestamp, metric_value)
+            else:
+                record = {"metric": metric, "timestamp": timestamp, "value": None if error else metric_value}
+                if error:
+                    record["error"] = error
+                self.__batch.append(json.dumps(record) + "\n")
+
+            self.__count += 1
+            if self.__count == self.batch_size:
+                self.flush()
+
+    def flush(self):
+        if self.__new_metrics:
+            # Written first, so the records written so far can always be parsed
+            with open(self.metrics_file(self.logfile), "w") as f:
+                json.dump(list(self.__metrics.keys()), f)
+            self.__new_metrics = False
+
+        if self.log_format == "binary":
+            self.__file.write(self.__batch[:self.__count].tobytes())
+        else:
+            self.__file.writelines(self.__batch)
+            self.__batch = []
+        self.__file.flush()
+        self.__count = 0
+
+    def close(self):
+        self.flush()
+        self.__file.close()
+
 class NvidiaML(DeviceSource):
     parameters = ParameterDict(NVML_CONFIG_PARAMETERS)
     source_name = "Nvidia Management Library"
@@ -113,8 +209,13 @@ class NvidiaML(DeviceSource):
                                                NVML_Dynamic_Query.NVML_POWER_USAGE],
                  fields: list[NVML_Field]   = [],
                  samples: list[NVML_Sample] = [],
-                 settings: dict[str, tuple] = {}):
+                 settings: dict[str, tuple] = {},
+                 log_format: str            = "json",
+                 batch_size: int            = 1024):
         super().__init__()
+
+        if log_format not in NVML_LOG_FORMATS:
+            raise RuntimeError(f"Unexpected log format: {log_format}, expected one of {NVML_LOG_FORMATS}")
         
         # Initialize an instance of the library
         nvml.nvmlInit()
@@ -125,6 +226,10 @@ class NvidiaML(DeviceSource):
         self.settings = settings
         self.handle_method = []
 
+        # See NVML_LOG_FORMATS, the streamed formats write `batch_size` records at a time
+        self.log_format = log_format
+        self.batch_size = batch_size
+
         # Threads require their own handle
         self.thread_handle = None
         self.main_handle  = None
@@ -316,11 +421,15 @@ class NvidiaML(DeviceSource):
     # Sampling, Field Values, and deviceGet queries
     # We support all of them, but it does require knowing 
     # which sources you need, and which are supported by the device
-    def measure(self):
+    # Samples are timestamped by NVML, queries and fields with `timestamp_ns`, the time the sample of the
+    # sampling schedule was due at (ns since the epoch, now if not given). All timestamps are in us.
+    def measure(self, timestamp_ns: int = None):
         results = {}
+        if timestamp_ns is None:
+            timestamp_ns = time.time_ns()
+        timestamp = timestamp_ns // 1000
 
         for sample in self.measurements["samples"]:
-            timestamp = int(time.time_ns() // 1000)
             results[sample.name] = self._query_samples(self.device_handle, sample.value, self.latest_timestamp[sample.name])
 
             # Only remember valid timestamps
@@ -333,12 +442,10 @@ class NvidiaML(DeviceSource):
                 results[sample.name] = (timestamp, results[sample.name])
         
         fields = self.measurements["fields"]
-        timestamp = int(time.time_ns() // 1000)
         results |= { key: (timestamp, value)
                      for key, value in self._query_fields(self.device_handle, fields).items()}
 
         for query in self.measurements["queries"]:
-            timestamp = int(time.time_ns() // 1000)
             results[query.name] = (timestamp, self._query_device(self.device_handle, query))
             
         return results
@@ -423,20 +530,21 @@ class NvidiaML(DeviceSource):
             and len(self.measurements["samples"]) == 0:
             raise RuntimeError("[ERROR] No measurements are are set to be collected, please call set_measurements()")
         
+        if self.log_format != "json":
+            return self.__stream_log()
+
         log_data = {data_type.name: [] 
                     for measure in self.measurements.values() 
                     for data_type in measure}
         
-        while not self.stop_thread.is_set():
-            for res_type, value in self.measure().items():
+        # Ensure measurement frequency
+        for monotonic_ns in self.sampling_schedule():
+            for res_type, value in self.measure(self.scheduler.wall_clock_ns(monotonic_ns)).items():
                 # Combine all results into the log
                 if isinstance(value, list):
                     log_data[res_type].extend(value)
                 else:
                     log_data[res_type].append(value)
-
-            # Ensure measurement frequency
-            time.sleep(self.sample_frequency/1000)
         
         # Convert errors to strings
         for category, values in log_data.items():
@@ -453,20 +561,113 @@ class NvidiaML(DeviceSource):
         nvml.nvmlShutdown()
         return 0
 
+    def __stream_log(self):
+        if not self.logfile:
+            raise RuntimeError(f"A logfile is required to log in the {self.log_format} format")
+
+        writer = NVML_LogWriter(self.logfile, self.log_format, self.batch_size)
+        try:
+            for monotonic_ns in self.sampling_schedule():
+                for res_type, value in self.measure(self.scheduler.wall_clock_ns(monotonic_ns)).items():
+                    for timestamp, measurement in (value if isinstance(value, list) else [value]):
+                        writer.write(res_type, timestamp, measurement)
+        finally:
+            writer.close()
+
+        # The measurements are in the logfile only, use parse_log() to read them
+        self.thread_queue.put(Path(self.logfile))
+        self.thread_queue.join()
+        self.thread_handle = None
+        nvml.nvmlShutdown()
+        return 0
+
     @staticmethod
-    def parse_log(logfile, remove_errors=False):
+    def parse_log(logfile, remove_errors=False, as_dict=False):
+        """Read a log in any of the NVML_LOG_FORMATS. Returns a TimeSeries per metric, as every metric has
+        timestamps of its own, with "value" and "error" (the nvml error code, 0 on success) columns.
+        Measurements of dicts are split into a metric per key (see nvml_flatten()).
+
+        With `as_dict`, every metric is a list of (timestamp, value) tuples instead, in which errors are strings.
+        The timestamps are then in us since the epoch, as in the log, instead of seconds."""
+        with open(logfile, "rb") as f:
+            magic = f.read(len(NVML_BINARY_MAGIC))
+            f.seek(0)
+            first_line = f.readline()
+
+        if magic == NVML_BINARY_MAGIC:
+            log_data = NvidiaML.__parse_binary(logfile)
+        elif first_line.strip() and {"metric", "timestamp", "value"} <= json.loads(first_line).keys():
+            log_data = NvidiaML.__parse_ndjson(logfile)
+        else:
+            log_data = NvidiaML.__parse_json(logfile)
+
+        if remove_errors:
+            log_data = {metric: samples[samples["error"] == 0] for metric, samples in log_data.items()}
+
+        if as_dict:
+            return {metric: [(int(sample["timestamp"]), float(sample["value"]) if sample["error"] == 0
+                              else nvml.NVMLError._errcode_to_string.get(int(sample["error"]), str(sample["error"])))
+                             for sample in samples]
+                    for metric, samples in log_data.items()}
+
+        return {metric: TimeSeries({"value": samples["value"], "error": samples["error"]},
+                                   samples["timestamp"] * NVML_TIMESTAMP_UNIT)
+                for metric, samples in log_data.items()}
+
+    @staticmethod
+    def __parse_binary(logfile):
+        with open(NVML_LogWriter.metrics_file(logfile), "r") as f:
+            metrics = json.load(f)
+
+        # A log that was not closed can end in a partially written record
+        count = (Path(logfile).stat().st_size - len(NVML_BINARY_MAGIC)) // NVML_RECORD.itemsize
+        if count == 0:
+            return {metric: np.empty(0, dtype=NVML_SAMPLE) for metric in metrics}
+        records = np.memmap(logfile, dtype=NVML_RECORD, mode="r", offset=len(NVML_BINARY_MAGIC), shape=(count,))
+
+        # Group the records by metric, keeping them in the order they were measured
+        order = np.argsort(records["metric"], kind="stable")
+        ids, starts = np.unique(records["metric"][order], return_index=True)
+        log_data = {metric: np.empty(0, dtype=NVML_SAMPLE) for metric in metrics}
+        for metric_id, indices in zip(ids, np.split(order, starts[1:])):
+            samples = np.empty(len(indices), dtype=NVML_SAMPLE)
+            for field in NVML_SAMPLE.names:
+                samples[field] = records[field][indices]
+            log_data[metrics[metric_id]] = samples
+
+        return log_data
+
+    @staticmethod
+    def __parse_ndjson(logfile):
+        columns = {}
+        with open(logfile, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                value = record["value"]
+                columns.setdefault(record["metric"], []).append(
+                    (record["timestamp"], np.nan if value is None else value, record.get("error", 0)))
+
+        return {metric: np.array(samples, dtype=NVML_SAMPLE) for metric, samples in columns.items()}
+
+    @staticmethod
+    def __parse_json(logfile):
         with open(logfile, "r") as f:
             log_data = json.load(f)
-        
-        # Convery sub arrays back to tuples
-        for category, values in log_data.items():
-            log_data[category] = list(map(lambda x: (x[0], x[1]), values))
 
-            if not remove_errors:
-                continue
-            
-            error_strings = list(nvml.NVMLError._errcode_to_string.values())
-            log_data[category] = list(filter(lambda x: x[1] not in error_strings, log_data[category]))
+        # Errors were written as their strings
+        error_codes = {string: code for code, string in nvml.NVMLError._errcode_to_string.items()}
+        columns = {}
+        for category, values in log_data.items():
+            if len(values) == 0:
+                columns[category] = []
+            for timestamp, value in values:
+                if isinstance(value, str) and value in error_codes:
+                    columns.setdefault(category, []).append((timestamp, np.nan, error_codes[value]))
+                    continue
 
-        return log_data
+                for metric, metric_value, error in nvml_flatten(category, value):
+                    columns.setdefault(metric, []).append((timestamp, metric_value, error))
 
+        return {metric: np.array(samples, dtype=NVML_SAMPLE) for metric, samples in columns.items()}
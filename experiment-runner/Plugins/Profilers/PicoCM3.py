@@ -5,6 +5,7 @@ import time
 import enum
 from collections.abc import Callable
 
+from Plugins.Profilers.DataSource import SamplingScheduler
 from Plugins.Profilers.picosdk.plcm3 import plcm3
 from Plugins.Profilers.picosdk.functions import assert_pico_ok
 from Plugins.Profilers.picosdk.constants import PICO_STATUS
@@ -31,6 +32,7 @@ class PicoCM3(object):
     def __init__(self, sample_frequency: int = None, mains_setting: int = None, channel_settings: dict[int, int] = None):
         # Some default settings
         self.handle = None
+        self.missed_samples      = 0                                                        # Of the last log()
         self.sample_frequency    = sample_frequency if sample_frequency != None else 1000   # In ms
         self.mains_setting       = mains_setting if mains_setting != None else 0            # 50 Hz
         self.channel_settings    = channel_settings if channel_settings != None else {      # Which channels are enabled in what mode
@@ -89,8 +91,12 @@ class PicoCM3(object):
         timeout_start = time.time()       
         finished_checker = finished_fn if finished_fn != None else lambda: time.time() < timeout_start + timeout
         
-        # Ensure the PicoLog always gets closed
-        while finished_checker():
+        # Ensure measurement frequency
+        scheduler = SamplingScheduler(self.sample_frequency)
+        for timestamp_ns in scheduler:
+            if not finished_checker():
+                break
+
             channel_data = {}
             # Poll every channel for data
             for ch in range(plcm3.PLCM3Channels["PLCM3_MAX_CHANNELS"]):  
@@ -103,17 +109,18 @@ class PicoCM3(object):
                 else:
                     assert_pico_ok(status)
                     channel_data[ch+1] = self.apply_scaling(data_handle.value, self.channel_settings[ch+1])
-            log_data[datetime.datetime.now().isoformat(" ", "seconds")] = [channel_data[1], channel_data[2], channel_data[3]]
+            # Keyed by the wall clock time in ns, as several samples can be taken within a second
+            log_data[scheduler.wall_clock_ns(timestamp_ns)] = [channel_data[1], channel_data[2], channel_data[3]]
 
-            # Ensure measurement frequency
-            time.sleep(self.sample_frequency/1000)
+        self.missed_samples = scheduler.missed
 
         # Write all of the data to a log file (if requested)
         if self.logfile:
             with open(self.logfile,'w') as f:
                 for t_stamp, data in log_data.items():
-                    f.write('%s,%.2f %s,%.2f %s,%.2f %s\n' % \
-                            (t_stamp, data[0][0], data[0][1], data[1][0], data[1][1], data[2][0], data[2][1]))
+                    f.write('%s,%.2f %s,%.2f %s,%.2f %s,%d\n' % \
+                            (datetime.datetime.fromtimestamp(t_stamp / 1e9).isoformat(" ", "seconds"),
+                             data[0][0], data[0][1], data[1][0], data[1][1], data[2][0], data[2][1], t_stamp))
         return log_data
     
     def close_device(self):
@@ -175,7 +182,7 @@ class PicoCM3(object):
     
     @staticmethod
     def parse_log(logfile):
-        log_data = {k: [] for k in ['timestamp', 'channel_1', 'channel_2', 'channel_3']}
+        log_data = {k: [] for k in ['timestamp', 'channel_1', 'channel_2', 'channel_3', 'timestamp_ns']}
 
         with open(logfile) as f:
             lines = f.readlines()
@@ -185,6 +192,9 @@ class PicoCM3(object):
                 log_data['channel_1'].append(float(channel_vals[1].split(" ")[0]))
                 log_data['channel_2'].append(float(channel_vals[2].split(" ")[0]))
                 log_data['channel_3'].append(float(channel_vals[3].split(" ")[0]))
+                # Logs written before nanosecond timestamps were recorded only have the timestamp in seconds
+                if len(channel_vals) > 4:
+                    log_data['timestamp_ns'].append(int(channel_vals[4]))
 
         return log_data
 
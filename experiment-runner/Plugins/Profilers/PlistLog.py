@@ -0,0 +1,60 @@
+from __future__ import annotations
+from functools import partial
+from itertools import islice
+from multiprocessing import Pool
+from pathlib import Path
+import mmap
+import plistlib
+
+PLIST_END = b"</plist>"
+
+def decode_plist(data: bytes, keys: list[str] | None = None):
+    """Decode a single plist, keeping only `keys` of its dicts (of the list of dicts it holds, for powerletrics)"""
+    plist = plistlib.loads(data)
+    if keys is None:
+        return plist
+    if isinstance(plist, list):
+        return [{key: item[key] for key in keys if key in item} if isinstance(item, dict) else item for item in plist]
+    return {key: plist[key] for key in keys if key in plist}
+
+class PlistLog:
+    """The samples of a log of concatenated plists, as powermetrics and powerletrics write them (separated by
+    null bytes, possibly after lines of other output). Iterating reads the log from a memory map and decodes
+    the samples lazily, one at a time, so the log does not have to fit in memory.
+
+    `keys` only keeps these keys of every sample. With `processes`, the samples are decoded by a pool of
+    that many processes, `batch_size` samples at a time, and still yielded in order."""
+    def __init__(self, logfile: Path, keys: list[str] | None = None, processes: int | None = None, batch_size: int = 256):
+        self.logfile = logfile
+        self.keys = keys
+        self.processes = processes
+        self.batch_size = batch_size
+
+    def __iter__(self):
+        decode = partial(decode_plist, keys=self.keys)
+        if not self.processes or self.processes <= 1:
+            for data in self.raw_samples():
+                yield decode(data)
+            return
+
+        raw_samples = self.raw_samples()
+        with Pool(self.processes) as pool:
+            # In batches, as the pool would read all samples into its task queue at once otherwise
+            while batch := list(islice(raw_samples, self.batch_size)):
+                yield from pool.imap(decode, batch, chunksize=max(len(batch) // (4 * self.processes), 1))
+
+    def raw_samples(self):
+        """The bytes of every complete plist in the log, a plist that is still being written is left out"""
+        with open(self.logfile, "rb") as f:
+            if f.seek(0, 2) == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as log:
+                start = 0
+                while (end := log.find(PLIST_END, start)) != -1:
+                    end += len(PLIST_END)
+                    data = log[start:end]
+                    start = end
+
+                    # Skip the null bytes, newlines and other output before the plist
+                    begin = data.find(b"<?xml")
+                    yield data[begin if begin != -1 else data.find(b"<plist"):]
@@ -1,7 +1,9 @@
 from __future__ import annotations
+from datetime import datetime
 from pathlib import Path
 import pandas as pd
 from Plugins.Profilers.DataSource import CLISource, ParameterDict, ValueRef
+from Plugins.Profilers.TimeSeries import TimeSeries
 
 # Supported Paramters for the PowerJoular metrics plugin
 POWERJOULAR_PARAMETERS = {
@@ -47,6 +49,18 @@ class PowerJoular(CLISource):
         return None
 
     @staticmethod
-    def parse_log(logfile: Path):
+    def parse_log(logfile: Path, as_dict: bool = False):
         # Things are already in csv format here, no checks needed
-        return pd.read_csv(logfile).to_dict()
+        df = pd.read_csv(logfile)
+        if as_dict:
+            return df.to_dict()
+
+        # The Date column holds the local time of every sample, to the second
+        timestamps = None
+        if "Date" in df.columns:
+            dates = pd.to_datetime(df["Date"], errors="coerce")
+            if not dates.isna().any():
+                dates = dates.dt.tz_localize(datetime.now().astimezone().tzinfo)
+                timestamps = ((dates - pd.Timestamp("1970-01-01", tz="UTC")) / pd.Timedelta(seconds=1)).to_numpy()
+
+        return TimeSeries.from_dataframe(df, timestamps)
@@ -1,8 +1,8 @@
-import plistlib
 from pathlib import Path
 from enum import StrEnum
 import weakref
 from Plugins.Profilers.DataSource import CLISource, ParameterDict, ValueRef
+from Plugins.Profilers.PlistLog import PlistLog
 
 # How to format the output
 class PLFormatTypes(StrEnum):
@@ -69,20 +69,13 @@ class PowerLetrics(CLISource):
         self.update_parameters(add=additional_args)
 
     @staticmethod
-    def parse_log(logfile: Path):
-        plists = []
-        cur_plist = bytearray()
-        with open(logfile, "rb") as fp:
-            # Skip the first lines, they dont contain plist output
-            for l in fp.readlines()[2:]:
-                # Powermetrics outputs plists with null bytes inbetween. We account for this
-                if l[0] == 0:
-                    cur_plist.extend(l[1:])
-                else:
-                    cur_plist.extend(l)
+    def iter_log(logfile: Path, keys: list[str] | None = None, processes: int | None = None) -> PlistLog:
+        """Lazily parses the log, see parse_log, decoding one sample at a time while iterating"""
+        return PlistLog(logfile, keys, processes)
 
-                if b"</plist>\n" in l:
-                    plists.append(plistlib.loads(cur_plist))
-                    cur_plist = bytearray()
-
-        return plists
+    @staticmethod
+    def parse_log(logfile: Path, keys: list[str] | None = None, processes: int | None = None):
+        """The samples of the log, each a list of dicts with the stats of a process. `keys` only keeps
+        these stats of the processes, `processes` decodes the samples in a pool of this many processes."""
+        # The lines of other output before the plists are skipped
+        return list(PowerLetrics.iter_log(logfile, keys, processes))
@@ -1,9 +1,10 @@
 from __future__ import annotations
 from enum import StrEnum
+from collections.abc import Iterable
 from pathlib import Path
-import plistlib
 
 from Plugins.Profilers.DataSource import ParameterDict, CLISource, ValueRef
+from Plugins.Profilers.PlistLog import PlistLog
 
 # How to format the output
 class PMFormatTypes(StrEnum):
@@ -99,14 +100,14 @@ class PowerMetrics(CLISource):
         self.update_parameters(add=additional_args)
     
     @staticmethod
-    def parse_plist_power(pm_plists: list[dict]):
+    def parse_plist_power(pm_plists: Iterable[dict]):
         """
         Extracts from a list of plists, the relavent power statistics if present. If no 
         power stats are present, this returns an empty list. This is mainly a helper method, 
         to make the plists easier to work with.
 
         Parameters:
-            pm_plists (list[dict]): The list of plists created by parse_pm_plist
+            pm_plists (Iterable[dict]): The plists created by parse_log or iter_log
 
         Returns:
             A list of dicts, each containing a subset of the available stats related to power.
@@ -116,14 +117,11 @@ class PowerMetrics(CLISource):
         for plist in pm_plists:
             stats = {}
             if "GPU" in plist.keys():
-                stats["GPU"] = plist["GPU"].copy()
-                for gpu in range(len(stats["GPU"])):
-                    del stats["GPU"][gpu]["misc_counters"]
-                    del stats["GPU"][gpu]["p_states"]
+                stats["GPU"] = [{k: v for k, v in gpu.items() if k not in ["misc_counters", "p_states"]}
+                                for gpu in plist["GPU"]]
 
             if "processor" in plist.keys():
-                stats["processor"] = plist["processor"]
-                del stats["processor"]["packages"]
+                stats["processor"] = {k: v for k, v in plist["processor"].items() if k != "packages"}
 
             if "agpm_stats" in plist.keys():
                 stats["agpm_stats"] = plist["agpm_stats"]
@@ -134,32 +132,36 @@ class PowerMetrics(CLISource):
             power_plists.append(stats)
         
         return power_plists
+
+    @staticmethod
+    def iter_log(logfile: Path, keys: list[str] | None = None, processes: int | None = None) -> PlistLog:
+        """
+        Lazily parses a provided logfile from powermetrics in plist format, see parse_log. The samples
+        are decoded one at a time while iterating, from a memory map of the logfile.
+
+        Parameters:
+            logfile (Path): The path to the plist logfile created by powermetrics
+            keys (list[str]): Only keep these keys of every sample, e.g. ["processor", "timestamp"]
+            processes (int): Decode the samples in a pool of this many processes
+
+        Returns:
+            An iterable of dicts, each representing the plist for a given sample
+        """
+        return PlistLog(logfile, keys, processes)
     
     @staticmethod
-    def parse_log(logfile: Path):
+    def parse_log(logfile: Path, keys: list[str] | None = None, processes: int | None = None):
         """
         Parses a provided logfile from powermetrics in plist format. Powermetrics outputs a plist
-        for every sample taken, it included a newline after the closing <\plist>, we account for that here
+        for every sample taken, separated by null bytes, we account for that here
         to make things easier to parse.
         
         Parameters:
             logfile (Path): The path to the plist logfile created by powermetrics
+            keys (list[str]): Only keep these keys of every sample, e.g. ["processor", "timestamp"]
+            processes (int): Decode the samples in a pool of this many processes
 
         Returns:
             A list of dicts, each representing the plist for a given sample
         """
-        plists = []
-        cur_plist = bytearray()
-        with open(logfile, "rb") as fp:
-            for l in fp.readlines():
-                # Powermetrics outputs plists with null bytes inbetween. We account for this
-                if l[0] == 0:
-                    cur_plist.extend(l[1:])
-                else:
-                    cur_plist.extend(l)
-
-                if b"</plist>\n" in l:
-                    plists.append(plistlib.loads(cur_plist))
-                    cur_plist = bytearray()
-
-        return plists
+        return list(PowerMetrics.iter_log(logfile, keys, processes))
@@ -0,0 +1,282 @@
+from __future__ import annotations
+from pathlib import Path
+import errno
+import os
+import time
+
+from Plugins.Profilers.DataSource import DeviceSource
+from Plugins.Profilers.Ps import Ps
+
+# The columns ProcFS can write, named like the ps format specifiers they correspond to
+PROCFS_COLUMNS = {
+    "pid":          "process id of the target",
+    "ppid":         "parent process id of the target",
+    "%cpu":         "cpu utilization over the sampling interval, 100 per fully used core",
+    "%mem":         "resident set size, as a percentage of the physical memory",
+    "rss":          "resident set size (KiB)",
+    "vsz":          "virtual memory size (KiB)",
+    "nlwp":         "number of threads",
+    "nproc":        "number of processes sampled (the target and its descendants)",
+    "rchar":        "bytes read (also from the page cache), from /proc/<pid>/io",
+    "wchar":        "bytes written (also to the page cache), from /proc/<pid>/io",
+    "read_bytes":   "bytes read from storage, from /proc/<pid>/io",
+    "write_bytes":  "bytes written to storage, from /proc/<pid>/io",
+}
+
+class _ProcFiles:
+    """The open /proc files of a process, read with pread() so every sample reuses the same file descriptors"""
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.stat = os.open(f"/proc/{pid}/stat", os.O_RDONLY)
+        self.statm = os.open(f"/proc/{pid}/statm", os.O_RDONLY)
+        try:
+            self.io = os.open(f"/proc/{pid}/io", os.O_RDONLY)
+        except OSError:
+            self.io = None
+        try:
+            self.children = os.open(f"/proc/{pid}/task/{pid}/children", os.O_RDONLY)
+        except OSError:
+            self.children = None  # Kernel without CONFIG_PROC_CHILDREN
+
+    @staticmethod
+    def read(fd: int, size: int = 4096) -> str:
+        return os.pread(fd, size, 0).decode()
+
+    def close(self):
+        for fd in [self.stat, self.statm, self.io, self.children]:
+            if fd is not None:
+                os.close(fd)
+
+class ProcFS(DeviceSource):
+    source_name = "procfs"
+    supported_platforms = ["Linux"]
+
+    """Samples the cpu, memory and io usage of processes from /proc, without starting any process itself.
+    Writes the same csv as the Ps plugin (no header, one line per target and sample, `out_format` columns),
+    so it can be parsed with `parse_log()` in the same way."""
+    def __init__(self,
+                 sample_frequency:      int                 = 100,
+                 out_file:              Path                = "ps.csv",
+                 target_pid:            list[int]           = None,
+                 out_format:            list[str]           = ["%cpu", "%mem"],
+                 follow_children:       bool                = True):
+        super().__init__()
+        self._validate_platform()
+
+        for column in out_format:
+            if column not in PROCFS_COLUMNS:
+                raise RuntimeError(f"Unexpected column: {column}, expected one of {list(PROCFS_COLUMNS.keys())}")
+
+        # sample_frequency: the time between samples in ms
+        self.sample_frequency = sample_frequency
+        self.logfile = out_file
+        self.target_pid = target_pid if target_pid else [os.getpid()]
+        self.out_format = out_format
+        # Whether the usage of the descendants of a target (e.g. a shell and the programs it runs) is added to it
+        self.follow_children = follow_children
+
+        self.__files: dict[int, _ProcFiles] = {}
+        self.__clock_ticks = os.sysconf("SC_CLK_TCK")
+        self.__page_size_kib = os.sysconf("SC_PAGE_SIZE") // 1024
+        self.__mem_total_kib = None
+        self.__previous: dict[int, tuple[int, int]] = {}  # target -> (time.monotonic_ns(), cpu clock ticks)
+        self.__sampled: set[int] = set()                  # The processes of the current sample
+
+    def list_devices(self):
+        """The processes sampled for every target: the target and, with `follow_children`, its descendants"""
+        return {target: [pid for pid, _ in self.__process_tree(target)] for target in self.target_pid}
+
+    def open_device(self):
+        with open("/proc/meminfo", "r") as f:
+            self.__mem_total_kib = next(int(line.split()[1]) for line in f if line.startswith("MemTotal:"))
+
+        for target in self.target_pid:
+            self.__open(target)
+            if target not in self.__files:
+                raise RuntimeError(f"Process {target} does not exist")
+        self.device_handle = self.target_pid
+
+        # Baseline of the cpu time, so the first sample covers the first sampling interval
+        for target in self.target_pid:
+            self.__previous[target] = (time.monotonic_ns(), self.__sample(target)["cpu_ticks"])
+
+    def close_device(self):
+        for files in self.__files.values():
+            files.close()
+        self.__files = {}
+        self.device_handle = None
+
+    def set_mode(self):
+        pass
+
+    def start(self):
+        self.open_device()
+        super().start()
+
+    def stop(self):
+        ret = super().stop()
+        self.close_device()
+        return ret
+
+    def measure(self) -> list[list]:
+        """A row of `out_format` values for every target"""
+        rows = []
+        self.__sampled = set()
+        for target in self.target_pid:
+            sample = self.__sample(target)
+            now = time.monotonic_ns()
+            previous_ns, previous_ticks = self.__previous.get(target, (now, sample["cpu_ticks"]))
+            self.__previous[target] = (now, sample["cpu_ticks"])
+
+            elapsed_s = (now - previous_ns) / 1e9
+            # Descendants leaving the tree without being waited for by it take their cpu time with them
+            cpu_s = max(sample["cpu_ticks"] - previous_ticks, 0) / self.__clock_ticks
+            sample["%cpu"] = round(100 * cpu_s / elapsed_s, 1) if elapsed_s > 0 else 0.0
+            sample["%mem"] = round(100 * sample["rss"] / self.__mem_total_kib, 1)
+            rows.append([sample.get(column, "") for column in self.out_format])
+
+        # Processes that left the trees (e.g. reparented after their parent exited) are not followed any longer
+        for pid in set(self.__files.keys()) - self.__sampled:
+            self.__files.pop(pid).close()
+        return rows
+
+    def log(self):
+        super().log()
+
+        rows = []
+        logfile = open(self.logfile, "a") if self.logfile is not None else None
+        try:
+            # The first sample covers the interval after the baseline of open_device()
+            for _ in self.sampling_schedule(immediate=False):
+                sample_rows = self.measure()
+                rows.extend(sample_rows)
+                if logfile is not None:
+                    logfile.writelines(",".join(map(str, row)) + "\n" for row in sample_rows)
+        finally:
+            if logfile is not None:
+                logfile.close()
+
+        self.thread_queue.put(rows)
+        self.thread_queue.join()
+        return 0
+
+    @staticmethod
+    def parse_log(logfile: Path, column_names: list[str], as_dict: bool = False):
+        return Ps.parse_log(logfile, column_names, as_dict)
+
+    def __open(self, pid: int):
+        if pid in self.__files:
+            return
+        try:
+            self.__files[pid] = _ProcFiles(pid)
+        except (FileNotFoundError, ProcessLookupError):
+            pass  # Exited in the meantime
+
+    def __read(self, pid: int, fd_name: str, size: int = 4096) -> str | None:
+        """Read one of the /proc files of the process, None once it exited"""
+        files = self.__files.get(pid)
+        try:
+            fd = getattr(files, fd_name) if files is not None else None
+            return _ProcFiles.read(fd, size) if fd is not None else None
+        except PermissionError:
+            if fd_name != "io":
+                raise
+            # /proc/<pid>/io is only readable for processes of the same user (or as root)
+            os.close(files.io)
+            files.io = None
+            return None
+        except OSError as e:
+            if e.errno not in (errno.ESRCH, errno.ENOENT):
+                raise
+            self.__files.pop(pid).close()
+            return None
+
+    def __children(self, pid: int, nlwp: int) -> list[int]:
+        files = self.__files.get(pid)
+        if files is None:
+            return []
+        if files.children is None:
+            return self.__children_by_scan(pid)
+        if nlwp == 1:
+            children = self.__read(pid, "children", 65536)
+            return list(map(int, children.split())) if children else []
+
+        # Every thread has its own children
+        children = []
+        try:
+            for tid in os.listdir(f"/proc/{pid}/task"):
+                try:
+                    with open(f"/proc/{pid}/task/{tid}/children", "r") as f:
+                        children.extend(map(int, f.read().split()))
+                except (FileNotFoundError, ProcessLookupError):
+                    pass
+        except (FileNotFoundError, ProcessLookupError):
+            pass
+        return children
+
+    @staticmethod
+    def __children_by_scan(pid: int) -> list[int]:
+        children = []
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat", "r") as f:
+                    stat = f.read()
+            except (FileNotFoundError, ProcessLookupError):
+                continue
+            if int(stat[stat.rindex(")") + 2:].split()[1]) == pid:
+                children.append(int(entry))
+        return children
+
+    def __process_tree(self, target: int):
+        """The processes of the target's tree, with the fields of their /proc/<pid>/stat after the command name
+        (which can contain spaces and parentheses)"""
+        self.__open(target)
+        tree, i = [target], 0
+        while i < len(tree):
+            pid = tree[i]
+            i += 1
+            stat = self.__read(pid, "stat")
+            if stat is None:
+                continue
+            fields = stat[stat.rindex(")") + 2:].split()
+            self.__sampled.add(pid)
+            yield pid, fields
+
+            if self.follow_children:
+                for child in self.__children(pid, int(fields[17])):
+                    if child not in tree:
+                        self.__open(child)
+                        tree.append(child)
+
+    def __sample(self, target: int) -> dict:
+        """The usage of the target, summed over its process tree"""
+        sample = {"pid": target, "ppid": "", "cpu_ticks": 0, "rss": 0, "vsz": 0, "nlwp": 0, "nproc": 0}
+        io_columns = ["rchar", "wchar", "read_bytes", "write_bytes"]
+
+        for pid, fields in self.__process_tree(target):
+            statm = self.__read(pid, "statm")
+            if statm is None:
+                continue
+
+            if pid == target:
+                sample["ppid"] = int(fields[1])
+            utime, stime, cutime, cstime = map(int, fields[11:15])
+            # cutime and cstime hold the cpu time of waited for children, so exited descendants are included as well
+            sample["cpu_ticks"] += utime + stime + (cutime + cstime if self.follow_children else 0)
+            sample["nlwp"] += int(fields[17])
+            sample["nproc"] += 1
+
+            size, resident = map(int, statm.split()[:2])
+            sample["vsz"] += size * self.__page_size_kib
+            sample["rss"] += resident * self.__page_size_kib
+
+            io = self.__read(pid, "io")
+            if io is not None:
+                for line in io.splitlines():
+                    key, value = line.split(":")
+                    if key in io_columns:
+                        sample[key] = sample.get(key, 0) + int(value)
+
+        return sample
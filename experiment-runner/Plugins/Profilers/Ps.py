@@ -2,6 +2,7 @@ from __future__ import annotations
 from pathlib import Path
 import pandas as pd
 from Plugins.Profilers.DataSource import CLISource, ParameterDict
+from Plugins.Profilers.TimeSeries import TimeSeries
 
 PS_PARAMTERS = {
         ("-A", "-e"): None,
@@ -70,7 +71,8 @@ class Ps(CLISource):
     source_name = "ps"
     supported_platforms = ["Linux"]
 
-    """An integration of the Linux ps utility into experiment-runner as a data source plugin"""
+    """An integration of the Linux ps utility into experiment-runner as a data source plugin.
+    Every sample starts ps, awk and tr: see the ProcFS plugin for sampling /proc directly, with less overhead"""
     def __init__(self,
                  sleep_interval:        int                 = 1,
                  out_file:              Path                = "ps.csv",
@@ -108,14 +110,15 @@ class Ps(CLISource):
         # This wraps the ps utility so that it runs continously and also outputs into a csv like format
         return f'''sh -c "while true; do {cmd} | awk '{{$1=$1}};1' | tr ' ' ','{output_cmd}; sleep {self.sleep_interval}; done"'''
 
-    # The csv saved by default has no header, this must be provided by the user
+    # The csv saved by default has no header, this must be provided by the user.
+    # The log has no timestamps, so neither does the TimeSeries (as_dict returns the columns as {column: {row: value}})
     @staticmethod
-    def parse_log(logfile: Path, column_names: list[str]):
+    def parse_log(logfile: Path, column_names: list[str], as_dict: bool = False):
         # Ps has many options, we dont check them all. converting to csv might fail in some cases
         try:
             df = pd.read_csv(logfile, names=column_names)
         except Exception as e:
             print(f"Could not parse ps ouput csv: {e}")
 
-        return df.to_dict()
+        return df.to_dict() if as_dict else TimeSeries.from_dataframe(df)
 
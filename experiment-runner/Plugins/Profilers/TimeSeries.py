@@ -0,0 +1,98 @@
+from __future__ import annotations
+from pathlib import Path
+import json
+
+import numpy as np
+import pandas as pd
+
+class TimeSeries:
+    """The measurements of a profiler log, as contiguous NumPy arrays: a column per metric, sharing the timestamps
+    of the samples (wall clock time in seconds, None for logs without timestamps).
+
+    Like a DataFrame, indexing, iterating and `items()` work on the columns, while `len()` is the number of samples.
+    A column is an ndarray, not the {row: value} dict `parse_log()` used to return, so code calling e.g.
+    `results[column].values()` has to be changed, or pass `as_dict=True` to `parse_log()` for the dicts."""
+    def __init__(self, columns: dict[str, np.ndarray], timestamps: np.ndarray | None = None):
+        self.columns = {name: np.ascontiguousarray(values) for name, values in columns.items()}
+        self.timestamps = np.ascontiguousarray(timestamps, dtype=np.float64) if timestamps is not None else None
+
+        lengths = {len(values) for values in self.columns.values()}
+        if self.timestamps is not None:
+            lengths.add(len(self.timestamps))
+        if len(lengths) > 1:
+            raise RuntimeError(f"The columns and timestamps of a TimeSeries must have the same length, got {lengths}")
+
+    @staticmethod
+    def from_dataframe(df: pd.DataFrame, timestamps: np.ndarray | None = None) -> TimeSeries:
+        return TimeSeries({str(column): df[column].to_numpy() for column in df.columns}, timestamps)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    def __contains__(self, column: str) -> bool:
+        return column in self.columns
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __len__(self) -> int:
+        if self.timestamps is not None:
+            return len(self.timestamps)
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __repr__(self) -> str:
+        return f"TimeSeries({len(self)} samples, columns={list(self.columns.keys())})"
+
+    def keys(self):
+        return self.columns.keys()
+
+    def values(self):
+        return self.columns.values()
+
+    def items(self):
+        return self.columns.items()
+
+    def to_dict(self) -> dict[str, dict[int, object]]:
+        """The columns as {column: {index: value}}, like DataFrame.to_dict()"""
+        return {name: dict(enumerate(values.tolist())) for name, values in self.columns.items()}
+
+    def mean(self, column: str) -> float:
+        """The mean of a column, ignoring missing (nan) values"""
+        return float(np.nanmean(self.columns[column])) if len(self) else np.nan
+
+    def percentile(self, column: str, q: float | list[float]) -> float | np.ndarray:
+        """The q-th percentile(s) (0-100) of a column, ignoring missing (nan) values"""
+        return np.nanpercentile(self.columns[column], q)
+
+    def integrate(self, column: str) -> float:
+        """The integral of a column over time with the trapezoidal rule, e.g. the energy (J) of a power column (W)"""
+        if self.timestamps is None:
+            raise RuntimeError("This TimeSeries has no timestamps to integrate over")
+        values = self.columns[column].astype(np.float64)
+        return float(np.sum((values[1:] + values[:-1]) * np.diff(self.timestamps)) / 2)
+
+    def window(self, start: float, end: float) -> TimeSeries:
+        """The samples with start <= timestamp < end (wall clock time in seconds)"""
+        if self.timestamps is None:
+            raise RuntimeError("This TimeSeries has no timestamps to select a window of")
+        selected = (self.timestamps >= start) & (self.timestamps < end)
+        return TimeSeries({name: values[selected] for name, values in self.columns.items()},
+                          self.timestamps[selected])
+
+    def phase(self, timeline: Path | dict, name: str) -> TimeSeries:
+        """The samples during a phase of the run (e.g. "interact"), from the `timeline.json` the run wrote
+        (`record_phase_timings`), as a path or as loaded dict. A phase that occurs more than once covers
+        the start of the first to the end of the last time."""
+        if not isinstance(timeline, dict):
+            with open(timeline, "r") as f:
+                timeline = json.load(f)
+        if "wall_clock_offset_ns" not in timeline:
+            raise RuntimeError("The timeline does not relate its phases to the wall clock, it was written by an older version")
+
+        phases = [phase for phase in timeline["phases"] if phase["name"] == name]
+        if not phases:
+            raise RuntimeError(f"The run has no phase {name}")
+
+        offset_ns = timeline["wall_clock_offset_ns"]
+        return self.window((min(phase["start_ns"] for phase in phases) + offset_ns) / 1e9,
+                           (max(phase["end_ns"] for phase in phases) + offset_ns) / 1e9)
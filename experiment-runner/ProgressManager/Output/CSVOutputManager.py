@@ -1,10 +1,12 @@
 from ProgressManager.RunTable.Models.RunProgress import RunProgress
 from ConfigValidator.CustomErrors.ExperimentOutputErrors import ExperimentOutputFileDoesNotExistError
 from ProgressManager.Output.OutputProcedure import OutputProcedure as output
-from ProgressManager.Output.BaseOutputManager import BaseOutputManager
+from ProgressManager.Output.RunTableOutputManager import RunTableOutputManager
 
+from contextlib import contextmanager
 from tempfile import NamedTemporaryFile
-import shutil
+import fcntl
+import json
 import csv
 import os
 import pwd
@@ -12,72 +14,204 @@ import getpass
 from typing import Dict, List
 
 
-class CSVOutputManager(BaseOutputManager):
+class CSVOutputManager(RunTableOutputManager):
+    """Keeps the run table in `run_table.csv`.
+
+    Finished runs are not written to the CSV directly. Every row update is appended (and fsync'd) to
+    `run_table.journal`, one JSON object per line, which keeps the cost of an update independent of the
+    size of the run table. The CSV is rebuilt from the journal on `checkpoint()`, and `read_run_table()`
+    replays any journal entries that were not yet checkpointed (e.g. after a crash).
+
+    Writers hold a shared lock on `run_table.journal.lock` while they append, `checkpoint()` an exclusive one while
+    it moves the journal aside, so that no entry is written into a journal that is being checkpointed."""
+
+    run_table_file = 'run_table.csv'
+    journal_file = 'run_table.journal'
+    checkpoint_journal_file = 'run_table.journal.checkpoint'
+    journal_lock_file = 'run_table.journal.lock'
+
     def read_run_table(self) -> List[Dict]:
         read_run_table = []
         try:
-            with open(self._experiment_path / 'run_table.csv', 'r') as csvfile:
+            with open(self._experiment_path / self.run_table_file, 'r') as csvfile:
                 reader = csv.DictReader(csvfile)
                 for row in reader:
-                    # if value was integer, stored as string by CSV writer, then convert back to integer.
-                    for key, value in row.items():
-                        if value.isnumeric():
-                            row[key] = int(value)
-
-                        if key == '__done':
-                            row[key] = RunProgress[value]
-
                     read_run_table.append(row)
-            
-            return read_run_table
         except:
             raise ExperimentOutputFileDoesNotExistError
 
+        if read_run_table and None in read_run_table[-1].values():
+            # Torn last row of an interrupted append_run_table(), the rows are appended again when needed
+            output.console_log_WARNING("CSVManager: Ignoring incomplete run table row")
+            read_run_table.pop()
+
+        # Replay the journal on top of the last checkpointed table
+        journal = self.__read_journal(self.checkpoint_journal_file) + self.__read_journal(self.journal_file)
+        if journal:
+            row_index = {row['__run_id']: row for row in read_run_table}
+            for entry in journal:
+                row = row_index.get(entry['__run_id'])
+                if row is not None:
+                    row.update({key: value for key, value in entry.items() if key in row})
+
+        for row in read_run_table:
+            # if value was integer, stored as string by CSV writer, then convert back to integer.
+            for key, value in row.items():
+                if value.isnumeric():
+                    row[key] = int(value)
+
+                if key == '__done':
+                    row[key] = RunProgress[value]
+
+        return read_run_table
+
     def write_run_table(self, run_table: List[Dict]):
+        self.__write_csv(run_table)
+
+        # The freshly written table is authoritative, older journal entries must not be replayed over it
+        for journal in [self.checkpoint_journal_file, self.journal_file]:
+            if os.path.exists(self._experiment_path / journal):
+                os.remove(self._experiment_path / journal)
+
+    def append_run_table(self, rows: List[Dict]):
+        """Append new rows to the end of `run_table.csv`, without rewriting the rows already in it."""
+        run_table_path = self._experiment_path / self.run_table_file
         try:
-            with open(self._experiment_path / 'run_table.csv', 'w', newline='') as myfile:
-                writer = csv.DictWriter(myfile, fieldnames=list(run_table[0].keys()))
-                writer.writeheader()
-                for data in run_table:
-                    data['__done'] = data['__done'].name
-                    writer.writerow(data)
+            with open(run_table_path, 'r', newline='') as csvfile:
+                fieldnames = next(csv.reader(csvfile))
+
+            self.__truncate_torn_row(run_table_path)
+            with open(run_table_path, 'a', newline='') as csvfile:
+                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                for data in rows:
+                    writer.writerow({**data, '__done': self.__progress_name(data['__done'])})
+                csvfile.flush()
+                os.fsync(csvfile.fileno())
         except:
             raise ExperimentOutputFileDoesNotExistError
 
+        output.console_log_WARNING(f"CSVManager: Appended {len(rows)} rows to the run table")
+
     # TODO: Nice To have
     def shuffle_experiment_run_table(self):
         pass
-    
+
     def update_row_data(self, updated_row: dict):
-        tempfile = NamedTemporaryFile(mode='w', delete=False)
-
-        with open(self._experiment_path / 'run_table.csv', 'r') as csvfile, tempfile:
-            reader = csv.DictReader(csvfile, fieldnames=list(updated_row.keys()))
-            writer = csv.DictWriter(tempfile, fieldnames=list(updated_row.keys()))
-
-            for row in reader:
-                if row['__run_id'] == updated_row['__run_id']:
-                    # When the row is updated, it is an ENUM value again.
-                    # Write as human-readable: enum_value.name
-                    updated_row['__done'] = updated_row['__done'].name
-                    writer.writerow(updated_row)
-                else:
-                    writer.writerow(row)
-
-        shutil.move(tempfile.name, self._experiment_path / 'run_table.csv')
-        
-        # Change permissions so the files can be accessed if run as root (needed for some plugins)
-        user = pwd.getpwnam(getpass.getuser())
-        os.chown(self._experiment_path / "run_table.csv", user.pw_uid, user.pw_gid)
+        # Stored the same way the CSV writer would store it, so replaying yields the same values as a checkpoint.
+        # Rows can also be updated partially, e.g. only a single column. Entries only replace the values they contain.
+        entry = {key: ('' if value is None else str(value)) for key, value in updated_row.items()}
+        if '__done' in updated_row:
+            entry['__done'] = self.__progress_name(updated_row['__done'])
+        line = (json.dumps(entry) + '\n').encode('utf-8')
+
+        # A single write() on an O_APPEND descriptor, so concurrent writers never interleave their lines
+        journal_path = self._experiment_path / self.journal_file
+        with self.__journal_lock(fcntl.LOCK_SH):
+            fd = os.open(journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+                os.fsync(fd)
+                # Change permissions so the files can be accessed if run as root (needed for some plugins)
+                self.__chown(journal_path)
+            finally:
+                os.close(fd)
 
         output.console_log_WARNING(f"CSVManager: Updated row {updated_row['__run_id']}")
 
-        # with open(self.experiment_path + '/run_table.csv', 'w', newline='') as myfile:
-        #     wr = csv.writer(myfile, quoting=csv.QUOTE_ALL)
-        #     wr.writerow(updated_row)
+    def checkpoint(self):
+        """Rebuild `run_table.csv` from the journal, after which the journal is discarded."""
+        journal_path = self._experiment_path / self.journal_file
+        checkpoint_journal_path = self._experiment_path / self.checkpoint_journal_file
+        if not os.path.exists(journal_path) and not os.path.exists(checkpoint_journal_path):
+            return
+
+        # Runs executing concurrently keep appending to a fresh journal while the checkpoint is taken: the exclusive
+        # lock waits for writers that opened the journal before it is moved aside, so none writes into it afterwards.
+        # A leftover checkpoint journal (crash during a previous checkpoint) is folded in first; replaying
+        # entries that already made it into the CSV is harmless, as every entry sets absolute values.
+        if not os.path.exists(checkpoint_journal_path):
+            with self.__journal_lock(fcntl.LOCK_EX):
+                os.rename(journal_path, checkpoint_journal_path)
+
+        self.__write_csv(self.read_run_table())
+        os.remove(checkpoint_journal_path)
+        output.console_log_WARNING("CSVManager: Checkpointed run table")
+
+    def __write_csv(self, run_table: List[Dict]):
+        run_table_path = self._experiment_path / self.run_table_file
+        try:
+            tempfile = NamedTemporaryFile(mode='w', newline='', delete=False, dir=self._experiment_path)
+        except FileNotFoundError:
+            raise ExperimentOutputFileDoesNotExistError
+
+        try:
+            with tempfile:
+                writer = csv.DictWriter(tempfile, fieldnames=list(run_table[0].keys()))
+                writer.writeheader()
+                for data in run_table:
+                    writer.writerow({**data, '__done': self.__progress_name(data['__done'])})
+                tempfile.flush()
+                os.fsync(tempfile.fileno())
 
-    # for row in reader:
-    # if name == row['name']:
-    #     row['name'] = input("enter new name for {}".format(name))
-    # # write the row either way
-    # writer.writerow({'name': row['name'], 'number': row['number'], 'address': row['address']})
+            # NamedTemporaryFile creates the file readable by its owner only, the run table is readable by all
+            os.chmod(tempfile.name, 0o644)
+            os.replace(tempfile.name, run_table_path)
+        except BaseException:
+            if os.path.exists(tempfile.name):
+                os.remove(tempfile.name)
+            raise
+
+        self.__chown(run_table_path)
+
+    @contextmanager
+    def __journal_lock(self, operation: int):
+        lock_path = self._experiment_path / self.journal_lock_file
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            self.__chown(lock_path)
+            fcntl.flock(fd, operation)
+            yield
+        finally:
+            os.close(fd)  # Releases the lock
+
+    def __read_journal(self, journal_file: str) -> List[Dict]:
+        journal_path = self._experiment_path / journal_file
+        if not os.path.exists(journal_path):
+            return []
+
+        entries = []
+        with open(journal_path, 'r') as journal:
+            for line in journal:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Only a torn last line (crash mid-write) can fail to decode, its run is simply still TODO
+                    output.console_log_WARNING("CSVManager: Ignoring incomplete run journal entry")
+        return entries
+
+    @staticmethod
+    def __truncate_torn_row(path):
+        # Drop an incomplete last line, so that appended rows do not get glued to it
+        with open(path, 'rb+') as f:
+            end = pos = f.seek(0, os.SEEK_END)
+            while pos > 0:
+                step = min(4096, pos)
+                f.seek(pos - step)
+                newline = f.read(step).rfind(b'\n')
+                if newline >= 0:
+                    pos = pos - step + newline + 1
+                    break
+                pos -= step
+            if pos != end:
+                f.truncate(pos)
+
+    @staticmethod
+    def __progress_name(progress) -> str:
+        # When the row is updated, it is an ENUM value again.
+        # Write as human-readable: enum_value.name
+        return progress.name if isinstance(progress, RunProgress) else progress
+
+    @staticmethod
+    def __chown(path):
+        user = pwd.getpwnam(getpass.getuser())
+        os.chown(path, user.pw_uid, user.pw_gid)
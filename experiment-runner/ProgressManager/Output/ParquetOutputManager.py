@@ -0,0 +1,187 @@
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+from ProgressManager.Output.BaseOutputManager import BaseOutputManager
+
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import os
+
+import numpy as np
+import pandas as pd
+
+try:  # Optional dependency, only needed to export Parquet files
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+
+def read_csv_log(logfile: Path) -> pd.DataFrame:
+    return pd.read_csv(logfile)
+
+
+def read_ps_log(logfile: Path) -> pd.DataFrame:
+    # The Ps plugin writes no header, its default output format is %cpu and %mem
+    log = pd.read_csv(logfile, header=None)
+    log.columns = ['%cpu', '%mem'] if len(log.columns) == 2 else [f'column_{i}' for i in range(len(log.columns))]
+    return log
+
+
+def read_nvml_log(logfile: Path) -> pd.DataFrame:
+    # A log in any of the NvidiaML log formats, in long format as every metric has its own timestamps (s).
+    # Values that are NVML errors are NaN, with the NVML error code in the error column.
+    from Plugins.Profilers.NvidiaML import NvidiaML  # Requires pynvml, so only imported to read NVML logs
+    log_data = NvidiaML.parse_log(logfile)
+
+    series = [(metric, samples) for metric, samples in log_data.items() if len(samples) > 0]
+    if not series:
+        return pd.DataFrame({'metric': pd.Series(dtype=object), 'timestamp': pd.Series(dtype=np.float64),
+                             'value': pd.Series(dtype=np.float64), 'error': pd.Series(dtype=np.int32)})
+    return pd.DataFrame({'metric': np.repeat([metric for metric, _ in series], [len(samples) for _, samples in series]),
+                         'timestamp': np.concatenate([samples.timestamps for _, samples in series]),
+                         'value': np.concatenate([samples['value'] for _, samples in series]),
+                         'error': np.concatenate([samples['error'] for _, samples in series])})
+
+
+class ParquetOutputManager(BaseOutputManager):
+    """Consolidates an experiment into Parquet files under `<experiment_path>/parquet`, for analysis.
+    Requires pyarrow (`pip install pyarrow`).
+
+    - `run_table.parquet`: the run table, with typed factor and data columns.
+    - `<log name>/<run id>.parquet`: a dataset per kind of profiler log, partitioned in a file per run,
+      with the `__run_id` and factor columns of the run added to every row. Read it with e.g.
+      `pyarrow.dataset.dataset(path)`, filters on these columns skip whole files through their statistics.
+
+    Profiler logs are found by their file name in the run directories, `log_readers` maps a file name to a function
+    reading it into a DataFrame (None skips the file). Numeric columns are stored in the smallest dtype
+    that holds their values exactly. Logs that were exported before, and did not change since, are not exported again."""
+
+    export_dir = 'parquet'
+    run_table_file = 'run_table.parquet'
+
+    # The default file names of the profiler plugins
+    default_log_readers: Dict[str, Callable[[Path], pd.DataFrame]] = {
+        'energibridge.csv': read_csv_log,
+        'powerjoular.csv':  read_csv_log,
+        'ps.csv':           read_ps_log,
+        'nvml_out.json':    read_nvml_log,
+    }
+
+    def __init__(self, experiment_path: Path, factor_names: List[str],
+                 log_readers: Optional[Dict[str, Optional[Callable[[Path], pd.DataFrame]]]] = None):
+        if pa is None:
+            raise BaseError("Exporting to Parquet requires pyarrow, install it with `pip install pyarrow`")
+
+        super().__init__(experiment_path)
+        self.factor_names = factor_names
+        self.log_readers = {**self.default_log_readers, **(log_readers or {})}
+
+    def export(self, run_table: List[Dict]) -> Path:
+        """Export the run table and the profiler logs of all its runs. Returns the export directory."""
+        export_path = self._experiment_path / self.export_dir
+        export_path.mkdir(exist_ok=True)
+
+        self.export_run_table(run_table)
+        nr_logs = self.export_logs(run_table)
+
+        output.console_log_OK(f"ParquetManager: Exported the run table and {nr_logs} profiler logs to {export_path}")
+        return export_path
+
+    def export_run_table(self, run_table: List[Dict]):
+        rows = [{**run, '__done': run['__done'].name if isinstance(run['__done'], RunProgress) else run['__done']}
+                for run in run_table]
+        table = self.compact_dtypes(pd.DataFrame(rows, columns=list(run_table[0].keys())))
+        self.__write(table, self._experiment_path / self.export_dir / self.run_table_file)
+
+    def export_logs(self, run_table: List[Dict]) -> int:
+        """Export the profiler logs found in the run directories. Returns the number of files exported.
+
+        All files of one kind of log get the same dtypes, so that they can be read as one dataset. When any of them
+        is new or changed, all of them are exported again. A log without rows is exported as an empty file."""
+        export_path = self._experiment_path / self.export_dir
+        exported = 0
+        for log_name, read_log in self.log_readers.items():
+            logfiles = {run['__run_id']: self._experiment_path / run['__run_id'] / log_name for run in run_table}
+            logfiles = {run_id: logfile for run_id, logfile in logfiles.items() if logfile.is_file()}
+            if read_log is None or not logfiles:
+                continue
+
+            log_path = export_path / Path(log_name).stem
+            if all((log_path / f"{run_id}.parquet").exists() and
+                   (log_path / f"{run_id}.parquet").stat().st_mtime >= logfile.stat().st_mtime
+                   for run_id, logfile in logfiles.items()):
+                continue
+
+            logs = dict()  # run id -> log
+            for run in run_table:
+                if run['__run_id'] not in logfiles:
+                    continue
+                try:
+                    log = read_log(logfiles[run['__run_id']])
+                except Exception as e:
+                    output.console_log_WARNING(f"ParquetManager: Could not read {logfiles[run['__run_id']]}: {e}")
+                    continue
+
+                # Constant within a file, so their statistics let readers skip it
+                log['__run_id'] = run['__run_id']
+                for factor_name in self.factor_names:
+                    log[factor_name] = self.__factor_level(run[factor_name])
+                logs[run['__run_id']] = log
+            if not logs:
+                continue
+
+            log_path.mkdir(parents=True, exist_ok=True)
+            combined = self.compact_dtypes(pd.concat(logs.values(), ignore_index=True))
+            run_logs = dict(list(combined.groupby('__run_id', sort=False, observed=True)))
+            for run_id in logs:
+                # An empty log still gets a file (with the schema of the others), so it is not exported every time
+                self.__write(run_logs.get(run_id, combined.iloc[0:0]), log_path / f"{run_id}.parquet")
+                exported += 1
+        return exported
+
+    @staticmethod
+    def compact_dtypes(frame: pd.DataFrame) -> pd.DataFrame:
+        """Convert every column to the smallest dtype that holds its values exactly:
+        numbers and booleans stored as strings (e.g. read from CSV) are parsed, integers are downcast,
+        floats become float32 if that is lossless, and strings that repeat often become categoricals."""
+        frame = frame.copy()
+        for column in frame.columns:
+            values = frame[column]
+            if not pd.api.types.is_bool_dtype(values) and not pd.api.types.is_numeric_dtype(values):
+                # ' ' is the run table's placeholder for data columns that were not filled in
+                present = values.replace({' ': None, '': None})
+                numeric = pd.to_numeric(present, errors='coerce')
+                if numeric.notna().sum() == present.notna().sum():  # Also when nothing was filled in at all
+                    values = numeric
+                elif present.notna().all() and present.isin(['True', 'False']).all():
+                    values = present == 'True'
+
+            if pd.api.types.is_bool_dtype(values):
+                pass
+            elif pd.api.types.is_integer_dtype(values):
+                values = pd.to_numeric(values, downcast='unsigned' if len(values) and values.min() >= 0 else 'integer')
+            elif pd.api.types.is_float_dtype(values):
+                as_float32 = values.astype(np.float32)
+                if np.array_equal(as_float32.astype(np.float64), values.astype(np.float64), equal_nan=True):
+                    values = as_float32
+            elif pd.api.types.is_string_dtype(values) and values.nunique() <= len(values) // 2:
+                values = values.astype('category')
+            frame[column] = values
+        return frame
+
+    @staticmethod
+    def __factor_level(level):
+        # Arbitrary python objects can be treatment levels
+        return level if isinstance(level, (bool, int, float, str, np.number, np.bool_)) else str(level)
+
+    @staticmethod
+    def __write(frame: pd.DataFrame, destination: Path):
+        # Arbitrary python objects in the remaining object columns are stored as their str()
+        for column in frame.columns:
+            if frame[column].dtype == object:
+                frame[column] = frame[column].map(lambda v: v if v is None or isinstance(v, (str, bytes)) else str(v))
+
+        temporary = destination.with_name(f"{destination.name}.{os.getpid()}.tmp")  # Nodes can export concurrently
+        pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), temporary, compression='zstd')
+        os.replace(temporary, destination)
@@ -0,0 +1,50 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+from ConfigValidator.Config.Models.RunTableBackend import RunTableBackend
+from ProgressManager.Output.BaseOutputManager import BaseOutputManager
+from ProgressManager.Output.TraceRecorder import TraceRecorder
+
+
+class RunTableOutputManager(BaseOutputManager, ABC):
+    """Stores the run table of an experiment, and the progress and data of its runs.
+
+    Rows are dicts with a `__run_id` and `__done` (RunProgress) column. `update_row_data()` is called from the
+    processes executing the runs, possibly at the same time, and only replaces the columns it is given."""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Show the time spent storing the run table in the experiment trace (export_trace)
+        TraceRecorder.trace_methods(cls, ['write_run_table', 'append_run_table', 'update_row_data', 'checkpoint'], 'run_table')
+
+    @abstractmethod
+    def read_run_table(self) -> List[Dict]:
+        pass
+
+    @abstractmethod
+    def write_run_table(self, run_table: List[Dict]):
+        """Store a new run table, replacing whatever was stored before"""
+        pass
+
+    @abstractmethod
+    def append_run_table(self, rows: List[Dict]):
+        """Add rows to the end of the stored run table"""
+        pass
+
+    @abstractmethod
+    def update_row_data(self, updated_row: dict):
+        pass
+
+    def checkpoint(self):
+        """Called every `run_table_checkpoint_interval` runs and at the end of the experiment"""
+        pass
+
+    @staticmethod
+    def create(config) -> 'RunTableOutputManager':
+        # Imported here, as both implementations derive from this class
+        if config.run_table_backend is RunTableBackend.SQLITE:
+            from ProgressManager.Output.SQLiteOutputManager import SQLiteOutputManager
+            return SQLiteOutputManager(config.experiment_path, wal=not config.distributed_execution)
+
+        from ProgressManager.Output.CSVOutputManager import CSVOutputManager
+        return CSVOutputManager(config.experiment_path)
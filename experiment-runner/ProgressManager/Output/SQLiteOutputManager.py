@@ -0,0 +1,197 @@
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+from ConfigValidator.CustomErrors.ExperimentOutputErrors import ExperimentOutputFileDoesNotExistError
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+from ProgressManager.Output.RunTableOutputManager import RunTableOutputManager
+from ProgressManager.Output.CSVOutputManager import CSVOutputManager
+
+from contextlib import closing, contextmanager
+from pathlib import Path
+import numbers
+import sqlite3
+import os
+import pwd
+import getpass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Declared type of factor columns that only hold booleans, SQLite itself stores them as 0 / 1
+sqlite3.register_converter("BOOLEAN", lambda value: value == b'1')
+
+
+class SQLiteOutputManager(RunTableOutputManager):
+    """Keeps the run table in the `run_table` table of `run_table.db`.
+
+    Factor columns are typed (INTEGER, REAL, BOOLEAN or TEXT) after the treatment levels they hold, data columns and
+    factor columns holding both integer and float levels are untyped, so that every value keeps its own type
+    (e.g. the levels of `FactorModel('f', [1, 2.5])` are read back as 1 and 2.5, not as 1.0 and 2.5).
+    Data columns keep the type of the values `populate_run_data()` returns. Arbitrary python objects are stored as their
+    str(). Every row update is a single `UPDATE` of the row (found through the index on `__run_id`) in its own
+    transaction. The database is in WAL mode, so concurrent runs wait for each other's (short) write
+    transactions only, and readers never block. WAL needs memory shared by all processes using the database,
+    so it is disabled (`wal=False`) when processes on other hosts use it through a shared file system.
+
+    `run_table.csv` is only an export, written by `export_csv()` on every checkpoint."""
+
+    run_table_file = 'run_table.db'
+    table_name = 'run_table'
+    busy_timeout_in_s = 60
+
+    __PLACEHOLDER = ' '  # Value of the data columns of runs that did not store their data yet
+
+    def __init__(self, experiment_path: Path, wal: bool = True):
+        super().__init__(experiment_path)
+        self.wal = wal
+        self.__columns: Optional[List[str]] = None
+
+    @property
+    def columns(self) -> List[str]:
+        if self.__columns is None:
+            with self.__connect() as connection:
+                self.__columns = [column[1] for column in connection.execute(f"PRAGMA table_info({self.table_name})")]
+        return self.__columns
+
+    def read_run_table(self) -> List[Dict]:
+        with self.__connect() as connection:
+            cursor = connection.execute(f"SELECT * FROM {self.table_name} ORDER BY rowid")
+            column_names = [description[0] for description in cursor.description]
+            read_run_table = [dict(zip(column_names, row)) for row in cursor]
+
+        for row in read_run_table:
+            row['__done'] = RunProgress[row['__done']]
+        return read_run_table
+
+    def write_run_table(self, run_table: List[Dict]):
+        column_names = list(run_table[0].keys())
+        column_types = self.__column_types(column_names, run_table)
+        column_types['__run_id'] = "TEXT PRIMARY KEY"
+        column_types['__done'] = "TEXT NOT NULL"
+        column_definitions = ", ".join(f"{self.__quote(name)} {column_types[name]}".strip() for name in column_names)
+
+        database_exists = os.path.exists(self._experiment_path / self.run_table_file)
+        with self.__transaction(must_exist=False) as connection:
+            connection.execute(f"DROP TABLE IF EXISTS {self.table_name}")
+            connection.execute(f"CREATE TABLE {self.table_name} ({column_definitions})")
+            self.__insert(connection, column_names, run_table)
+
+        if not database_exists and self.wal:
+            with self.__connect() as connection:
+                connection.execute("PRAGMA journal_mode=WAL")  # Persistent, applies to every later connection
+
+        self.__columns = column_names
+        # Change permissions so the files can be accessed if run as root (needed for some plugins)
+        for suffix in ['', '-wal', '-shm']:
+            path = self._experiment_path / (self.run_table_file + suffix)
+            if os.path.exists(path):
+                self.__chown(path)
+
+    def append_run_table(self, rows: List[Dict]):
+        """Insert new rows after the rows already in the run table, in a single transaction."""
+        with self.__transaction() as connection:
+            self.__insert(connection, self.columns, rows)
+
+        output.console_log_WARNING(f"SQLiteManager: Appended {len(rows)} rows to the run table")
+
+    def update_row_data(self, updated_row: dict):
+        # Rows can also be updated partially, e.g. only a single column. Columns not in the run table are ignored.
+        columns = [column for column in updated_row.keys() if column != '__run_id' and column in self.columns]
+        if columns:
+            assignments = ", ".join(f"{self.__quote(column)} = ?" for column in columns)
+            with self.__transaction() as connection:
+                connection.execute(f"UPDATE {self.table_name} SET {assignments} WHERE __run_id = ?",
+                                   [self.__to_sql(updated_row[column]) for column in columns] + [updated_row['__run_id']])
+
+        output.console_log_WARNING(f"SQLiteManager: Updated row {updated_row['__run_id']}")
+
+    def checkpoint(self):
+        """Fold the write-ahead log into the database, and export the run table to `run_table.csv`."""
+        with self.__connect() as connection:
+            connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.export_csv()
+        output.console_log_WARNING("SQLiteManager: Checkpointed run table")
+
+    def export_csv(self) -> Path:
+        """Write the run table to `run_table.csv`, in the same format as the CSV backend. Returns its path."""
+        CSVOutputManager(self._experiment_path).write_run_table(self.read_run_table())
+        return self._experiment_path / CSVOutputManager.run_table_file
+
+    def __insert(self, connection: sqlite3.Connection, column_names: List[str], rows):
+        placeholders = ", ".join("?" for _ in column_names)
+        quoted_names = ", ".join(self.__quote(name) for name in column_names)
+        connection.executemany(f"INSERT INTO {self.table_name} ({quoted_names}) VALUES ({placeholders})",
+                               ([self.__to_sql(row.get(name)) for name in column_names] for row in rows))
+
+    def __connect(self, must_exist: bool = True):
+        # A connection per operation: managers are used from the forked processes executing the runs,
+        # and SQLite connections must not be shared across a fork
+        path = self._experiment_path / self.run_table_file
+        if must_exist and not os.path.exists(path):
+            raise ExperimentOutputFileDoesNotExistError(self.run_table_file)
+
+        connection = sqlite3.connect(path, timeout=self.busy_timeout_in_s, isolation_level=None,
+                                     detect_types=sqlite3.PARSE_DECLTYPES)
+        # Closes the connection at the end of a with-block, which sqlite3.Connection itself does not do
+        return closing(connection)
+
+    @contextmanager
+    def __transaction(self, must_exist: bool = True):
+        with self.__connect(must_exist) as connection:
+            # Take the write lock upfront, so that concurrent writers queue up (busy timeout) instead of deadlocking
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    @classmethod
+    def __column_types(cls, column_names: List[str], rows) -> Dict[str, str]:
+        """Declared type of every column, after the (python) types of its values"""
+        kinds = {name: set() for name in column_names}
+        for row in rows:
+            for name in column_names:
+                value = row[name]
+                if isinstance(value, (bool, np.bool_)):
+                    kinds[name].add("BOOLEAN")
+                elif isinstance(value, numbers.Integral):
+                    kinds[name].add("INTEGER")
+                elif isinstance(value, numbers.Real):
+                    kinds[name].add("REAL")
+                elif not (isinstance(value, str) and value == cls.__PLACEHOLDER):
+                    kinds[name].add("TEXT")
+
+        column_types = dict()
+        for name, column_kinds in kinds.items():
+            if len(column_kinds) == 1:
+                column_types[name] = column_kinds.pop()
+            elif column_kinds == {"INTEGER", "REAL"}:
+                # REAL would turn the integer levels into floats, which resuming reports as drift
+                column_types[name] = ""
+            else:  # Untyped (data columns), or a mix of types
+                column_types[name] = "" if not column_kinds else "TEXT"
+        return column_types
+
+    @staticmethod
+    def __to_sql(value):
+        if value is None or isinstance(value, (str, bytes)):
+            return value
+        if isinstance(value, RunProgress):
+            return value.name
+        if isinstance(value, (bool, np.bool_)):
+            return int(value)
+        if isinstance(value, numbers.Integral) and -2 ** 63 <= value < 2 ** 63:
+            return int(value)
+        if isinstance(value, numbers.Real) and not isinstance(value, numbers.Integral):
+            return float(value)
+        return str(value)
+
+    @staticmethod
+    def __quote(name: str) -> str:
+        return '"' + name.replace('"', '""') + '"'
+
+    @staticmethod
+    def __chown(path):
+        user = pwd.getpwnam(getpass.getuser())
+        os.chown(path, user.pw_uid, user.pw_gid)
+
@@ -0,0 +1,132 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from ExperimentOrchestrator.Architecture.Singleton import Singleton
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+
+
+###     =========================================================
+###     |                                                       |
+###     |                     TraceRecorder                     |
+###     |       - Record what the experiment spends its time    |
+###     |         on (hooks, run phases, profilers, run table   |
+###     |         writes) as Chrome Trace Events                |
+###     |       - Export them as trace.json, to be viewed in    |
+###     |         Perfetto (ui.perfetto.dev) or                 |
+###     |         chrome://tracing                              |
+###     |                                                       |
+###     |       * Every process (runs, workers) appends its     |
+###     |         events to the same trace.jsonl, timestamped   |
+###     |         with the system-wide time.monotonic_ns()      |
+###     |       * Does nothing until `enable()` is called       |
+###     |                                                       |
+###     =========================================================
+class TraceRecorder(metaclass=Singleton):
+    events_file = 'trace.jsonl'
+    trace_file = 'trace.json'
+
+    def __init__(self):
+        self.__fd: Optional[int] = None
+        self.__active = threading.local()  # The traced methods (object id, method name) executing in the thread
+
+    @property
+    def __active_spans(self) -> set:
+        if not hasattr(self.__active, 'spans'):
+            self.__active.spans = set()
+        return self.__active.spans
+
+    @property
+    def enabled(self) -> bool:
+        return self.__fd is not None
+
+    def enable(self, experiment_path: Path):
+        """Record events in `<experiment_path>/trace.jsonl`, also from the processes forked afterwards.
+        The events of an earlier (resumed) invocation are kept."""
+        # O_APPEND: every event is a single write to the end of the file, also when processes write at the same time
+        self.__fd = os.open(experiment_path / self.events_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self.name_process("experiment-runner")
+
+    def disable(self):
+        if self.__fd is not None:
+            os.close(self.__fd)
+            self.__fd = None
+
+    def name_process(self, name: str):
+        self.__write({'name': 'process_name', 'ph': 'M', 'pid': os.getpid(), 'args': {'name': name}})
+
+    def record(self, name: str, category: str, start_ns: int, end_ns: int, args: Optional[Dict] = None):
+        """Record a span (complete event) of the calling process and thread"""
+        if self.__fd is None:
+            return
+
+        event = {'name': name, 'cat': category, 'ph': 'X', 'ts': start_ns / 1000, 'dur': (end_ns - start_ns) / 1000,
+                 'pid': os.getpid(), 'tid': threading.get_native_id()}
+        if args:
+            event['args'] = args
+        self.__write(event)
+
+    @contextmanager
+    def span(self, name: str, category: str, args: Optional[Dict] = None):
+        if self.__fd is None:
+            yield
+            return
+
+        start_ns = time.monotonic_ns()
+        try:
+            yield
+        finally:
+            self.record(name, category, start_ns, time.monotonic_ns(), args)
+
+    @staticmethod
+    def trace_methods(cls: type, method_names: Iterable[str], category: str):
+        """Record every call of the given methods, if `cls` defines them itself, as a span named
+        `<class of the instance>.<method>`. Calls of the overridden method (super()) are part of that span."""
+        def traced(method, method_name: str):
+            @functools.wraps(method)
+            def wrapper(self, *args, **kwargs):
+                recorder = TraceRecorder()
+                key = (id(self), method_name)
+                if not recorder.enabled or key in recorder.__active_spans:
+                    return method(self, *args, **kwargs)
+
+                recorder.__active_spans.add(key)
+                try:
+                    with recorder.span(f"{type(self).__name__}.{method_name}", category):
+                        return method(self, *args, **kwargs)
+                finally:
+                    recorder.__active_spans.discard(key)
+
+            wrapper.traced = True
+            return wrapper
+
+        for method_name in method_names:
+            method = cls.__dict__.get(method_name)
+            if callable(method) and not getattr(method, 'traced', False):
+                setattr(cls, method_name, traced(method, method_name))
+
+    def export(self, experiment_path: Path) -> Path:
+        """Convert the recorded events into `<experiment_path>/trace.json` (JSON Object Format)"""
+        events = []
+        with open(experiment_path / self.events_file, 'r') as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    pass  # Torn by a process that was killed while writing
+
+        trace_path = experiment_path / self.trace_file
+        with open(trace_path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+        output.console_log_OK(f"TraceRecorder: Exported {len(events)} trace events to {trace_path}")
+        return trace_path
+
+    def __write(self, event: Dict):
+        if self.__fd is not None:
+            os.write(self.__fd, (json.dumps(event, default=str) + '\n').encode())
@@ -0,0 +1,41 @@
+from typing import Dict, List, Tuple
+
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+
+class ResumeReport:
+    """The outcome of reconciling the run table stored by an earlier invocation with the generated one:
+    the runs per progress state, and the columns in which both run tables differ (drift)."""
+
+    __MAX_LISTED = 10  # Runs and differences listed per progress state or column
+
+    def __init__(self):
+        self.run_ids: Dict[RunProgress, List[str]] = {progress: [] for progress in RunProgress}
+        self.drift: Dict[str, Tuple[int, str]] = dict()  # column -> (number of differences, first difference)
+
+    def add_run(self, run_id: str, progress: RunProgress):
+        self.run_ids[progress].append(run_id)
+
+    def add_drift(self, column: str, difference: str):
+        count, first_difference = self.drift.get(column, (0, difference))
+        self.drift[column] = (count + 1, first_difference)
+
+    def count(self, progress: RunProgress) -> int:
+        return len(self.run_ids[progress])
+
+    @property
+    def has_drift(self) -> bool:
+        return bool(self.drift)
+
+    def summary(self) -> str:
+        summary = ", ".join(f"{self.count(progress)} {progress.name}" for progress in RunProgress)
+        failed = self.run_ids[RunProgress.FAILED]
+        if failed:
+            summary += "\nFailed runs (tried again): " + ", ".join(failed[:self.__MAX_LISTED])
+            if len(failed) > self.__MAX_LISTED:
+                summary += f" and {len(failed) - self.__MAX_LISTED} more"
+        return summary
+
+    def drift_summary(self) -> str:
+        return "\n".join(f"  {column}: {difference}" + (f" (and {count - 1} more)" if count > 1 else "")
+                         for column, (count, difference) in self.drift.items())
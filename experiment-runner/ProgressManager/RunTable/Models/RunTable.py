@@ -0,0 +1,350 @@
+import itertools
+import math
+import random
+import re
+from collections.abc import Sequence
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+from ProgressManager.RunTable.Models.ResumeReport import ResumeReport
+
+
+class SeededPermutation:
+    """A pseudo-random permutation of [0, size), computed per element instead of being stored.
+
+    A balanced Feistel network permutes the smallest even power of two covering `size`,
+    and cycle-walking maps every value back into range. Both directions are O(1) on average."""
+
+    __M64 = (1 << 64) - 1
+
+    def __init__(self, size: int, seed: int, rounds: int = 4):
+        self.size = size
+        bits = max(2, (size - 1).bit_length())
+        bits += bits % 2
+        self.__half_bits = bits // 2
+        self.__half_mask = (1 << self.__half_bits) - 1
+        rng = random.Random(seed)
+        self.__keys = [rng.getrandbits(64) for _ in range(rounds)]
+
+    def __round(self, value: int, key: int) -> int:
+        # splitmix64 finalizer
+        value = (value ^ key) & self.__M64
+        value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & self.__M64
+        value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & self.__M64
+        return (value ^ (value >> 31)) & self.__half_mask
+
+    def __encrypt(self, value: int) -> int:
+        left, right = value >> self.__half_bits, value & self.__half_mask
+        for key in self.__keys:
+            left, right = right, left ^ self.__round(right, key)
+        return (left << self.__half_bits) | right
+
+    def __decrypt(self, value: int) -> int:
+        left, right = value >> self.__half_bits, value & self.__half_mask
+        for key in reversed(self.__keys):
+            left, right = right ^ self.__round(left, key), left
+        return (left << self.__half_bits) | right
+
+    def forward(self, value: int) -> int:
+        value = self.__encrypt(value)
+        while value >= self.size:
+            value = self.__encrypt(value)
+        return value
+
+    def inverse(self, value: int) -> int:
+        value = self.__decrypt(value)
+        while value >= self.size:
+            value = self.__decrypt(value)
+        return value
+
+
+class RunTable(Sequence):
+    """The experiment run table, materialized one row at a time.
+
+    A row is identified by its treatment combination (a mixed-radix index over the treatment levels of every factor)
+    and its repetition, so rows are generated on demand and a row's position is found in O(1) from its `__run_id`.
+    Only the run progress (one byte per row) and explicitly updated values are kept in memory, plus, when the design
+    excludes combinations of several factors, the index of every remaining combination.
+
+    Further repetitions of single combinations can be appended with `append_repetitions()`, they are kept in a
+    small index of their own.
+
+    Rows are returned as fresh dicts, changes to them are not stored. Use `update_row()` instead."""
+
+    __RUN_ID = re.compile(r'run_(\d+)_repetition_(\d+)')
+
+    def __init__(self,
+                 factor_names: List[str],
+                 treatments: List[List],
+                 data_columns: List[str],
+                 repetitions: int = 1,
+                 combinations: Optional[np.ndarray] = None,
+                 shuffle_seed: Optional[int] = None
+                 ):
+        self.__factor_names = factor_names
+        self.__treatments = treatments
+        self.__data_columns = data_columns
+        self.__repetitions = repetitions
+        self.__combinations = combinations  # Indices into the treatment grid, or None for the whole grid
+
+        self.__radices = [len(levels) for levels in treatments]
+        self.__strides = [math.prod(self.__radices[pos + 1:]) for pos in range(len(self.__radices))]
+        self.__nr_combinations = len(combinations) if combinations is not None else math.prod(self.__radices)
+        self.__base_size = self.__nr_combinations * repetitions
+        self.__size = self.__base_size
+
+        self.__shuffle_seed = shuffle_seed
+        self.__permutation = SeededPermutation(self.__size, shuffle_seed) if shuffle_seed is not None and self.__size > 1 else None
+        self.__order: Optional[np.ndarray] = None        # Explicit order of the rows, overrides the permutation
+        self.__order_inverse: Optional[np.ndarray] = None
+
+        self.__progress = bytearray([RunProgress.TODO.value]) * self.__size
+        self.__updates: Dict[str, Dict] = dict()
+
+        # Appended repetitions, their rows follow the base rows
+        self.__appended: List[Tuple[int, int]] = []     # row - base size -> (combination, repetition)
+        self.__appended_rows: Dict[Tuple[int, int], int] = dict()
+        self.__repetition_counts: Dict[int, int] = dict()
+
+    @property
+    def column_names(self) -> List[str]:
+        return ['__run_id', '__done'] + self.__factor_names + self.__data_columns
+
+    @property
+    def nr_combinations(self) -> int:
+        return self.__nr_combinations
+
+    def __len__(self) -> int:
+        return self.__size
+
+    @staticmethod
+    def run_id(combination: int, repetition: int) -> str:
+        return f'run_{combination}_repetition_{repetition}'
+
+    @classmethod
+    def parse_run_id(cls, run_id: str) -> Tuple[int, int]:
+        """The (combination, repetition) of the given run id"""
+        match = cls.__RUN_ID.fullmatch(run_id)
+        if not match:
+            raise BaseError(f"Invalid run id {run_id}")
+        return int(match.group(1)), int(match.group(2))
+
+    def repetitions_of(self, combination: int) -> int:
+        return self.__repetition_counts.get(combination, self.__repetitions)
+
+    def __row_of_position(self, position: int) -> int:
+        if self.__order is not None:
+            return int(self.__order[position])
+        if position >= self.__base_size:
+            return position
+        if self.__permutation is not None:
+            return self.__permutation.forward(position)
+        return position
+
+    def __position_of_row(self, row: int) -> int:
+        if self.__order is not None:
+            return int(self.__order_inverse[row])
+        if row >= self.__base_size:
+            return row
+        if self.__permutation is not None:
+            return self.__permutation.inverse(row)
+        return row
+
+    def __row_of_run_id(self, run_id: str) -> int:
+        return self.__row_of_run(*self.parse_run_id(run_id))
+
+    def __row_of_run(self, combination: int, repetition: int) -> int:
+        if combination >= self.__nr_combinations:
+            raise BaseError(f"Run {self.run_id(combination, repetition)} is not part of the run table")
+        if repetition < self.__repetitions:
+            return repetition * self.__nr_combinations + combination
+        if (combination, repetition) in self.__appended_rows:
+            return self.__appended_rows[(combination, repetition)]
+        raise BaseError(f"Run {self.run_id(combination, repetition)} is not part of the run table")
+
+    def __treatment_levels(self, combination: int) -> List:
+        grid_index = int(self.__combinations[combination]) if self.__combinations is not None else combination
+        return [levels[(grid_index // stride) % radix]
+                for levels, stride, radix in zip(self.__treatments, self.__strides, self.__radices)]
+
+    def __materialize(self, row: int) -> Dict:
+        if row < self.__base_size:
+            repetition, combination = divmod(row, self.__nr_combinations)
+        else:
+            combination, repetition = self.__appended[row - self.__base_size]
+        run_id = self.run_id(combination, repetition)
+
+        materialized = dict(zip(self.column_names,
+                                [run_id, RunProgress(self.__progress[row])] +
+                                self.__treatment_levels(combination) +
+                                [" "] * len(self.__data_columns)))
+        if run_id in self.__updates:
+            materialized.update(self.__updates[run_id])
+        return materialized
+
+    def __getitem__(self, position: int) -> Dict:
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(self.__size))]
+
+        if position < 0:
+            position += self.__size
+        if not 0 <= position < self.__size:
+            raise IndexError("run table index out of range")
+        return self.__materialize(self.__row_of_position(position))
+
+    def __iter__(self) -> Iterator[Dict]:
+        for position in range(self.__size):
+            yield self.__materialize(self.__row_of_position(position))
+
+    def index(self, run, *args) -> int:
+        """Position of the given run (a row, or its `__run_id`) in the run table"""
+        run_id = run['__run_id'] if isinstance(run, dict) else run
+        return self.__position_of_row(self.__row_of_run_id(run_id))
+
+    def update_row(self, run_id: str, values: Dict):
+        row = self.__row_of_run_id(run_id)
+        values = dict(values)
+        if '__done' in values:
+            self.__progress[row] = values.pop('__done').value
+        if values:
+            self.__updates.setdefault(run_id, dict()).update(values)
+
+    def reorder(self, run_ids: List[str]):
+        """Order the run table as given by the run ids, e.g. the order of a run table stored earlier"""
+        if len(run_ids) != self.__size:
+            raise BaseError("Cannot reorder the run table, the number of runs does not match")
+
+        self.__set_order(np.fromiter((self.__row_of_run_id(run_id) for run_id in run_ids), dtype=np.int64, count=self.__size))
+
+    def reorder_rows(self, order: np.ndarray):
+        """Order the run table by row: row `repetition * nr_combinations + combination` is a repetition of a combination"""
+        if len(order) != self.__size:
+            raise BaseError("Cannot reorder the run table, the number of runs does not match")
+
+        self.__set_order(np.asarray(order, dtype=np.int64))
+
+    def treatment_level_indices(self) -> np.ndarray:
+        """The (combinations x factors) indices of the treatment levels of every combination"""
+        grid = self.__combinations if self.__combinations is not None else np.arange(self.__nr_combinations, dtype=np.int64)
+        return np.stack([(grid // stride) % radix for stride, radix in zip(self.__strides, self.__radices)], axis=1) \
+            if self.__radices else np.zeros((self.__nr_combinations, 0), dtype=np.int64)
+
+    def __set_order(self, order: np.ndarray):
+        order_inverse = np.full(self.__size, -1, dtype=np.int64)
+        order_inverse[order] = np.arange(self.__size, dtype=np.int64)
+        if (order_inverse < 0).any():
+            raise BaseError("Cannot reorder the run table, duplicate run ids found")
+
+        self.__order = order
+        self.__order_inverse = order_inverse
+
+    def append_repetitions(self, combinations: List[int]) -> List[Dict]:
+        """Append one more repetition of each of the given combinations to the end of the run table.
+        In a shuffled run table, the appended runs are shuffled among themselves. Returns the appended rows."""
+        new_runs = []
+        for combination in combinations:
+            if not 0 <= combination < self.__nr_combinations:
+                raise BaseError(f"Combination {combination} is not part of the run table")
+            repetition = self.repetitions_of(combination)
+            self.__repetition_counts[combination] = repetition + 1
+            new_runs.append((combination, repetition))
+
+        if self.__shuffle_seed is not None:
+            random.Random(f'{self.__shuffle_seed}-{self.__size}').shuffle(new_runs)
+
+        first_row = self.__size
+        for combination, repetition in new_runs:
+            self.__appended_rows[(combination, repetition)] = self.__size
+            self.__appended.append((combination, repetition))
+            self.__size += 1
+        self.__progress.extend([RunProgress.TODO.value] * len(new_runs))
+
+        new_rows = np.arange(first_row, self.__size, dtype=np.int64)
+        if self.__order is not None:
+            self.__order = np.concatenate([self.__order, new_rows])
+            self.__order_inverse = np.concatenate([self.__order_inverse, new_rows])
+
+        return [self.__materialize(int(row)) for row in new_rows]
+
+    def restore_appended_runs(self, run_ids: List[str]):
+        """Append the repetitions among the given run ids that are not part of this run table yet,
+        i.e. the repetitions that were appended to a run table stored earlier."""
+        self.__restore_appended_runs(list(map(self.parse_run_id, run_ids)))
+
+    def __restore_appended_runs(self, runs: List[Tuple[int, int]]):
+        appended = sorted((repetition, combination) for combination, repetition in runs
+                          if repetition >= self.repetitions_of(combination))
+        for repetition, runs in itertools.groupby(appended, key=lambda run: run[0]):
+            for row in self.append_repetitions([combination for _, combination in runs]):
+                if self.parse_run_id(row['__run_id'])[1] != repetition:
+                    raise BaseError(f"Cannot restore run {row['__run_id']}, earlier repetitions are missing")
+
+    def reconcile(self, stored_run_table: List[Dict]) -> ResumeReport:
+        """Take over the order and the progress of a run table stored earlier, and restore the repetitions appended
+        to it, in a single pass over the stored rows. The data columns are not taken over.
+
+        Columns, run ids and treatment levels (compared as str(), as stored treatment levels can be strings only)
+        that differ from the generated run table are reported as drift, the run table must then not be used."""
+        report = ResumeReport()
+        stored_columns = list(stored_run_table[0].keys()) if stored_run_table else []
+        for column in self.column_names:
+            if column not in stored_columns:
+                report.add_drift(column, "missing from the stored run table")
+        for column in stored_columns:
+            if column not in self.column_names:
+                report.add_drift(column, "not defined by the config")
+        if '__run_id' in report.drift or '__done' in report.drift:
+            return report
+
+        runs = []
+        for stored_run in stored_run_table:
+            try:
+                run = self.parse_run_id(stored_run['__run_id'])
+            except BaseError:
+                report.add_drift('__run_id', f"{stored_run['__run_id']} is not a run id")
+                continue
+            if run[0] >= self.__nr_combinations:
+                report.add_drift('__run_id', f"{stored_run['__run_id']} is not part of the generated run table")
+            runs.append(run)
+        if '__run_id' in report.drift:
+            return report
+
+        try:
+            self.__restore_appended_runs(runs)
+        except BaseError as e:
+            report.add_drift('__run_id', str(e))
+            return report
+        if len(runs) != self.__size:
+            report.add_drift('__run_id', f"{self.__size - len(runs)} runs are missing from the stored run table")
+            return report
+
+        factors = [(pos, factor_name) for pos, factor_name in enumerate(self.__factor_names) if factor_name in stored_columns]
+        order = np.empty(self.__size, dtype=np.int64)
+        progress = bytearray(self.__size)
+        treatment_levels = dict()  # combination -> str() of its treatment levels
+        for position, (stored_run, (combination, repetition)) in enumerate(zip(stored_run_table, runs)):
+            row = self.__row_of_run(combination, repetition)
+            order[position] = row
+            progress[row] = stored_run['__done'].value
+            report.add_run(stored_run['__run_id'], stored_run['__done'])
+
+            if combination not in treatment_levels:
+                treatment_levels[combination] = [str(level) for level in self.__treatment_levels(combination)]
+            for pos, factor_name in factors:
+                if str(stored_run[factor_name]) != treatment_levels[combination][pos]:
+                    report.add_drift(factor_name, f"{stored_run['__run_id']} stored '{stored_run[factor_name]}', "
+                                                  f"the config generates '{treatment_levels[combination][pos]}'")
+
+        if report.has_drift:
+            return report
+
+        try:
+            self.__set_order(order)
+        except BaseError:
+            report.add_drift('__run_id', "the stored run table contains duplicate run ids")
+            return report
+        self.__progress = progress
+        return report
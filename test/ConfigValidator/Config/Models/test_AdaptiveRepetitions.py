@@ -0,0 +1,43 @@
+import unittest
+
+from ConfigValidator.Config.Models.AdaptiveRepetitions import AdaptiveRepetitions
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.CustomErrors.BaseError import BaseError
+
+
+class TestAdaptiveRepetitions(unittest.TestCase):
+
+    def test_t_quantile(self):
+        # Reference values of Student's t-distribution
+        for p, degrees_of_freedom, expected in [(0.975, 1, 12.7062), (0.975, 2, 4.3027), (0.975, 4, 2.7764),
+                                                (0.975, 10, 2.2281), (0.95, 30, 1.6973)]:
+            self.assertAlmostEqual(AdaptiveRepetitions.t_quantile(p, degrees_of_freedom), expected, delta=1e-3)
+
+    def test_ci_half_width(self):
+        adaptive = AdaptiveRepetitions(['energy'], max_repetitions=10, max_ci_half_width=1.0)
+        self.assertFalse(adaptive.is_satisfied({'energy': [10.0]}))
+        self.assertTrue(adaptive.is_satisfied({'energy': [10.0, 10.1, 9.9]}))
+        self.assertFalse(adaptive.is_satisfied({'energy': [10.0, 12.0, 8.0]}))
+
+    def test_relative_standard_error(self):
+        adaptive = AdaptiveRepetitions(['energy', 'time'], max_repetitions=10, max_relative_standard_error=0.05)
+        self.assertTrue(adaptive.is_satisfied({'energy': [100, 101, 99], 'time': [5, 5, 5]}))
+        self.assertFalse(adaptive.is_satisfied({'energy': [100, 101, 99], 'time': [1, 5, 9]}))
+        self.assertFalse(adaptive.is_satisfied({'energy': [100, 101, 99]}))
+
+    def test_validation(self):
+        with self.assertRaises(BaseError):
+            AdaptiveRepetitions(['energy'], max_repetitions=10)
+
+        factor = FactorModel('factor', [1, 2])
+        with self.assertRaises(BaseError):
+            RunTableModel([factor], data_columns=['energy'], repetitions=3,
+                          adaptive_repetitions=AdaptiveRepetitions(['energy'], 2, max_ci_half_width=1))
+        with self.assertRaises(BaseError):
+            RunTableModel([factor], data_columns=['energy'],
+                          adaptive_repetitions=AdaptiveRepetitions(['time'], 5, max_ci_half_width=1))
+
+
+if __name__ == '__main__':
+    unittest.main()
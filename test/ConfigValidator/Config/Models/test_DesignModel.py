@@ -0,0 +1,136 @@
+import unittest
+import itertools
+from collections import Counter
+
+import numpy as np
+
+from ConfigValidator.Config.Models.DesignModel import (FractionalFactorialDesign, OrthogonalArrayDesign,
+                                                       LatinHypercubeDesign, SobolDesign)
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+
+def levels_of(grid_indices, radices):
+    levels = []
+    for idx in grid_indices:
+        row = []
+        for radix in reversed(radices):
+            idx, level = divmod(int(idx), radix)
+            row.append(level)
+        levels.append(row[::-1])
+    return levels
+
+
+def has_strength(levels, radices, strength):
+    """Every projection on `strength` factors contains every level combination equally often"""
+    for columns in itertools.combinations(range(len(radices)), strength):
+        counts = Counter(tuple(row[c] for c in columns) for row in levels)
+        if len(counts) != np.prod([radices[c] for c in columns]) or len(set(counts.values())) != 1:
+            return False
+    return True
+
+
+class TestFractionalFactorialDesign(unittest.TestCase):
+
+    def test_run_counts(self):
+        # Minimal regular designs: 2^(7-4) III, 2^(8-4) IV, 2^(5-1) V, 2^(6-1) VI
+        self.assertEqual(len(FractionalFactorialDesign(3).generate([2] * 7)), 8)
+        self.assertEqual(len(FractionalFactorialDesign(4).generate([2] * 8)), 16)
+        self.assertEqual(len(FractionalFactorialDesign(5).generate([2] * 5)), 16)
+        self.assertEqual(len(FractionalFactorialDesign(5).generate([2] * 6)), 32)
+
+    def test_resolution(self):
+        for resolution in (3, 4, 5):
+            for nr_factors in range(resolution, 10):
+                radices = [2] * nr_factors
+                levels = levels_of(FractionalFactorialDesign(resolution).generate(radices), radices)
+                self.assertTrue(has_strength(levels, radices, resolution - 1))
+
+    def test_requires_two_levels(self):
+        with self.assertRaises(BaseError):
+            FractionalFactorialDesign(3).generate([2, 3])
+        with self.assertRaises(BaseError):
+            FractionalFactorialDesign(6)
+
+
+class TestOrthogonalArrayDesign(unittest.TestCase):
+
+    def test_strength_two(self):
+        for levels, nr_factors, nr_runs in [(2, 3, 4), (3, 4, 9), (3, 13, 27), (5, 6, 25)]:
+            radices = [levels] * nr_factors
+            grid_indices = OrthogonalArrayDesign().generate(radices)
+            self.assertEqual(len(grid_indices), nr_runs)
+            self.assertTrue(has_strength(levels_of(grid_indices, radices), radices, 2))
+
+    def test_invalid_levels(self):
+        with self.assertRaises(BaseError):
+            OrthogonalArrayDesign().generate([4, 4, 4])
+        with self.assertRaises(BaseError):
+            OrthogonalArrayDesign().generate([3, 2])
+
+
+class TestSamplingDesigns(unittest.TestCase):
+
+    def test_latin_hypercube_levels_are_balanced(self):
+        radices = [4, 4, 4]
+        levels = levels_of(LatinHypercubeDesign(samples=4, seed=1).generate(radices), radices)
+        self.assertEqual(len(levels), 4)
+        for column in range(3):
+            self.assertEqual(sorted(row[column] for row in levels), [0, 1, 2, 3])
+
+    def test_sobol_points(self):
+        points = SobolDesign(samples=4).points(2) / 2 ** 32
+        np.testing.assert_array_equal(points, [[0, 0], [0.5, 0.5], [0.75, 0.25], [0.25, 0.75]])
+
+    def test_sobol_levels_are_balanced(self):
+        radices = [2] * 10
+        levels = levels_of(SobolDesign(samples=16).generate(radices), radices)
+        self.assertEqual(len(levels), 16)
+        self.assertTrue(has_strength(levels, radices, 1))
+
+    def test_seeded_designs_are_deterministic(self):
+        for design in (LatinHypercubeDesign, SobolDesign):
+            first = design(samples=20, seed=5).generate([5, 5, 5])
+            second = design(samples=20, seed=5).generate([5, 5, 5])
+            np.testing.assert_array_equal(first, second)
+
+
+class TestRunTableModelDesign(unittest.TestCase):
+
+    def test_resume_sampling_design(self):
+        # Without a seed of its own, a design generates the same run table again when the experiment is resumed
+        def generate():
+            return RunTableModel(
+                factors=[FactorModel(name, list(range(8))) for name in ['a', 'b', 'c']],
+                design=LatinHypercubeDesign(samples=6),
+                data_columns=['avg_cpu']
+            ).generate_run_table()
+
+        stored = [dict(row) for row in generate()]
+        stored[0]['__done'] = RunProgress.DONE
+
+        report = generate().reconcile(stored)
+        self.assertFalse(report.has_drift)
+        self.assertEqual(report.count(RunProgress.DONE), 1)
+
+    def test_design_with_exclusions(self):
+        factors = [FactorModel(f'f{i}', ['low', 'high']) for i in range(5)]
+        run_table = RunTableModel(
+            factors=factors,
+            exclude_combinations=[{factors[0]: ['low'], factors[1]: ['low']}],
+            repetitions=2,
+            design=FractionalFactorialDesign(resolution=3),
+            data_columns=['avg_cpu']
+        ).generate_experiment_run_table()
+
+        # 2^(5-2) runs, of which 2 have (low, low) for f0 and f1
+        self.assertEqual(len(run_table), 12)
+        self.assertEqual([row['__run_id'] for row in run_table[:6]], [f'run_{i}_repetition_0' for i in range(6)])
+        self.assertFalse(any(row['f0'] == 'low' and row['f1'] == 'low' for row in run_table))
+        self.assertEqual(set(run_table[0].keys()), {'__run_id', '__done', 'f0', 'f1', 'f2', 'f3', 'f4', 'avg_cpu'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -88,5 +88,45 @@ class TestRunTableModelExclusions(unittest.TestCase):
             ])
 
 
+class TestRunTableModelIndexedExclusions(unittest.TestCase):
+    def setUp(self):
+        self.factors = [FactorModel(f"factor{f}", [i for i in range(4)]) for f in range(4)]
+
+    def __brute_force(self, exclusions):
+        combos = []
+        for combo in itertools.product(*[factor.treatments for factor in self.factors]):
+            excluded = any(all(combo[self.factors.index(factor)] in levels for factor, levels in exclusion.items())
+                           for exclusion in exclusions)
+            if not excluded:
+                combos.append(combo)
+        return combos
+
+    def __generated(self, exclusions):
+        table = RunTableModel(factors=self.factors, exclude_combinations=exclusions).generate_experiment_run_table()
+        return [tuple(run[factor.factor_name] for factor in self.factors) for run in table]
+
+    def test_overlapping_exclusions(self):
+        # (0, 0, *, *) is matched by both exclusions, and must only be removed once
+        exclusions = [
+            {self.factors[0]: [0]},
+            {self.factors[0]: [0, 1], self.factors[1]: [0]},
+            {self.factors[1]: [2], self.factors[2]: [3]},
+            {self.factors[1]: [2], self.factors[2]: [1, 3], self.factors[3]: [0]},
+        ]
+        self.assertEqual(self.__generated(exclusions), self.__brute_force(exclusions))
+
+    def test_unknown_treatment(self):
+        exclusions = [{self.factors[0]: [0, 'not a level'], self.factors[1]: ['not a level']}]
+        self.assertEqual(len(self.__generated(exclusions)), 4 ** 4)
+
+    def test_unknown_factor(self):
+        with self.assertRaises(BaseError):
+            self.__generated([{FactorModel("unknown", [0]): [0]}])
+
+    def test_run_ids_follow_filtered_order(self):
+        table = RunTableModel(factors=self.factors, exclude_combinations=[{self.factors[3]: [1, 2, 3]}]).generate_experiment_run_table()
+        self.assertEqual([run['__run_id'] for run in table], [f'run_{i}_repetition_0' for i in range(4 ** 3)])
+
+
 if __name__ == '__main__':
     unittest.main()
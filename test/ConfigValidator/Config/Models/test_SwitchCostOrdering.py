@@ -0,0 +1,65 @@
+import unittest
+import itertools
+
+import numpy as np
+
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.Config.Models.SwitchCostOrdering import SwitchCostOrdering
+from ConfigValidator.CustomErrors.BaseError import BaseError
+
+
+class TestSwitchCostOrdering(unittest.TestCase):
+    def setUp(self):
+        self.compiler = FactorModel("compiler", ['gcc', 'clang', 'icc'])
+        self.opt = FactorModel("opt", ['O0', 'O2'])
+        self.input = FactorModel("input", [1, 2, 3, 4])
+
+    def __run_table(self, **kwargs):
+        return list(RunTableModel(
+            factors=[self.compiler, self.opt, self.input],
+            repetitions=3,
+            ordering=SwitchCostOrdering({self.compiler: 60000, self.opt: 1000}, seed=42, **kwargs)
+        ).generate_run_table())
+
+    @staticmethod
+    def __switches(run_table, factor_name):
+        return sum(1 for previous, run in zip(run_table, run_table[1:]) if previous[factor_name] != run[factor_name])
+
+    def test_blocks_per_repetition(self):
+        run_table = self.__run_table()
+        self.assertEqual(len({run['__run_id'] for run in run_table}), 3 * 2 * 4 * 3)
+
+        # Every repetition executes every compiler in one block, the next repetition starts with the last compiler
+        for repetition in range(3):
+            block = run_table[repetition * 24:(repetition + 1) * 24]
+            self.assertEqual({run['__run_id'].split('_')[-1] for run in block}, {str(repetition)})
+            self.assertEqual(self.__switches(block, 'compiler'), 2)
+            self.assertEqual(len([level for level, _ in itertools.groupby(block, key=lambda run: run['compiler'])]), 3)
+        self.assertEqual(self.__switches(run_table, 'compiler'), 6)
+
+    def test_blocks_over_repetitions(self):
+        run_table = self.__run_table(block_repetitions=False)
+        self.assertEqual(self.__switches(run_table, 'compiler'), 2)
+        self.assertEqual(self.__switches(run_table, 'opt'), 3)
+
+    def test_seeded_orders_are_deterministic(self):
+        self.assertEqual([run['__run_id'] for run in self.__run_table()], [run['__run_id'] for run in self.__run_table()])
+
+    def test_expected_shuffled_switch_cost(self):
+        # Two levels of two rows each: consecutive rows have the same level with probability 1/3
+        levels = np.array([[0], [0], [1], [1]])
+        self.assertAlmostEqual(SwitchCostOrdering.expected_shuffled_switch_cost(levels, np.array([10.0])), 3 * 2 / 3 * 10)
+        self.assertEqual(SwitchCostOrdering.switch_cost(levels, np.array([10.0])), 10)
+
+    def test_invalid(self):
+        with self.assertRaises(BaseError):
+            SwitchCostOrdering({})
+        with self.assertRaises(BaseError):
+            RunTableModel(factors=[self.compiler], shuffle=True, ordering=SwitchCostOrdering({self.compiler: 1}))
+        with self.assertRaises(BaseError):
+            RunTableModel(factors=[self.compiler], ordering=SwitchCostOrdering({self.opt: 1})).generate_run_table()
+
+
+if __name__ == '__main__':
+    unittest.main()
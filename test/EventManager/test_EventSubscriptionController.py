@@ -0,0 +1,95 @@
+import unittest
+import asyncio
+import threading
+
+from EventManager.EventSubscriptionController import EventSubscriptionController
+from EventManager.Models.RunnerEvents import RunnerEvents
+from EventManager.Models.SubscriberMode import SubscriberMode
+
+
+class TestEventSubscriptionController(unittest.TestCase):
+    events = [RunnerEvents.START_MEASUREMENT, RunnerEvents.POPULATE_RUN_DATA]
+
+    def setUp(self):
+        self.calls = []
+        self.previous_callbacks = {event: EventSubscriptionController.get_event_callback(event) for event in self.events}
+        self.subscribers = []
+
+    def tearDown(self):
+        for event, subscriber in self.subscribers:
+            EventSubscriptionController.remove_subscriber(event, subscriber)
+        for event, callback in self.previous_callbacks.items():
+            EventSubscriptionController.subscribe_to_single_event(event, callback)
+
+    def __add(self, event, callback, priority=0, mode=SubscriberMode.SYNC):
+        self.subscribers.append((event, EventSubscriptionController.add_subscriber(event, callback, priority, mode)))
+
+    def __hook(self, name, result=None):
+        def hook(context):
+            self.calls.append(name)
+            return result
+        return hook
+
+    def test_priorities(self):
+        EventSubscriptionController.subscribe_to_single_event(RunnerEvents.START_MEASUREMENT, self.__hook('config'))
+        self.__add(RunnerEvents.START_MEASUREMENT, self.__hook('after'), priority=1)
+        self.__add(RunnerEvents.START_MEASUREMENT, self.__hook('before'), priority=-1)
+        self.__add(RunnerEvents.START_MEASUREMENT, self.__hook('next to config'))
+
+        # Replacing the hook of the config keeps its place
+        EventSubscriptionController.subscribe_to_single_event(RunnerEvents.START_MEASUREMENT, self.__hook('new config'))
+        EventSubscriptionController.raise_event(RunnerEvents.START_MEASUREMENT, 'context')
+        self.assertEqual(self.calls, ['before', 'new config', 'next to config', 'after'])
+
+    def test_remove_config_hook(self):
+        EventSubscriptionController.subscribe_to_single_event(RunnerEvents.START_MEASUREMENT, self.__hook('config'))
+        hook, = EventSubscriptionController.get_subscribers(RunnerEvents.START_MEASUREMENT)
+        EventSubscriptionController.remove_subscriber(RunnerEvents.START_MEASUREMENT, hook)
+        self.assertIsNone(EventSubscriptionController.get_event_callback(RunnerEvents.START_MEASUREMENT))
+
+        # The config can subscribe a hook again
+        EventSubscriptionController.subscribe_to_single_event(RunnerEvents.START_MEASUREMENT, self.__hook('new config'))
+        EventSubscriptionController.raise_event(RunnerEvents.START_MEASUREMENT, 'context')
+        self.assertEqual(self.calls, ['new config'])
+
+    def test_populate_run_data_merged(self):
+        EventSubscriptionController.subscribe_to_single_event(RunnerEvents.POPULATE_RUN_DATA, self.__hook('config', {'a': 1, 'b': 1}))
+        self.__add(RunnerEvents.POPULATE_RUN_DATA, self.__hook('none'))
+        self.__add(RunnerEvents.POPULATE_RUN_DATA, self.__hook('plugin', {'b': 2, 'c': 2}), priority=1)
+        self.assertEqual(EventSubscriptionController.raise_event(RunnerEvents.POPULATE_RUN_DATA, 'context'), {'a': 1, 'b': 2, 'c': 2})
+
+    def test_concurrent_subscribers(self):
+        EventSubscriptionController.subscribe_to_single_event(RunnerEvents.START_MEASUREMENT, None)
+        # Every subscriber waits for the others, which only returns if they are called at the same time
+        barrier = threading.Barrier(3, timeout=5)
+
+        def threaded(context):
+            barrier.wait()
+            return 'thread'
+
+        async def awaited(context):
+            await asyncio.sleep(0)
+            await asyncio.get_running_loop().run_in_executor(None, barrier.wait)
+            return 'async'
+
+        self.__add(RunnerEvents.START_MEASUREMENT, threaded, mode=SubscriberMode.THREAD)
+        self.__add(RunnerEvents.START_MEASUREMENT, awaited)
+        self.__add(RunnerEvents.START_MEASUREMENT, lambda context: barrier.wait())
+        self.assertEqual([subscriber.mode for subscriber in EventSubscriptionController.get_subscribers(RunnerEvents.START_MEASUREMENT)],
+                         [SubscriberMode.THREAD, SubscriberMode.ASYNC, SubscriberMode.SYNC])
+        self.assertEqual(EventSubscriptionController.raise_event(RunnerEvents.START_MEASUREMENT, 'context'), 'thread')
+
+    def test_exception_of_thread(self):
+        EventSubscriptionController.subscribe_to_single_event(RunnerEvents.START_MEASUREMENT, self.__hook('config'))
+
+        def failing(context):
+            raise RuntimeError('profiler failed')
+
+        self.__add(RunnerEvents.START_MEASUREMENT, failing, mode=SubscriberMode.THREAD)
+        with self.assertRaises(RuntimeError):
+            EventSubscriptionController.raise_event(RunnerEvents.START_MEASUREMENT, 'context')
+        self.assertEqual(self.calls, ['config'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import shutil
+import tempfile
+from pathlib import Path
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ExperimentOrchestrator.Experiment.Cooldown.CooldownController import CooldownController
+from ConfigValidator.Config.Models.CooldownProbe import (CallbackProbe, CpuUtilizationProbe,
+                                                       ThermalZoneProbe)
+
+
+class TestCooldownProbes(unittest.TestCase):
+    def setUp(self):
+        self.path = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_thermal_zones(self):
+        for idx, (zone_type, temp) in enumerate([('acpitz', 40000), ('x86_pkg_temp', 55500)]):
+            zone = self.path / f'thermal_zone{idx}'
+            zone.mkdir()
+            (zone / 'type').write_text(zone_type + '\n')
+            (zone / 'temp').write_text(f'{temp}\n')
+
+        self.assertEqual(ThermalZoneProbe(thermal_path=self.path).read(), 55.5)
+        self.assertEqual(ThermalZoneProbe(['acpitz'], thermal_path=self.path).read(), 40.0)
+        with self.assertRaises(BaseError):
+            ThermalZoneProbe(['gpu'], thermal_path=self.path)
+
+    def test_cpu_utilization(self):
+        stat = self.path / 'stat'
+        stat.write_text('cpu  100 0 100 800 0 0 0 0 0 0\ncpu0 100 0 100 800 0 0 0 0 0 0\n')
+        probe = CpuUtilizationProbe(stat_path=stat)
+
+        stat.write_text('cpu  175 0 100 825 0 0 0 0 0 0\n')
+        self.assertEqual(probe.read(), 75.0)
+        self.assertEqual(probe.read(), 0.0)
+
+
+class TestCooldownController(unittest.TestCase):
+
+    def test_waits_for_baseline(self):
+        readings = iter([10, 10, 30, 25, 20, 11, 11])
+        cooldown = CooldownController([CallbackProbe('power', lambda: next(readings), tolerance=1)],
+                                      min_wait_in_ms=0, max_wait_in_ms=5000, poll_interval_in_ms=10)
+        cooldown.capture_baseline()
+        self.assertEqual(cooldown.baseline, [10])
+
+        cooldown_ms = cooldown.cool_down()
+        self.assertGreaterEqual(cooldown_ms, 30)
+        self.assertLess(cooldown_ms, 5000)
+        self.assertEqual(next(readings), 11)  # Stopped polling once cooled down
+
+    def test_min_and_max_wait(self):
+        cooldown = CooldownController([CallbackProbe('power', lambda: 10, tolerance=1)],
+                                      min_wait_in_ms=100, max_wait_in_ms=1000, poll_interval_in_ms=10)
+        cooldown.capture_baseline()
+        self.assertGreaterEqual(cooldown.cool_down(), 100)
+
+        readings = iter([10, 10] + [50] * 1000)
+        cooldown = CooldownController([CallbackProbe('power', lambda: next(readings), tolerance=1)],
+                                      min_wait_in_ms=0, max_wait_in_ms=100, poll_interval_in_ms=10)
+        cooldown.capture_baseline()
+        self.assertLess(cooldown.cool_down(), 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
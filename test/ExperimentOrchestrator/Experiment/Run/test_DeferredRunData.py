@@ -0,0 +1,75 @@
+import multiprocessing
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from EventManager.EventSubscriptionController import EventSubscriptionController
+from EventManager.Models.RunnerEvents import RunnerEvents
+from ExperimentOrchestrator.Experiment.Run.DeferredRunData import DeferredRunData
+from ProgressManager.Output.CSVOutputManager import CSVOutputManager
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+
+def populate_run_data(context):
+    if context.execute_run['factor'] == 3:
+        time.sleep(60)  # A parser that hangs
+    if context.execute_run['factor'] == 2:
+        raise ValueError("Unreadable log")
+    return {'avg_cpu': context.execute_run['factor'] * 10, 'run_dir': context.run_dir.name}
+
+
+@unittest.skipUnless(multiprocessing.get_start_method() == 'fork', "Deferred run data relies on the fork start method")
+class TestDeferredRunData(unittest.TestCase):
+    def setUp(self):
+        self.experiment_path = Path(tempfile.mkdtemp())
+        self.data_manager = CSVOutputManager(self.experiment_path)
+        self.run_table = [{'__run_id': f'run_{i}_repetition_0', '__done': RunProgress.TODO, 'factor': i,
+                           'avg_cpu': ' ', 'run_dir': ' '} for i in range(3)]
+        self.data_manager.write_run_table(self.run_table)
+
+        self.previous_callback = EventSubscriptionController.get_event_callback(RunnerEvents.POPULATE_RUN_DATA)
+        EventSubscriptionController.subscribe_to_single_event(RunnerEvents.POPULATE_RUN_DATA, populate_run_data)
+
+    def tearDown(self):
+        EventSubscriptionController.subscribe_to_single_event(RunnerEvents.POPULATE_RUN_DATA, self.previous_callback)
+        shutil.rmtree(self.experiment_path)
+
+    def test_run_data_is_stored(self):
+        deferred_run_data = DeferredRunData(self.data_manager, max_workers=2)
+        try:
+            for current_run, variation in enumerate(self.run_table, start=1):
+                deferred_run_data.submit(variation, current_run, self.experiment_path / variation['__run_id'])
+            deferred_run_data.wait()
+        finally:
+            deferred_run_data.shutdown()
+
+        run_table = self.data_manager.read_run_table()
+        self.assertEqual([row['__done'] for row in run_table], [RunProgress.DONE, RunProgress.DONE, RunProgress.FAILED])
+        self.assertEqual([row['avg_cpu'] for row in run_table], [0, 10, ' '])
+        self.assertEqual(run_table[1]['run_dir'], 'run_1_repetition_0')
+
+    def test_timeout(self):
+        hanging = {'__run_id': 'run_3_repetition_0', '__done': RunProgress.TODO, 'factor': 3, 'avg_cpu': ' ', 'run_dir': ' '}
+        self.data_manager.write_run_table(self.run_table + [hanging])
+
+        deferred_run_data = DeferredRunData(self.data_manager, max_workers=2, timeout_in_ms=500)
+        try:
+            start = time.monotonic()
+            for current_run, variation in enumerate([hanging] + self.run_table, start=1):
+                deferred_run_data.submit(variation, current_run, self.experiment_path / variation['__run_id'])
+            deferred_run_data.wait()
+            self.assertLess(time.monotonic() - start, 10)
+        finally:
+            deferred_run_data.shutdown()
+
+        # The other runs are not affected by killing the process of the hanging one
+        run_table = self.data_manager.read_run_table()
+        self.assertEqual([row['__done'] for row in run_table],
+                         [RunProgress.DONE, RunProgress.DONE, RunProgress.FAILED, RunProgress.FAILED])
+        self.assertEqual([row['avg_cpu'] for row in run_table], [0, 10, ' ', ' '])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from ConfigValidator.Config.RunnerConfig import RunnerConfig
+from EventManager.EventSubscriptionController import EventSubscriptionController
+from EventManager.Models.RunnerEvents import RunnerEvents
+from ExperimentOrchestrator.Experiment.Run.RunController import RunController
+from ExperimentOrchestrator.Experiment.Run.RunWatchdog import RunPhase
+
+
+class TestRunController(unittest.TestCase):
+    def setUp(self):
+        self.config = RunnerConfig()
+        self.config.experiment_path = Path(tempfile.mkdtemp())
+        self.config.self_measure = False
+        self.previous_callback = EventSubscriptionController.get_event_callback(RunnerEvents.INTERACT)
+
+    def tearDown(self):
+        EventSubscriptionController.subscribe_to_single_event(RunnerEvents.INTERACT, self.previous_callback)
+        shutil.rmtree(self.config.experiment_path)
+
+    def test_hook_raises(self):
+        def interact(context):
+            raise RuntimeError("The subject crashed")
+        EventSubscriptionController.subscribe_to_single_event(RunnerEvents.INTERACT, interact)
+
+        phase = RunPhase({RunnerEvents.INTERACT: 60000})
+        controller = RunController({'__run_id': 'run_0_repetition_0'}, self.config, 1, 1, phase)
+        with self.assertRaises(RuntimeError):
+            controller.run()
+
+        # The phase the hook raised in is left, and ended in the timeline
+        self.assertIsNone(phase.phase)
+        self.assertFalse(phase.expired())
+        self.assertEqual([name for name, *_ in controller.timeline.phases][-1], 'interact')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+import json
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from ExperimentOrchestrator.Experiment.Run.RunTimeline import RunTimeline
+
+
+class TestRunTimeline(unittest.TestCase):
+    def test_phases(self):
+        timeline = RunTimeline()
+        timeline.enter('start_run')
+        time.sleep(0.01)
+        timeline.enter('interact')
+        with timeline.measure('store_run_data'):
+            pass
+        timeline.enter(None)
+
+        self.assertEqual([phase[0] for phase in timeline.phases], ['start_run', 'store_run_data', 'interact'])
+        durations = timeline.durations_in_ms()
+        self.assertEqual(set(durations.keys()), {'__t_start_run_ms', '__t_interact_ms'})  # Overhead is not a data column
+        self.assertGreaterEqual(durations['__t_start_run_ms'], 10)
+        self.assertTrue(set(durations.keys()) <= set(RunTimeline.data_columns()))
+
+    def test_write(self):
+        run_dir = Path(tempfile.mkdtemp())
+        try:
+            timeline = RunTimeline()
+            timeline.record('dispatch', timeline.created_ns, timeline.created_ns + 2500000)
+            timeline.write(run_dir, 'run_0_repetition_0')
+
+            with open(run_dir / 'timeline.json') as f:
+                written = json.load(f)
+            self.assertEqual(written['run_id'], 'run_0_repetition_0')
+            self.assertEqual(written['phases'], [{'name': 'dispatch', 'start_ns': timeline.created_ns,
+                                                  'end_ns': timeline.created_ns + 2500000, 'duration_ms': 2.5}])
+        finally:
+            shutil.rmtree(run_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import subprocess
+import time
+import unittest
+
+import psutil
+
+from ConfigValidator.Config.Models.RetryPolicy import RetryPolicy
+from EventManager.Models.RunnerEvents import RunnerEvents
+from ExperimentOrchestrator.Experiment.Run.RunWatchdog import RunPhase, kill_process_tree
+
+
+class TestRunPhase(unittest.TestCase):
+
+    def test_phase_timeouts(self):
+        phase = RunPhase({RunnerEvents.INTERACT: 50})
+        self.assertIsNone(phase.phase)
+
+        phase.enter(RunnerEvents.START_RUN)
+        self.assertEqual(phase.phase, RunnerEvents.START_RUN)
+        self.assertEqual(phase.seconds_until_deadline(), float('inf'))
+
+        phase.enter(RunnerEvents.INTERACT)
+        self.assertFalse(phase.expired())
+        self.assertLessEqual(phase.seconds_until_deadline(), 0.05)
+        time.sleep(0.06)
+        self.assertTrue(phase.expired())
+
+        phase.enter(None)
+        self.assertFalse(phase.expired())
+
+    def test_kill_process_tree(self):
+        parent = subprocess.Popen(['sh', '-c', 'sleep 100 & sleep 100 & wait'])
+        time.sleep(0.2)
+        children = psutil.Process(parent.pid).children(recursive=True)
+        self.assertEqual(len(children), 2)
+
+        kill_process_tree(parent.pid)
+        parent.wait(timeout=5)
+        self.assertFalse(any(child.is_running() and child.status() != psutil.STATUS_ZOMBIE for child in children))
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_retry_policy(self):
+        policy = RetryPolicy(max_attempts=5, backoff_in_ms=100, backoff_factor=3, max_backoff_in_ms=1000,
+                             retry_on=(ConnectionError,))
+        self.assertEqual([policy.delay_in_ms(attempt) for attempt in range(1, 5)], [100, 300, 900, 1000])
+        self.assertTrue(policy.is_retryable(ConnectionResetError()))
+        self.assertFalse(policy.is_retryable(ValueError()))
+
+
+if __name__ == '__main__':
+    unittest.main()
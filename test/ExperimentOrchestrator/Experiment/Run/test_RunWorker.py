@@ -0,0 +1,56 @@
+import multiprocessing
+import multiprocessing.connection
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from ConfigValidator.Config.RunnerConfig import RunnerConfig
+from ExperimentOrchestrator.Experiment.Run.RunWorker import RunWorker
+from ProgressManager.Output.CSVOutputManager import CSVOutputManager
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+
+@unittest.skipUnless(multiprocessing.get_start_method() == 'fork', "Run workers rely on the fork start method")
+class TestRunWorker(unittest.TestCase):
+    def setUp(self):
+        self.config = RunnerConfig()
+        self.config.experiment_path = Path(tempfile.mkdtemp())
+        self.config.self_measure = False
+
+        self.run_table = [{'__run_id': f'run_{i}_repetition_0', '__done': RunProgress.TODO, 'factor': i}
+                          for i in range(3)]
+        CSVOutputManager(self.config.experiment_path).write_run_table(self.run_table)
+
+    def tearDown(self):
+        shutil.rmtree(self.config.experiment_path)
+
+    def __execute(self, worker, variation):
+        worker.submit(variation, 1, len(self.run_table))
+        multiprocessing.connection.wait([worker.connection])
+        return worker.collect()
+
+    def test_worker_is_reused(self):
+        worker = RunWorker(self.config, max_runs=5)
+        pid = worker.process.pid
+
+        self.assertTrue(self.__execute(worker, self.run_table[0]))
+        self.assertTrue(self.__execute(worker, self.run_table[1]))
+        self.assertEqual(worker.process.pid, pid)
+        self.assertTrue(worker.process.is_alive())
+        worker.stop()
+
+        run_table = CSVOutputManager(self.config.experiment_path).read_run_table()
+        self.assertEqual([row['__done'] for row in run_table], [RunProgress.DONE, RunProgress.DONE, RunProgress.TODO])
+
+    def test_worker_is_recycled(self):
+        worker = RunWorker(self.config, max_runs=2)
+
+        self.assertTrue(self.__execute(worker, self.run_table[0]))
+        self.assertFalse(self.__execute(worker, self.run_table[1]))
+        self.assertFalse(worker.process.is_alive())
+        worker.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
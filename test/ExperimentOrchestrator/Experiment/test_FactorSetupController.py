@@ -0,0 +1,76 @@
+import unittest
+
+from ConfigValidator.Config.RunnerConfig import RunnerConfig
+from EventManager.EventSubscriptionController import EventSubscriptionController
+from EventManager.Models.RunnerEvents import RunnerEvents
+from ExperimentOrchestrator.Experiment.FactorSetupController import FactorSetupController
+
+
+class TestFactorSetupController(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.previous_callbacks = {event: EventSubscriptionController.get_event_callback(event)
+                                   for event in [RunnerEvents.SETUP_FACTOR_LEVEL, RunnerEvents.TEARDOWN_FACTOR_LEVEL]}
+        EventSubscriptionController.subscribe_to_multiple_events([
+            (RunnerEvents.SETUP_FACTOR_LEVEL, self.setup_factor_level),
+            (RunnerEvents.TEARDOWN_FACTOR_LEVEL, self.teardown_factor_level),
+        ])
+
+    def tearDown(self):
+        for event, callback in self.previous_callbacks.items():
+            EventSubscriptionController.subscribe_to_single_event(event, callback)
+
+    def setup_factor_level(self, context):
+        self.calls.append(('setup', context.factor_name, context.treatment, context.setup))
+        if context.factor_name == 'compiler':
+            return context.setup or f'build/{context.treatment}'
+
+    def teardown_factor_level(self, context):
+        self.calls.append(('teardown', context.factor_name, context.treatment, context.setup))
+
+    @staticmethod
+    def __runs(*levels):
+        return [{'__run_id': f'run_{i}_repetition_0', 'compiler': compiler, 'size': size}
+                for i, (compiler, size) in enumerate(levels)]
+
+    def test_template_is_opt_in(self):
+        # The hooks of the config template do nothing, so they are not subscribed by default
+        for event in [RunnerEvents.SETUP_FACTOR_LEVEL, RunnerEvents.TEARDOWN_FACTOR_LEVEL]:
+            EventSubscriptionController.subscribe_to_single_event(event, None)
+        RunnerConfig()
+        self.assertFalse(FactorSetupController.is_subscribed())
+
+    def test_setup_on_change(self):
+        controller = FactorSetupController(['compiler', 'size'])
+        self.assertTrue(controller.is_subscribed())
+
+        runs = self.__runs(('gcc', 1), ('gcc', 2), ('clang', 2), ('gcc', 2))
+        factor_setups = [controller.setup(run) for run in runs]
+        controller.teardown_all()
+
+        self.assertEqual(factor_setups[1], {'compiler': 'build/gcc', 'size': None})
+        self.assertEqual(self.calls, [
+            ('setup', 'compiler', 'gcc', None),
+            ('setup', 'size', 1, None),
+            ('teardown', 'size', 1, None),
+            ('setup', 'size', 2, None),
+            ('teardown', 'compiler', 'gcc', 'build/gcc'),
+            ('setup', 'compiler', 'clang', None),
+            ('teardown', 'compiler', 'clang', 'build/clang'),
+            ('setup', 'compiler', 'gcc', 'build/gcc'),  # The earlier setup is memoized
+            ('teardown', 'compiler', 'gcc', 'build/gcc'),
+            ('teardown', 'size', 2, None),
+        ])
+
+    def test_parallel_keeps_levels(self):
+        controller = FactorSetupController(['compiler', 'size'], exclusive=False)
+        for run in self.__runs(('gcc', 1), ('clang', 1), ('gcc', 1)):
+            controller.setup(run)
+        self.assertEqual([call[0] for call in self.calls], ['setup', 'setup', 'setup'])
+
+        controller.teardown_all()
+        self.assertEqual([call[2] for call in self.calls if call[0] == 'teardown'], ['gcc', 'clang', 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import time
+import unittest
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ExperimentOrchestrator.Experiment.ResourceSlotPool import ResourceSlotPool
+
+
+class TestResourceSlotPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = ResourceSlotPool(["cores 0-7", "cores 8-15", "gpu0"])
+
+    def test_duplicate_slots(self):
+        with self.assertRaises(BaseError):
+            ResourceSlotPool(["gpu0", "gpu0"])
+
+    def test_undeclared_slot(self):
+        with self.assertRaises(BaseError):
+            self.pool.validate(["gpu1"])
+
+    def test_disjoint_slots(self):
+        self.pool.acquire(["cores 0-7", "gpu0"])
+        self.assertTrue(self.pool.is_available(["cores 8-15"]))
+        self.assertFalse(self.pool.is_available(["cores 8-15", "gpu0"]))
+
+        with self.assertRaises(BaseError):
+            self.pool.acquire(["gpu0"])
+
+        self.pool.release(["cores 0-7", "gpu0"])
+        self.assertTrue(self.pool.is_available(["gpu0"]))
+
+    def test_no_slots_always_available(self):
+        self.pool.acquire(["cores 0-7", "cores 8-15", "gpu0"])
+        self.assertTrue(self.pool.is_available([]))
+
+    def test_cooldown(self):
+        pool = ResourceSlotPool(["gpu0"], cooldown_in_ms=200)
+        pool.acquire(["gpu0"])
+        pool.release(["gpu0"])
+
+        self.assertFalse(pool.is_available(["gpu0"]))
+        self.assertGreater(pool.seconds_until_release(), 0)
+
+        time.sleep(pool.seconds_until_release())
+        self.assertTrue(pool.is_available(["gpu0"]))
+        self.assertEqual(pool.seconds_until_release(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
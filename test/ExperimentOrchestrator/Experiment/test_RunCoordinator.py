@@ -0,0 +1,114 @@
+import unittest
+import multiprocessing
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from ExperimentOrchestrator.Experiment.RunCoordinator import LeaseState, RunCoordinator
+from ProgressManager.Output.SQLiteOutputManager import SQLiteOutputManager
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+NR_RUNS = 30
+
+
+def _run_table():
+    return [{'__run_id': f'run_{i}_repetition_0', '__done': RunProgress.TODO, 'node': ' '} for i in range(NR_RUNS)]
+
+
+def _node(experiment_path, node_id):
+    coordinator = RunCoordinator(experiment_path, lease_in_ms=5000, node_id=node_id)
+    manager = SQLiteOutputManager(experiment_path, wal=False)
+    with coordinator.setup():
+        if not coordinator.run_table_exists():
+            manager.write_run_table(_run_table())
+
+    for run in coordinator.claim_runs(_run_table(), poll_interval_in_s=0.01):
+        time.sleep(0.005)
+        manager.update_row_data({'__run_id': run['__run_id'], '__done': RunProgress.DONE, 'node': node_id})
+        coordinator.release(run['__run_id'])
+
+
+class TestRunCoordinator(unittest.TestCase):
+    def setUp(self):
+        self.experiment_path = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.experiment_path)
+
+    def __coordinator(self, node_id, lease_in_ms=1000):
+        coordinator = RunCoordinator(self.experiment_path, lease_in_ms, node_id=node_id)
+        with coordinator.setup():
+            if not coordinator.run_table_exists():
+                SQLiteOutputManager(self.experiment_path, wal=False).write_run_table(_run_table())
+        return coordinator
+
+    def test_nodes_execute_every_run_once(self):
+        nodes = [multiprocessing.get_context('fork').Process(target=_node, args=(self.experiment_path, f'node{i}'))
+                 for i in range(4)]
+        for node in nodes:
+            node.start()
+        for node in nodes:
+            node.join()
+            self.assertEqual(node.exitcode, 0)
+
+        run_table = SQLiteOutputManager(self.experiment_path).read_run_table()
+        self.assertTrue(all(row['__done'] == RunProgress.DONE for row in run_table))
+        self.assertTrue({row['node'] for row in run_table} <= {f'node{i}' for i in range(4)})
+
+    def test_claim(self):
+        first, second = self.__coordinator('first'), self.__coordinator('second')
+
+        self.assertIs(first.claim('run_0_repetition_0'), LeaseState.CLAIMED)
+        self.assertIs(first.claim('run_0_repetition_0'), LeaseState.CLAIMED)  # Claiming again renews the lease
+        self.assertIs(second.claim('run_0_repetition_0'), LeaseState.BUSY)
+        self.assertIs(second.claim('run_1_repetition_0'), LeaseState.CLAIMED)
+
+        # A released run that is not done (it failed) can be claimed again
+        first.release('run_0_repetition_0')
+        self.assertIs(second.claim('run_0_repetition_0'), LeaseState.CLAIMED)
+
+        SQLiteOutputManager(self.experiment_path).update_row_data({'__run_id': 'run_2_repetition_0', '__done': RunProgress.DONE})
+        self.assertIs(first.claim('run_2_repetition_0'), LeaseState.DONE)
+
+    def test_lease_expires(self):
+        crashed, other = self.__coordinator('crashed', lease_in_ms=100), self.__coordinator('other', lease_in_ms=100)
+
+        self.assertIs(crashed.claim('run_0_repetition_0'), LeaseState.CLAIMED)
+        self.assertIs(other.claim('run_0_repetition_0'), LeaseState.BUSY)
+        time.sleep(0.15)
+        self.assertIs(other.claim('run_0_repetition_0'), LeaseState.CLAIMED)
+
+    def test_heartbeat_renews_lease(self):
+        executing, other = self.__coordinator('executing', lease_in_ms=300), self.__coordinator('other', lease_in_ms=300)
+
+        self.assertIs(executing.claim('run_0_repetition_0'), LeaseState.CLAIMED)
+        for _ in range(4):
+            time.sleep(0.1)
+            executing.heartbeat()
+        self.assertIs(other.claim('run_0_repetition_0'), LeaseState.BUSY)
+
+    def test_keep_alive(self):
+        # E.g. a before_run hook that takes longer than the lease, without heartbeats of its own
+        executing, other = self.__coordinator('executing', lease_in_ms=300), self.__coordinator('other', lease_in_ms=300)
+
+        self.assertIs(executing.claim('run_0_repetition_0'), LeaseState.CLAIMED)
+        with executing.keep_alive():
+            time.sleep(0.5)
+        self.assertIs(other.claim('run_0_repetition_0'), LeaseState.BUSY)
+        self.assertTrue(executing.holds('run_0_repetition_0'))
+
+    def test_lost_lease(self):
+        stalled, other = self.__coordinator('stalled', lease_in_ms=100), self.__coordinator('other', lease_in_ms=100)
+
+        self.assertIs(stalled.claim('run_0_repetition_0'), LeaseState.CLAIMED)
+        time.sleep(0.15)
+        self.assertIs(other.claim('run_0_repetition_0'), LeaseState.CLAIMED)
+
+        self.assertTrue(stalled.holds('run_0_repetition_0'))
+        stalled.heartbeat(force=True)
+        self.assertFalse(stalled.holds('run_0_repetition_0'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import threading
+import time
+import unittest
+import sys
+
+sys.path.append("experiment-runner")
+from Plugins.Profilers.DataSource import SamplingScheduler
+
+class TestSamplingScheduler(unittest.TestCase):
+    def test_no_drift(self):
+        scheduler = SamplingScheduler(20)
+        timestamps = []
+        for timestamp_ns in scheduler:
+            timestamps.append(timestamp_ns)
+            time.sleep(0.005)  # The time a sample takes does not add to the interval
+            if len(timestamps) == 10:
+                break
+
+        # Every sample is taken at (or just after) its deadline, not 9 * 5 ms later
+        self.assertLess((timestamps[-1] - timestamps[0]) / 1e6, 9 * 20 + 10)
+        self.assertGreaterEqual((timestamps[-1] - timestamps[0]) / 1e6, 9 * 20 - 1)
+        self.assertEqual(scheduler.missed, 0)
+        self.assertEqual(scheduler.samples, 10)
+
+    def test_missed_deadlines(self):
+        scheduler = SamplingScheduler(10)
+        timestamps = []
+        for timestamp_ns in scheduler:
+            timestamps.append(timestamp_ns)
+            if len(timestamps) == 1:
+                time.sleep(0.035)  # Passes the deadlines at 10 and 20 ms, and starts the one at 30 ms late
+            if len(timestamps) == 3:
+                break
+
+        self.assertEqual(scheduler.missed, 2)
+        # The next samples keep to the original schedule
+        self.assertAlmostEqual((timestamps[1] - timestamps[0]) / 1e6, 35, delta=4)
+        self.assertAlmostEqual((timestamps[2] - timestamps[0]) / 1e6, 40, delta=4)
+
+    def test_stop_event(self):
+        stop = threading.Event()
+        scheduler = SamplingScheduler(1000, stop, immediate=False)
+        threading.Timer(0.05, stop.set).start()
+
+        start = time.monotonic()
+        self.assertEqual(list(scheduler), [])
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_wall_clock(self):
+        scheduler = SamplingScheduler(10)
+        self.assertAlmostEqual(scheduler.wall_clock_ns(time.monotonic_ns()) / 1e9, time.time(), delta=0.01)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pynvml as nvml
+
+sys.path.append("experiment-runner")
+from Plugins.Profilers.NvidiaML import NvidiaML, NVML_LogWriter, NVML_Dynamic_Query
+from Plugins.Profilers.TimeSeries import TimeSeries
+
+# Measurements as NvidiaML.measure() returns them (timestamped in us): samples, a field with an error and
+# a query returning a dict
+MEASUREMENTS = [
+    ("enc_utilization_samples",   100, 10),
+    ("enc_utilization_samples",   200, 20),
+    ("NVML_FI_DEV_POWER_INSTANT", 150, nvml.NVMLError(nvml.NVML_ERROR_NOT_SUPPORTED)),
+    ("NVML_FI_DEV_POWER_INSTANT", 250, 42000),
+    ("NVML_UTILIZATION_RATES",    300, {"gpu": 75, "memory": 30}),
+    ("NVML_NAME",                 300, "not a number"),
+]
+
+class TestNvidiaML(unittest.TestCase):
+    def setUp(self):
+        self.logfile = tempfile.mktemp()
+
+    def tearDown(self):
+        for path in [self.logfile, NVML_LogWriter.metrics_file(self.logfile)]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def write_log(self, log_format, batch_size):
+        writer = NVML_LogWriter(self.logfile, log_format, batch_size)
+        for name, timestamp, value in MEASUREMENTS:
+            writer.write(name, timestamp, value)
+        writer.close()
+
+    def assert_parsed(self, log_data):
+        self.assertEqual(set(log_data.keys()), {"enc_utilization_samples", "NVML_FI_DEV_POWER_INSTANT",
+                                                "NVML_UTILIZATION_RATES.gpu", "NVML_UTILIZATION_RATES.memory"})
+        for samples in log_data.values():
+            self.assertIsInstance(samples, TimeSeries)
+
+        enc = log_data["enc_utilization_samples"]
+        self.assertTrue(np.allclose(enc.timestamps, [100e-6, 200e-6]))
+        self.assertListEqual(enc["value"].tolist(), [10.0, 20.0])
+
+        power = log_data["NVML_FI_DEV_POWER_INSTANT"]
+        self.assertTrue(np.allclose(power.timestamps, [150e-6, 250e-6]))
+        self.assertListEqual(power["error"].tolist(), [nvml.NVML_ERROR_NOT_SUPPORTED, 0])
+        self.assertTrue(np.isnan(power["value"][0]))
+        self.assertEqual(log_data["NVML_UTILIZATION_RATES.gpu"]["value"][0], 75.0)
+
+    def test_measure_timestamps(self):
+        # Queries and fields get the time their sample was due at, samples keep the timestamps of NVML
+        plugin = NvidiaML.__new__(NvidiaML)
+        plugin.measurements = {"samples": [], "fields": [], "queries": [NVML_Dynamic_Query.NVML_POWER_USAGE]}
+        plugin.main_handle = plugin.thread_handle = None
+        plugin._query_device = lambda handle, query: 42000
+        plugin._query_fields = lambda handle, fields: {}
+
+        self.assertDictEqual(plugin.measure(1_700_000_000_123_456_789),
+                             {"NVML_POWER_USAGE": (1_700_000_000_123_456, 42000)})
+
+    def test_binary(self):
+        # A batch size that does not divide the number of records, so the last batch is written on close
+        self.write_log("binary", 2)
+        self.assert_parsed(NvidiaML.parse_log(self.logfile))
+
+        power = NvidiaML.parse_log(self.logfile, remove_errors=True)["NVML_FI_DEV_POWER_INSTANT"]
+        self.assertEqual(len(power), 1)
+
+        power = NvidiaML.parse_log(self.logfile, as_dict=True)["NVML_FI_DEV_POWER_INSTANT"]
+        self.assertListEqual(power, [(150, "Not Supported"), (250, 42000.0)])
+
+    def test_binary_partial_record(self):
+        self.write_log("binary", 2)
+        with open(self.logfile, "ab") as f:
+            f.write(b"\0" * 5)
+
+        self.assert_parsed(NvidiaML.parse_log(self.logfile))
+
+    def test_ndjson(self):
+        self.write_log("ndjson", 1024)
+        self.assert_parsed(NvidiaML.parse_log(self.logfile))
+
+    def test_json(self):
+        log_data = {name: [] for name, _, _ in MEASUREMENTS}
+        for name, timestamp, value in MEASUREMENTS:
+            log_data[name].append((timestamp, str(value) if isinstance(value, nvml.NVMLError) else value))
+        with open(self.logfile, "w") as f:
+            json.dump(log_data, f)
+
+        self.assert_parsed(NvidiaML.parse_log(self.logfile))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import plistlib
+import sys
+import tempfile
+import unittest
+
+sys.path.append("experiment-runner")
+from Plugins.Profilers.PlistLog import PlistLog
+from Plugins.Profilers.PowerMetrics import PowerMetrics
+from Plugins.Profilers.PowerLetrics import PowerLetrics
+
+def sample(i):
+    return {"timestamp": f"sample {i}",
+            "processor": {"package_joules": float(i), "packages": [{"cores_active_ratio": 0.5}]},
+            "GPU": [{"freq_hz": 100, "misc_counters": {}, "p_states": []}]}
+
+class TestPlistLog(unittest.TestCase):
+    def setUp(self):
+        self.logfile = tempfile.mktemp(suffix=".plist")
+
+    def tearDown(self):
+        if os.path.exists(self.logfile):
+            os.remove(self.logfile)
+
+    def write_log(self, samples, header=b"", partial=b""):
+        # Like powermetrics: plists separated by null bytes, the last one possibly still being written
+        with open(self.logfile, "wb") as f:
+            f.write(header)
+            for i, plist in enumerate(samples):
+                f.write((b"\0" if i > 0 else b"") + plistlib.dumps(plist) + b"\n")
+            f.write(partial)
+
+    def test_parse_log(self):
+        self.write_log([sample(i) for i in range(5)], partial=b"\0<?xml version=\"1.0\"")
+
+        log = PowerMetrics.parse_log(self.logfile)
+        self.assertEqual(len(log), 5)
+        self.assertListEqual([plist["processor"]["package_joules"] for plist in log], [0.0, 1.0, 2.0, 3.0, 4.0])
+
+        power = PowerMetrics.parse_plist_power(log)
+        self.assertNotIn("packages", power[0]["processor"])
+        self.assertNotIn("p_states", power[0]["GPU"][0])
+        # The plists are left as they were
+        self.assertIn("packages", log[0]["processor"])
+
+    def test_keys_and_processes(self):
+        self.write_log([sample(i) for i in range(50)])
+
+        log = list(PlistLog(self.logfile, keys=["timestamp"], processes=2, batch_size=16))
+        self.assertListEqual(log, [{"timestamp": f"sample {i}"} for i in range(50)])
+
+    def test_powerletrics(self):
+        processes = [[{"Name": "python", "CPU Utilization (%)": float(i), "Energy Footprint": 1}] for i in range(3)]
+        self.write_log(processes, header=b"Some output\nbefore the samples\n")
+
+        log = PowerLetrics.parse_log(self.logfile, keys=["Name"])
+        self.assertListEqual(log, [[{"Name": "python"}]] * 3)
+
+    def test_empty(self):
+        self.write_log([])
+        self.assertListEqual(PowerMetrics.parse_log(self.logfile), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.append("experiment-runner")
+from Plugins.Profilers.ProcFS import ProcFS
+
+class TestProcFS(unittest.TestCase):
+    def setUp(self):
+        self.logfile = tempfile.mktemp(suffix=".csv")
+        # A shell whose child keeps a core busy
+        self.target = subprocess.Popen(["sh", "-c", "while :; do :; done & wait"])
+        time.sleep(0.2)
+
+    def tearDown(self):
+        subprocess.run(["pkill", "-P", str(self.target.pid)])
+        self.target.kill()
+        self.target.wait()
+        if os.path.exists(self.logfile):
+            os.remove(self.logfile)
+
+    def test_invalid_column(self):
+        with self.assertRaises(RuntimeError):
+            ProcFS(out_format=["%cpu", "not-a-column"])
+
+    def test_follows_children(self):
+        plugin = ProcFS(sample_frequency=50, out_file=self.logfile, target_pid=[self.target.pid],
+                        out_format=["pid", "%cpu", "%mem", "rss", "nproc"])
+        self.assertEqual(len(plugin.list_devices()[self.target.pid]), 2)
+
+        plugin.start()
+        time.sleep(0.5)
+        rows = plugin.stop()
+
+        log = plugin.parse_log(self.logfile, ["pid", "cpu", "mem", "rss", "nproc"])
+        self.assertEqual(len(log["cpu"]), len(rows))
+        self.assertGreaterEqual(len(rows), 8 - plugin.missed_samples)
+        self.assertEqual(set(log["pid"]), {self.target.pid})
+        self.assertEqual(set(log["nproc"]), {2})
+        self.assertGreater(log["cpu"].max(), 50)
+        self.assertGreater(log["rss"].min(), 0)
+
+    def test_without_children(self):
+        plugin = ProcFS(sample_frequency=50, out_file=None, target_pid=[self.target.pid],
+                        out_format=["%cpu", "nproc"], follow_children=False)
+        plugin.start()
+        time.sleep(0.3)
+        rows = plugin.stop()
+
+        # The shell itself only waits
+        self.assertTrue(all(nproc == 1 and cpu < 50 for cpu, nproc in rows))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.append("experiment-runner")
+from Plugins.Profilers.TimeSeries import TimeSeries
+from Plugins.Profilers.EnergiBridge import EnergiBridge
+
+class TestTimeSeries(unittest.TestCase):
+    def setUp(self):
+        # A power of 10 W for 2 s, then 20 W for 2 s, sampled every second from t = 100 s
+        self.series = TimeSeries({"power": np.array([10, 10, 10, 20, 20]), "cpu": np.array([1.0, np.nan, 3.0, 5.0, 7.0])},
+                                 np.arange(100, 105))
+
+    def test_columns(self):
+        self.assertEqual(len(self.series), 5)
+        self.assertListEqual(list(self.series), ["power", "cpu"])
+        self.assertIn("power", self.series)
+        self.assertEqual(self.series.to_dict()["power"], {0: 10, 1: 10, 2: 10, 3: 20, 4: 20})
+
+        with self.assertRaises(RuntimeError):
+            TimeSeries({"power": np.array([1, 2])}, np.arange(3))
+
+    def test_reductions(self):
+        self.assertEqual(self.series.mean("cpu"), 4.0)
+        self.assertEqual(self.series.percentile("power", 50), 10)
+        self.assertEqual(self.series.integrate("power"), 10 * 2 + 15 + 20)
+
+        window = self.series.window(101, 103)
+        self.assertListEqual(window.timestamps.tolist(), [101, 102])
+        self.assertEqual(window.integrate("power"), 10)
+
+        with self.assertRaises(RuntimeError):
+            TimeSeries({"power": np.array([1, 2])}).integrate("power")
+
+    def test_phase(self):
+        # monotonic_ns() + offset is the wall clock time, the interact phase is from 101 s to 103.5 s
+        offset_ns = 50 * 10**9
+        timeline = {"wall_clock_offset_ns": offset_ns,
+                    "phases": [{"name": "start_run", "start_ns": 50 * 10**9, "end_ns": 51 * 10**9},
+                               {"name": "interact",  "start_ns": 51 * 10**9, "end_ns": 53_500_000_000}]}
+
+        interact = self.series.phase(timeline, "interact")
+        self.assertListEqual(interact.timestamps.tolist(), [101, 102, 103])
+
+        with self.assertRaises(RuntimeError):
+            self.series.phase(timeline, "not_a_phase")
+        with self.assertRaises(RuntimeError):
+            self.series.phase({"phases": timeline["phases"]}, "interact")
+
+    def test_parse_log(self):
+        logfile = tempfile.mktemp(suffix=".csv")
+        pd.DataFrame({"Delta": [0, 1000, 1000], "Time": [100000, 101000, 102000],
+                      "PACKAGE_ENERGY (J)": [5.0, 7.0, 10.0]}).to_csv(logfile, index=False)
+        try:
+            log = EnergiBridge.parse_log(logfile)
+            self.assertListEqual(log.timestamps.tolist(), [100, 101, 102])
+            self.assertEqual(log["PACKAGE_ENERGY (J)"][-1] - log["PACKAGE_ENERGY (J)"][0], 5.0)
+
+            self.assertDictEqual(EnergiBridge.parse_log(logfile, as_dict=True)["Time"], {0: 100000, 1: 101000, 2: 102000})
+        finally:
+            os.remove(logfile)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import unittest
+import multiprocessing
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from ProgressManager.Output.CSVOutputManager import CSVOutputManager
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+
+def _update_rows(experiment_path, worker, nr_rows):
+    manager = CSVOutputManager(experiment_path)
+    for i in range(worker, nr_rows, 4):
+        manager.update_row_data({'__run_id': f'run_{i}_repetition_0', '__done': RunProgress.DONE, 'avg_cpu': i})
+
+
+class TestCSVOutputManagerJournal(unittest.TestCase):
+    def setUp(self):
+        self.experiment_path = Path(tempfile.mkdtemp())
+        self.manager = CSVOutputManager(self.experiment_path)
+        self.manager.write_run_table([
+            {'__run_id': f'run_{i}_repetition_0', '__done': RunProgress.TODO, 'factor': i, 'avg_cpu': ' '}
+            for i in range(3)
+        ])
+
+    def tearDown(self):
+        shutil.rmtree(self.experiment_path)
+
+    def test_update_is_journaled(self):
+        with open(self.experiment_path / 'run_table.csv') as f:
+            before = f.read()
+
+        self.manager.update_row_data({'__run_id': 'run_1_repetition_0', '__done': RunProgress.DONE,
+                                      'factor': 1, 'avg_cpu': 42})
+
+        with open(self.experiment_path / 'run_table.csv') as f:
+            self.assertEqual(before, f.read())
+        self.assertTrue((self.experiment_path / 'run_table.journal').exists())
+
+    def test_read_replays_journal(self):
+        self.manager.update_row_data({'__run_id': 'run_1_repetition_0', '__done': RunProgress.DONE,
+                                      'factor': 1, 'avg_cpu': 42})
+        self.manager.update_row_data({'__run_id': 'run_1_repetition_0', '__done': RunProgress.DONE,
+                                      'factor': 1, 'avg_cpu': 43})
+
+        run_table = self.manager.read_run_table()
+        self.assertEqual([row['__done'] for row in run_table], [RunProgress.TODO, RunProgress.DONE, RunProgress.TODO])
+        self.assertEqual(run_table[1]['avg_cpu'], 43)
+
+    def test_partial_update(self):
+        self.manager.update_row_data({'__run_id': 'run_1_repetition_0', '__done': RunProgress.DONE,
+                                      'factor': 1, 'avg_cpu': 42})
+        self.manager.update_row_data({'__run_id': 'run_1_repetition_0', 'avg_cpu': 43})
+
+        run_table = self.manager.read_run_table()
+        self.assertEqual(run_table[1]['__done'], RunProgress.DONE)
+        self.assertEqual(run_table[1]['avg_cpu'], 43)
+
+    def test_torn_journal_line_is_ignored(self):
+        self.manager.update_row_data({'__run_id': 'run_0_repetition_0', '__done': RunProgress.DONE,
+                                      'factor': 0, 'avg_cpu': 1})
+        with open(self.experiment_path / 'run_table.journal', 'a') as f:
+            f.write('{"__run_id": "run_2_repe')
+
+        run_table = self.manager.read_run_table()
+        self.assertEqual(run_table[0]['__done'], RunProgress.DONE)
+        self.assertEqual(run_table[2]['__done'], RunProgress.TODO)
+
+    def test_checkpoint(self):
+        self.manager.update_row_data({'__run_id': 'run_2_repetition_0', '__done': RunProgress.DONE,
+                                      'factor': 2, 'avg_cpu': 7})
+        self.manager.checkpoint()
+
+        self.assertFalse((self.experiment_path / 'run_table.journal').exists())
+        with open(self.experiment_path / 'run_table.csv') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[3], 'run_2_repetition_0,DONE,2,7')
+
+    def test_run_table_permissions(self):
+        self.manager.update_row_data({'__run_id': 'run_2_repetition_0', '__done': RunProgress.DONE,
+                                      'factor': 2, 'avg_cpu': 7})
+        self.manager.checkpoint()
+
+        self.assertEqual(os.stat(self.experiment_path / 'run_table.csv').st_mode & 0o777, 0o644)
+        self.assertEqual([path.name for path in self.experiment_path.iterdir() if path.name.startswith('tmp')], [])
+
+    def test_checkpoint_during_updates(self):
+        nr_rows = 200
+        self.manager.write_run_table([{'__run_id': f'run_{i}_repetition_0', '__done': RunProgress.TODO, 'avg_cpu': ' '}
+                                      for i in range(nr_rows)])
+
+        workers = [multiprocessing.get_context('fork').Process(target=_update_rows, args=(self.experiment_path, worker, nr_rows))
+                   for worker in range(4)]
+        for worker in workers:
+            worker.start()
+        # No entry may get lost in a journal that is being checkpointed
+        while any(worker.is_alive() for worker in workers):
+            self.manager.checkpoint()
+        for worker in workers:
+            worker.join()
+            self.assertEqual(worker.exitcode, 0)
+        self.manager.checkpoint()
+
+        run_table = self.manager.read_run_table()
+        self.assertTrue(all(row['__done'] == RunProgress.DONE for row in run_table))
+        self.assertEqual([row['avg_cpu'] for row in run_table], list(range(nr_rows)))
+
+    def test_append_run_table(self):
+        self.manager.update_row_data({'__run_id': 'run_0_repetition_0', '__done': RunProgress.DONE,
+                                      'factor': 0, 'avg_cpu': 3})
+        self.manager.append_run_table([{'__run_id': 'run_0_repetition_1', '__done': RunProgress.TODO,
+                                        'factor': 0, 'avg_cpu': ' '}])
+
+        run_table = self.manager.read_run_table()
+        self.assertEqual([row['__run_id'] for row in run_table][-2:], ['run_2_repetition_0', 'run_0_repetition_1'])
+        self.assertEqual(run_table[0]['avg_cpu'], 3)
+
+    def test_torn_appended_row_is_ignored(self):
+        with open(self.experiment_path / 'run_table.csv', 'a') as f:
+            f.write('run_0_repetition_1,TO')
+        self.assertEqual(len(self.manager.read_run_table()), 3)
+
+        self.manager.append_run_table([{'__run_id': 'run_1_repetition_1', '__done': RunProgress.TODO,
+                                        'factor': 1, 'avg_cpu': ' '}])
+        run_table = self.manager.read_run_table()
+        self.assertEqual(len(run_table), 4)
+        self.assertEqual(run_table[3]['__run_id'], 'run_1_repetition_1')
+
+
+if __name__ == '__main__':
+    unittest.main()
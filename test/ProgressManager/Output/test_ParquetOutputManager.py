@@ -0,0 +1,130 @@
+import importlib.util
+import unittest
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ProgressManager.Output.ParquetOutputManager import ParquetOutputManager, read_nvml_log
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+
+class TestCompactDtypes(unittest.TestCase):
+    def test_numbers(self):
+        frame = ParquetOutputManager.compact_dtypes(pd.DataFrame({
+            'small': [1, 200, 3], 'negative': [-1, 2, 3], 'halves': [0.5, 1.5, 2.0], 'precise': [0.1, 0.2, 0.3]
+        }))
+        self.assertEqual(frame['small'].dtype, np.uint8)
+        self.assertEqual(frame['negative'].dtype, np.int8)
+        self.assertEqual(frame['halves'].dtype, np.float32)
+        self.assertEqual(frame['precise'].dtype, np.float64)  # Not exact in float32
+
+    def test_strings(self):
+        frame = ParquetOutputManager.compact_dtypes(pd.DataFrame({
+            'data': ['1.5', ' ', '3'], 'flag': ['True', 'False', 'True'], 'level': ['low', 'low', 'low'],
+            'name': ['a', 'b', 'c']
+        }))
+        self.assertEqual(list(frame['data'].isna()), [False, True, False])
+        self.assertEqual(frame['data'][0], 1.5)
+        self.assertEqual(frame['flag'].dtype, bool)
+        self.assertIsInstance(frame['level'].dtype, pd.CategoricalDtype)
+        self.assertNotIsInstance(frame['name'].dtype, pd.CategoricalDtype)
+
+
+@unittest.skipIf(importlib.util.find_spec('pynvml') is None, "pynvml is not installed")
+class TestReadNvmlLog(unittest.TestCase):
+    def setUp(self):
+        self.log_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.log_dir)
+
+    def test_log_formats(self):
+        from Plugins.Profilers.NvidiaML import NVML_LogWriter
+
+        with open(self.log_dir / 'nvml.json', 'w') as f:
+            json.dump({'power': [[1000, 50], [2000, 'Not Supported']], 'util': [[1000, 3]]}, f)
+        for log_format in ['ndjson', 'binary']:
+            writer = NVML_LogWriter(self.log_dir / f'nvml.{log_format}', log_format)
+            writer.write('power', 1000, 50)
+            writer.write('power', 2000, 'not a number')
+            writer.write('util', 1000, 3)
+            writer.close()
+
+        for logfile in ['nvml.json', 'nvml.ndjson', 'nvml.binary']:
+            log = read_nvml_log(self.log_dir / logfile)
+            self.assertEqual(list(log['metric'])[0], 'power')
+            self.assertEqual(list(log[log['metric'] == 'util']['value']), [3.0])
+            self.assertAlmostEqual(log['timestamp'][0], 1e-3)  # us
+        self.assertTrue(np.isnan(read_nvml_log(self.log_dir / 'nvml.json')['value'][1]))
+
+
+@unittest.skipIf(importlib.util.find_spec('pyarrow') is None, "pyarrow is not installed")
+class TestParquetOutputManager(unittest.TestCase):
+    def setUp(self):
+        self.experiment_path = Path(tempfile.mkdtemp())
+        self.run_table = [{'__run_id': f'run_{i}_repetition_0', '__done': RunProgress.DONE,
+                           'size': [10, 20][i], 'mode': ['fast', 'slow'][i], 'avg_cpu': [12.5, ' '][i]}
+                          for i in range(2)]
+        for i, run in enumerate(self.run_table):
+            run_dir = self.experiment_path / run['__run_id']
+            run_dir.mkdir()
+            with open(run_dir / 'ps.csv', 'w') as f:
+                f.write(f'{i}.5,1.0\n{i}.0,2.0\n')
+        with open(self.experiment_path / 'run_0_repetition_0' / 'nvml_out.json', 'w') as f:
+            json.dump({'power': [[1, 50], [2, 'Not Supported']], 'util': [[1, 3]]}, f)
+
+        self.manager = ParquetOutputManager(self.experiment_path, ['size', 'mode'])
+
+    def tearDown(self):
+        shutil.rmtree(self.experiment_path)
+
+    def test_run_table(self):
+        self.manager.export(self.run_table)
+
+        run_table = pd.read_parquet(self.experiment_path / 'parquet' / 'run_table.parquet')
+        self.assertEqual(list(run_table['__done']), ['DONE', 'DONE'])
+        self.assertEqual(run_table['size'].dtype, np.uint8)
+        self.assertEqual(run_table['avg_cpu'][0], 12.5)
+        self.assertTrue(np.isnan(run_table['avg_cpu'][1]))
+
+    def test_logs_per_run(self):
+        import pyarrow.dataset as ds
+
+        self.manager.export(self.run_table)
+
+        dataset = ds.dataset(self.experiment_path / 'parquet' / 'ps')
+        slow = dataset.to_table(filter=ds.field('mode') == 'slow').to_pandas()
+        self.assertEqual(list(slow['%cpu']), [1.5, 1.0])
+        self.assertEqual(set(slow['__run_id']), {'run_1_repetition_0'})
+        self.assertEqual(set(slow['size']), {20})
+
+        nvml = pd.read_parquet(self.experiment_path / 'parquet' / 'nvml_out' / 'run_0_repetition_0.parquet')
+        self.assertEqual(list(nvml['metric']), ['power', 'power', 'util'])
+        self.assertTrue(np.isnan(nvml['value'][1]))
+
+    def test_unchanged_logs_are_skipped(self):
+        self.assertEqual(self.manager.export_logs(self.run_table), 3)
+        self.assertEqual(self.manager.export_logs(self.run_table), 0)
+
+        # A changed log can change the dtypes, so all logs of its kind are exported again
+        with open(self.experiment_path / 'run_1_repetition_0' / 'ps.csv', 'a') as f:
+            f.write('1000.5,3.0\n')
+        self.assertEqual(self.manager.export_logs(self.run_table), 2)
+
+    def test_empty_logs_are_skipped(self):
+        with open(self.experiment_path / 'run_1_repetition_0' / 'nvml_out.json', 'w') as f:
+            json.dump({'power': [], 'util': []}, f)
+        self.assertEqual(self.manager.export_logs(self.run_table), 4)
+        self.assertEqual(self.manager.export_logs(self.run_table), 0)
+
+        empty = pd.read_parquet(self.experiment_path / 'parquet' / 'nvml_out' / 'run_1_repetition_0.parquet')
+        self.assertEqual(len(empty), 0)
+        self.assertIn('value', empty.columns)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+import multiprocessing
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from ProgressManager.Output.CSVOutputManager import CSVOutputManager
+from ProgressManager.Output.SQLiteOutputManager import SQLiteOutputManager
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+from ProgressManager.RunTable.Models.RunTable import RunTable
+
+
+def _update_rows(experiment_path, worker, nr_rows):
+    manager = SQLiteOutputManager(experiment_path)
+    for i in range(worker, nr_rows, 4):
+        manager.update_row_data({'__run_id': f'run_{i}_repetition_0', '__done': RunProgress.DONE, 'avg_cpu': i / 2})
+
+
+class TestSQLiteOutputManager(unittest.TestCase):
+    def setUp(self):
+        self.experiment_path = Path(tempfile.mkdtemp())
+        self.manager = SQLiteOutputManager(self.experiment_path)
+        self.manager.write_run_table([
+            {'__run_id': f'run_{i}_repetition_0', '__done': RunProgress.TODO,
+             'size': i, 'ratio': [0.5, 1, 2.5][i], 'cached': i % 2 == 0, 'name': ['a', 'b', 'c'][i], 'avg_cpu': ' '}
+            for i in range(3)
+        ])
+
+    def tearDown(self):
+        shutil.rmtree(self.experiment_path)
+
+    def test_column_types(self):
+        with sqlite3.connect(self.experiment_path / 'run_table.db') as connection:
+            declared = {column[1]: column[2] for column in connection.execute("PRAGMA table_info(run_table)")}
+            journal_mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+
+        self.assertEqual(declared, {'__run_id': 'TEXT', '__done': 'TEXT', 'size': 'INTEGER', 'ratio': '',
+                                    'cached': 'BOOLEAN', 'name': 'TEXT', 'avg_cpu': ''})
+        self.assertEqual(journal_mode, 'wal')
+
+    def test_read_keeps_types(self):
+        run_table = self.manager.read_run_table()
+        self.assertEqual([row['__run_id'] for row in run_table], [f'run_{i}_repetition_0' for i in range(3)])
+        self.assertEqual(run_table[0], {'__run_id': 'run_0_repetition_0', '__done': RunProgress.TODO,
+                                        'size': 0, 'ratio': 0.5, 'cached': True, 'name': 'a', 'avg_cpu': ' '})
+        self.assertIs(run_table[1]['cached'], False)
+        # Integer and float levels of the same factor keep their own type
+        self.assertIsInstance(run_table[1]['ratio'], int)
+        self.assertIsInstance(run_table[2]['ratio'], float)
+
+    def test_resume_mixed_levels(self):
+        run_table = RunTable(['f'], [[1, 2.5]], ['avg_cpu'], repetitions=2, shuffle_seed=1)
+        self.manager.write_run_table(list(run_table))
+        self.manager.update_row_data({'__run_id': run_table[0]['__run_id'], '__done': RunProgress.DONE, 'avg_cpu': 3})
+
+        resumed = RunTable(['f'], [[1, 2.5]], ['avg_cpu'], repetitions=2, shuffle_seed=1)
+        report = resumed.reconcile(self.manager.read_run_table())
+        self.assertFalse(report.has_drift)
+        self.assertEqual(report.count(RunProgress.DONE), 1)
+
+    def test_partial_update(self):
+        self.manager.update_row_data({'__run_id': 'run_1_repetition_0', '__done': RunProgress.DONE, 'avg_cpu': 42.5})
+        self.manager.update_row_data({'__run_id': 'run_1_repetition_0', 'avg_cpu': 43, 'unknown': 1})
+
+        run_table = self.manager.read_run_table()
+        self.assertEqual([row['__done'] for row in run_table], [RunProgress.TODO, RunProgress.DONE, RunProgress.TODO])
+        self.assertEqual(run_table[1]['avg_cpu'], 43)
+        self.assertEqual(run_table[1]['name'], 'b')
+
+    def test_append_run_table(self):
+        self.manager.append_run_table([{'__run_id': 'run_0_repetition_1', '__done': RunProgress.TODO,
+                                        'size': 0, 'ratio': 0.5, 'cached': True, 'name': 'a', 'avg_cpu': ' '}])
+
+        run_table = SQLiteOutputManager(self.experiment_path).read_run_table()
+        self.assertEqual(run_table[-1]['__run_id'], 'run_0_repetition_1')
+        self.assertEqual(len(run_table), 4)
+
+    def test_concurrent_updates(self):
+        nr_rows = 200
+        self.manager.write_run_table([{'__run_id': f'run_{i}_repetition_0', '__done': RunProgress.TODO, 'avg_cpu': ' '}
+                                      for i in range(nr_rows)])
+
+        workers = [multiprocessing.get_context('fork').Process(target=_update_rows, args=(self.experiment_path, worker, nr_rows))
+                   for worker in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            self.assertEqual(worker.exitcode, 0)
+
+        run_table = self.manager.read_run_table()
+        self.assertTrue(all(row['__done'] == RunProgress.DONE for row in run_table))
+        self.assertEqual([row['avg_cpu'] for row in run_table], [i / 2 for i in range(nr_rows)])
+
+    def test_checkpoint_exports_csv(self):
+        self.manager.update_row_data({'__run_id': 'run_2_repetition_0', '__done': RunProgress.DONE, 'avg_cpu': 7})
+        self.manager.checkpoint()
+
+        run_table = CSVOutputManager(self.experiment_path).read_run_table()
+        self.assertEqual(run_table[2]['__done'], RunProgress.DONE)
+        self.assertEqual(run_table[2]['avg_cpu'], 7)
+        self.assertEqual(run_table[0]['cached'], 'True')
+
+
+if __name__ == '__main__':
+    unittest.main()
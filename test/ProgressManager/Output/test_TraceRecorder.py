@@ -0,0 +1,74 @@
+import unittest
+import json
+import multiprocessing
+import shutil
+import tempfile
+from pathlib import Path
+
+from ProgressManager.Output.TraceRecorder import TraceRecorder
+
+
+class Source:
+    def start(self):
+        return 'started'
+
+
+class TracedSource(Source):
+    def start(self):
+        return super().start()
+
+
+TraceRecorder.trace_methods(Source, ['start'], 'profiler')
+TraceRecorder.trace_methods(TracedSource, ['start'], 'profiler')
+
+
+def _record_in_child():
+    with TraceRecorder().span('child', 'test'):
+        pass
+
+
+class TestTraceRecorder(unittest.TestCase):
+    def setUp(self):
+        self.experiment_path = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        TraceRecorder().disable()
+        shutil.rmtree(self.experiment_path)
+
+    def __events(self):
+        TraceRecorder().export(self.experiment_path)
+        with open(self.experiment_path / 'trace.json') as f:
+            return json.load(f)['traceEvents']
+
+    def test_disabled(self):
+        with TraceRecorder().span('nothing', 'test'):
+            pass
+        self.assertEqual(TracedSource().start(), 'started')
+        self.assertFalse((self.experiment_path / 'trace.jsonl').exists())
+
+    def test_spans_of_processes(self):
+        TraceRecorder().enable(self.experiment_path)
+        with TraceRecorder().span('parent', 'test', {'run': 1}):
+            child = multiprocessing.get_context('fork').Process(target=_record_in_child)
+            child.start()
+            child.join()
+
+        events = {event['name']: event for event in self.__events()}
+        self.assertEqual(events['process_name']['args'], {'name': 'experiment-runner'})
+        self.assertEqual(events['parent']['args'], {'run': 1})
+        self.assertEqual(events['child']['pid'], child.pid)
+        self.assertGreaterEqual(events['child']['ts'], events['parent']['ts'])
+        self.assertLessEqual(events['child']['ts'] + events['child']['dur'], events['parent']['ts'] + events['parent']['dur'])
+
+    def test_traced_methods(self):
+        TraceRecorder().enable(self.experiment_path)
+        self.assertEqual(TracedSource().start(), 'started')
+        self.assertEqual(Source().start(), 'started')
+
+        # The overridden method called through super() is part of the span of the subclass
+        spans = [event['name'] for event in self.__events() if event['ph'] == 'X']
+        self.assertEqual(spans, ['TracedSource.start', 'Source.start'])
+
+
+if __name__ == '__main__':
+    unittest.main()
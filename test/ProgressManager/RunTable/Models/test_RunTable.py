@@ -0,0 +1,130 @@
+import unittest
+
+import numpy as np
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+from ProgressManager.RunTable.Models.RunTable import RunTable, SeededPermutation
+
+
+class TestSeededPermutation(unittest.TestCase):
+    def test_bijection(self):
+        for size in [2, 3, 17, 1000]:
+            permutation = SeededPermutation(size, seed=42)
+            forward = [permutation.forward(i) for i in range(size)]
+            self.assertEqual(sorted(forward), list(range(size)))
+            self.assertEqual([permutation.inverse(v) for v in forward], list(range(size)))
+
+    def test_seed_is_deterministic(self):
+        first = [SeededPermutation(100, seed=7).forward(i) for i in range(100)]
+        second = [SeededPermutation(100, seed=7).forward(i) for i in range(100)]
+        other = [SeededPermutation(100, seed=8).forward(i) for i in range(100)]
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+
+
+class TestRunTable(unittest.TestCase):
+    def setUp(self):
+        self.run_table = RunTable(['a', 'b'], [[1, 2, 3], ['x', 'y']], ['avg_cpu'], repetitions=2)
+
+    def test_rows(self):
+        self.assertEqual(len(self.run_table), 12)
+        self.assertEqual(self.run_table.column_names, ['__run_id', '__done', 'a', 'b', 'avg_cpu'])
+        self.assertEqual(self.run_table[0], {'__run_id': 'run_0_repetition_0', '__done': RunProgress.TODO,
+                                             'a': 1, 'b': 'x', 'avg_cpu': ' '})
+        self.assertEqual(self.run_table[-1]['__run_id'], 'run_5_repetition_1')
+        self.assertEqual(self.run_table[3]['a'], 2)
+        self.assertEqual(self.run_table[3]['b'], 'y')
+        with self.assertRaises(IndexError):
+            self.run_table[12]
+
+    def test_combinations(self):
+        run_table = RunTable(['a', 'b'], [[1, 2, 3], ['x', 'y']], [], combinations=np.array([1, 4]))
+        self.assertEqual([(row['a'], row['b']) for row in run_table], [(1, 'y'), (3, 'x')])
+        self.assertEqual(run_table[1]['__run_id'], 'run_1_repetition_0')
+
+    def test_index(self):
+        for position, row in enumerate(self.run_table):
+            self.assertEqual(self.run_table.index(row), position)
+            self.assertEqual(self.run_table.index(row['__run_id']), position)
+        with self.assertRaises(BaseError):
+            self.run_table.index('run_6_repetition_0')
+
+    def test_shuffle(self):
+        shuffled = RunTable(['a', 'b'], [[1, 2, 3], ['x', 'y']], [], repetitions=2, shuffle_seed=3)
+        run_ids = [row['__run_id'] for row in shuffled]
+        self.assertEqual(sorted(run_ids), sorted(row['__run_id'] for row in self.run_table))
+        for position, run_id in enumerate(run_ids):
+            self.assertEqual(shuffled.index(run_id), position)
+
+    def test_reorder(self):
+        run_ids = [row['__run_id'] for row in self.run_table][::-1]
+        self.run_table.reorder(run_ids)
+        self.assertEqual([row['__run_id'] for row in self.run_table], run_ids)
+        self.assertEqual(self.run_table.index('run_5_repetition_1'), 0)
+
+        with self.assertRaises(BaseError):
+            self.run_table.reorder(run_ids[:-1] + [run_ids[0]])
+
+    def test_update_row(self):
+        self.run_table.update_row('run_2_repetition_1', {'__done': RunProgress.DONE, 'avg_cpu': 12})
+        row = self.run_table[self.run_table.index('run_2_repetition_1')]
+        self.assertEqual(row['__done'], RunProgress.DONE)
+        self.assertEqual(row['avg_cpu'], 12)
+        self.assertEqual(self.run_table[0]['__done'], RunProgress.TODO)
+
+    def test_append_repetitions(self):
+        new_rows = self.run_table.append_repetitions([4, 1])
+        self.assertEqual([row['__run_id'] for row in new_rows], ['run_4_repetition_2', 'run_1_repetition_2'])
+        self.assertEqual(new_rows[0]['a'], 3)
+        self.assertEqual(len(self.run_table), 14)
+        self.assertEqual(self.run_table.repetitions_of(4), 3)
+        self.assertEqual(self.run_table.repetitions_of(0), 2)
+        self.assertEqual(self.run_table.index('run_1_repetition_2'), 13)
+        self.assertEqual(self.run_table.append_repetitions([4])[0]['__run_id'], 'run_4_repetition_3')
+
+    def test_restore_appended_runs(self):
+        stored = RunTable(['a', 'b'], [[1, 2, 3], ['x', 'y']], [], repetitions=2, shuffle_seed=3)
+        stored.append_repetitions([0, 5])
+        stored.append_repetitions([5])
+        run_ids = [row['__run_id'] for row in stored]
+
+        restored = RunTable(['a', 'b'], [[1, 2, 3], ['x', 'y']], [], repetitions=2, shuffle_seed=3)
+        restored.restore_appended_runs(run_ids)
+        restored.reorder(run_ids)
+        self.assertEqual([row['__run_id'] for row in restored], run_ids)
+
+        restored.append_repetitions([5])
+        self.assertEqual(restored[-1]['__run_id'], 'run_5_repetition_4')
+
+        with self.assertRaises(BaseError):
+            RunTable(['a'], [[1, 2]], []).restore_appended_runs(['run_0_repetition_2'])
+
+    def test_reconcile(self):
+        stored = RunTable(['a', 'b'], [[1, 2, 3], ['x', 'y']], ['avg_cpu'], repetitions=2, shuffle_seed=3)
+        stored.append_repetitions([5])
+        stored_rows = list(stored)
+        for row, progress in zip(stored_rows, [RunProgress.DONE, RunProgress.FAILED]):
+            row['__done'] = progress
+            row['a'] = str(row['a'])  # The CSV run table stores strings
+
+        report = self.run_table.reconcile(stored_rows)
+        self.assertFalse(report.has_drift)
+        self.assertEqual([row['__run_id'] for row in self.run_table], [row['__run_id'] for row in stored_rows])
+        self.assertEqual([row['__done'] for row in self.run_table][:3], [RunProgress.DONE, RunProgress.FAILED, RunProgress.TODO])
+        self.assertEqual((report.count(RunProgress.TODO), report.count(RunProgress.DONE), report.count(RunProgress.FAILED)), (11, 1, 1))
+        self.assertEqual(report.run_ids[RunProgress.FAILED], [stored_rows[1]['__run_id']])
+
+    def test_reconcile_drift(self):
+        stored_rows = list(RunTable(['a', 'b'], [[1, 2, 4], ['x', 'y']], ['avg_mem'], repetitions=2))
+        report = self.run_table.reconcile(stored_rows)
+        self.assertEqual(set(report.drift.keys()), {'avg_cpu', 'avg_mem', 'a'})
+        self.assertEqual(report.drift['a'][0], 4)  # Both repetitions of both combinations with level 3
+        self.assertEqual(self.run_table[0]['__done'], RunProgress.TODO)
+
+        report = self.run_table.reconcile(list(RunTable(['a', 'b'], [[1, 2, 3], ['x', 'y']], ['avg_cpu']))[:11])
+        self.assertIn('__run_id', report.drift)
+
+
+if __name__ == '__main__':
+    unittest.main()